@@ -0,0 +1,168 @@
+"""
+Cube d'agrégats de la base des festivals : nombre de festivals par région,
+département, période, discipline et sous-catégorie.
+
+Nettoyage_base_donnees.py comptait chaque sous-catégorie par un parcours complet de
+sa colonne (plus de 40 `df[...].apply(lambda ...)`), et Stats_descriptives.ipynb
+refaisait des boucles du même genre pour chaque graphique. Ici, les festivals sont
+éclatés une seule fois en couples (festival, discipline, sous-catégorie) : une
+ligne par discipline de "Masque disciplines" et une par sous-catégorie des colonnes
+"Nouvelles sous-catégories ...", plus une ligne "Toutes" par festival. Un seul
+groupby donne ensuite tous les comptes.
+
+Un festival de plusieurs disciplines (ou sous-catégories) est compté dans chacune :
+ces dimensions ne s'additionnent pas, et compter() lit les lignes « Toutes » quand
+elles ne sont pas demandées. La région, le département et la période, à une seule
+valeur par festival, s'additionnent.
+
+Le cube est écrit à côté du snapshot (cache_festivals/cube_<clé>.parquet) par
+base_festivals.construire_snapshot(), qui reprend celui que le nettoyage a déjà
+calculé pour ses comptes ; charger_cube() ne fait que le relire (il ne le
+reconstruit que pour un snapshot écrit sans cube).
+
+Utilisation :
+    from agregats import charger_cube, compter
+    cube = charger_cube()
+    compter(cube, "Discipline")                                   # par discipline
+    compter(cube, "Sous-catégorie", {"Discipline": "Musique"})    # sous-catégories de la musique
+    compter(cube, ["Région", "Période"], {"Discipline": "Cinéma, audiovisuel"})
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from base_festivals import DOSSIER_SNAPSHOT, construire_snapshot, lire_meta, snapshot_a_jour
+from masques import BITS_DISCIPLINES, DISCIPLINES, masques_festivals
+from saisons import COLONNE_PERIODE
+
+# Valeur des dimensions Discipline et Sous-catégorie pour l'ensemble des festivals
+TOUTES = "Toutes"
+
+# Dimensions du cube et colonnes de la base correspondantes
+COLONNES_DIMENSIONS = {
+    "Région": "Région principale de déroulement",
+    "Département": "Département principal de déroulement",
+    "Période": COLONNE_PERIODE,
+}
+DIMENSIONS = [*COLONNES_DIMENSIONS, "Discipline", "Sous-catégorie"]
+
+
+def construire_cube(df):
+    """
+    Calcule le cube d'agrégats d'un DataFrame de festivals (avant ou après le snapshot).
+
+    Renvoie un DataFrame d'une ligne par combinaison présente des DIMENSIONS, avec la
+    colonne Nombre (nombre de festivals distincts). Les valeurs manquantes de région,
+    département ou période sont gardées (NaN).
+    """
+    df = df.reset_index(drop=True)
+    if "Masque disciplines" in df:
+        disciplines = df["Masque disciplines"].to_numpy(dtype=np.uint64)
+    else:
+        disciplines = masques_festivals(df)[0]
+
+    # Couples (festival, discipline, sous-catégorie)
+    positions = [np.arange(len(df))]
+    valeurs_disciplines = [np.full(len(df), TOUTES, dtype=object)]
+    sous_categories = [np.full(len(df), TOUTES, dtype=object)]
+    for _, discipline, colonne, _, _ in DISCIPLINES:
+        membres = np.flatnonzero((disciplines & BITS_DISCIPLINES[discipline]) != 0)
+        positions.append(membres)
+        valeurs_disciplines.append(np.full(len(membres), discipline, dtype=object))
+        sous_categories.append(np.full(len(membres), TOUTES, dtype=object))
+        if colonne in df:
+            eclate = df[colonne].explode().dropna()
+            # Une sous-catégorie citée deux fois pour un festival n'est comptée qu'une fois
+            eclate = eclate[~pd.MultiIndex.from_arrays([eclate.index, eclate.to_numpy()]).duplicated()]
+            positions.append(eclate.index.to_numpy())
+            valeurs_disciplines.append(np.full(len(eclate), discipline, dtype=object))
+            sous_categories.append(eclate.to_numpy(dtype=object))
+
+    positions = np.concatenate(positions)
+    couples = pd.DataFrame({
+        dimension: df[colonne].to_numpy(dtype=object)[positions] if colonne in df else np.nan
+        for dimension, colonne in COLONNES_DIMENSIONS.items()
+    })
+    couples["Discipline"] = np.concatenate(valeurs_disciplines)
+    couples["Sous-catégorie"] = np.concatenate(sous_categories)
+    return couples.groupby(DIMENSIONS, dropna=False, sort=True).size().rename("Nombre").reset_index()
+
+
+def compter(cube, par=(), filtres=None):
+    """
+    Nombre de festivals par valeur des dimensions par (un nom ou une liste), parmi
+    ceux qui vérifient filtres ({dimension: valeur ou liste de valeurs}).
+
+    Une dimension Discipline ou Sous-catégorie ni demandée ni filtrée vaut « Toutes »,
+    une dimension demandée n'a pas de ligne « Toutes ». Renvoie un entier si par est
+    vide, sinon une Series indexée par par.
+    """
+    par = [par] if isinstance(par, str) else list(par)
+    filtres = dict(filtres or {})
+    selection = np.ones(len(cube), dtype=bool)
+    for dimension, valeurs in filtres.items():
+        valeurs = [valeurs] if isinstance(valeurs, str) or not np.iterable(valeurs) else list(valeurs)
+        selection &= cube[dimension].isin(valeurs).to_numpy()
+
+    # Lignes « Toutes » : seules lues pour une dimension libre, écartées pour une
+    # dimension demandée ; une sous-catégorie sans discipline se lit sous sa discipline
+    libres = [dimension for dimension in ("Discipline", "Sous-catégorie") if dimension not in par and dimension not in filtres]
+    for dimension in ("Discipline", "Sous-catégorie"):
+        if dimension in par and dimension not in filtres:
+            selection &= (cube[dimension] != TOUTES).to_numpy()
+    if "Sous-catégorie" in libres:
+        selection &= (cube["Sous-catégorie"] == TOUTES).to_numpy()
+    if "Discipline" in libres:
+        if "Sous-catégorie" in libres:
+            selection &= (cube["Discipline"] == TOUTES).to_numpy()
+        else:
+            selection &= (cube["Discipline"] != TOUTES).to_numpy()
+
+    cube = cube[selection]
+    if not par:
+        return int(cube["Nombre"].sum())
+    return cube.groupby(par, dropna=False, sort=True)["Nombre"].sum()
+
+
+def ecrire_cube(cube, dossier, cle):
+    """
+    Écrit le cube du snapshot de clé cle dans dossier (écriture atomique) et supprime
+    ceux des anciens snapshots. Renvoie le chemin écrit.
+    """
+    chemin = Path(dossier) / f"cube_{cle}.parquet"
+    chemin_tmp = chemin.with_name(chemin.name + ".tmp")
+    cube.to_parquet(chemin_tmp, index=False)
+    os.replace(chemin_tmp, chemin)
+
+    # Supprimer les cubes des anciens snapshots
+    for ancien in Path(dossier).glob("cube_*.parquet"):
+        if ancien.name != chemin.name:
+            ancien.unlink()
+    return chemin
+
+
+def charger_cube(dossier=DOSSIER_SNAPSHOT, verifier_source=None, reconstruire=True):
+    """
+    Renvoie le cube d'agrégats du snapshot courant, écrit avec le snapshot (ou, à
+    défaut, construit depuis le snapshot et écrit au premier appel).
+
+    Avec reconstruire=False, lève FileNotFoundError si le snapshot est absent ou périmé.
+    """
+    dossier = Path(dossier)
+    if not snapshot_a_jour(dossier, verifier_source=verifier_source):
+        if not reconstruire:
+            raise FileNotFoundError(f"Aucun snapshot à jour dans {dossier}. Lancez 'python base_festivals.py'.")
+        construire_snapshot(dossier)
+    meta = lire_meta(dossier)
+    chemin = dossier / f"cube_{meta['cle']}.parquet"
+    if chemin.exists():
+        return pd.read_parquet(chemin)
+
+    colonnes = [*COLONNES_DIMENSIONS.values(), "Discipline dominante", "Masque disciplines",
+                *(colonne for _, _, colonne, _, _ in DISCIPLINES)]
+    cube = construire_cube(pd.read_parquet(dossier / meta["fichier"], columns=colonnes))
+    ecrire_cube(cube, dossier, meta["cle"])
+    return cube
@@ -1,132 +1,185 @@
-import subprocess
-import sys
-
-# Installer les packages nécessaires
-def install_packages():
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "folium"])
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "streamlit-folium"])
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "streamlit"])
-
-# Appeler la fonction pour installer les packages
-install_packages()
+# Vérifier que les modules nécessaires sont installés (sans pip install à chaque exécution)
+from dependances import verifier_dependances
+verifier_dependances(["streamlit", "folium", "streamlit_folium", "pandas", "scipy"])
 
 # Importation des modules nécessaires
 import streamlit as st
-import folium
 from streamlit_folium import st_folium
 import json
+import os
+import numpy as np
 import pandas as pd
 
+from base_festivals import DOSSIER_SNAPSHOT, FICHIER_META
+from carte import (SEUIL_REGROUPEMENT, IndexClics, ajuster_coordonnees, carte_de_base, construire_carte,
+                   emprise_initiale, groupe_vue)
+
+# Streamlit relance tout le script à chaque interaction (clic sur la carte compris).
+# Les données, les coordonnées et la carte sont donc gardées en cache, avec pour clé
+# la date de modification des fichiers (et la position de l'utilisateur pour la
+# carte) : une relance ne fait plus que réafficher la carte et le panneau d'informations.
+FICHIER_UTILISATEUR = "user_data.json"
+FICHIER_FESTIVALS = "df_end.csv"
+POSITION_DEFAUT = [48.8566, 2.3522]  # Coordonnées par défaut (Paris)
+NB_RESULTATS_RECHERCHE = 10
+
+
+def date_modification(chemin):
+    """
+    Date de modification du fichier (clé des caches), ou None s'il n'existe pas.
+    """
+    try:
+        return os.path.getmtime(chemin)
+    except OSError:
+        return None
+
+
 # Charger les données utilisateur collectées
-try:
-    with open("user_data.json", "r") as json_file:
+@st.cache_data
+def charger_user_data(chemin, date):
+    with open(chemin, "r") as json_file:
         user_data = json.load(json_file)
-        print("Données utilisateur récupérées :", user_data)
-except FileNotFoundError:
+    print("Données utilisateur récupérées :", user_data)
+    return user_data
+
+
+# Charger les festivals depuis le fichier CSV, coordonnées déjà ajustées
+@st.cache_data
+def charger_festivals(chemin, date):
+    festivals = pd.read_csv(chemin)
+    if festivals.empty:
+        return festivals
+    return ajuster_coordonnees(festivals)
+
+
+@st.cache_data
+def coordonnees_festivals(chemin, date):
+    """
+    Tableaux (latitudes, longitudes) des marqueurs, NaN si les coordonnées ne sont pas valides.
+    """
+    festivals = charger_festivals(chemin, date)
+    if festivals.empty:
+        return np.empty(0), np.empty(0)
+    return festivals["Latitude"].to_numpy(), festivals["Longitude"].to_numpy()
+
+
+# La carte est partagée entre les sessions (cache_resource) : elle est construite et
+# rendue en HTML une seule fois par fichier de festivals, position de l'utilisateur et mode
+@st.cache_resource(max_entries=32)
+def carte_en_cache(chemin, date, user_location, mode):
+    festivals = charger_festivals(chemin, date)
+    lat, lon = coordonnees_festivals(chemin, date)
+    return construire_carte(festivals, lat, lon, user_location, mode)
+
+
+# Index des marqueurs, construit une fois par fichier de festivals
+@st.cache_resource(max_entries=32)
+def index_clics(chemin, date):
+    festivals = charger_festivals(chemin, date)
+    lat, lon = coordonnees_festivals(chemin, date)
+    return IndexClics(festivals, lat, lon)
+
+
+# Index des noms de toute la base (index_noms.py), rechargé si le snapshot change
+@st.cache_resource(max_entries=1)
+def index_noms_en_cache(date):
+    # Importé à la première recherche : scipy n'est pas chargé au premier rendu
+    from index_noms import charger_index_noms
+    try:
+        return charger_index_noms(verifier_source=False, reconstruire=False)
+    except FileNotFoundError:
+        return None
+
+
+def rechercher_festival():
+    """
+    Champ de recherche en texte libre (nom et/ou commune) parmi tous les festivals de la base.
+    """
+    requete = st.sidebar.text_input("Rechercher un festival", placeholder="Nom du festival, commune...")
+    if not requete.strip():
+        return
+    index = index_noms_en_cache(date_modification(DOSSIER_SNAPSHOT / FICHIER_META))
+    if index is None:
+        st.sidebar.warning("Base des festivals introuvable. Lancez 'python base_festivals.py' pour la construire.")
+        return
+    positions, scores = index.rechercher(requete, k=NB_RESULTATS_RECHERCHE)
+    if len(positions) == 0:
+        st.sidebar.info("Aucun festival ne correspond à cette recherche.")
+        return
+    resultats = index.festivals(positions, scores)
+    st.sidebar.dataframe(resultats.drop(columns="Identifiant"), hide_index=True,
+                         column_config={"Similarité": st.column_config.ProgressColumn(min_value=0, max_value=1)})
+
+
+def afficher_festival(festival):
+    """
+    Affiche les informations du festival sélectionné.
+    """
+    st.subheader(f"Informations sur {festival['Nom du festival']}")
+    st.write(f"**Date** : {festival['Période principale de déroulement du festival']}")
+    st.write(f"**Description** : {festival['Discipline dominante']} - {festival['Envergure territoriale']}")
+    lien = festival['Site internet du festival']
+    if pd.notna(lien):
+        st.write(f"[Site du festival]({lien})")
+
+
+rechercher_festival()
+
+date_utilisateur = date_modification(FICHIER_UTILISATEUR)
+if date_utilisateur is None:
     st.error("Aucune donnée utilisateur n'a été collectée. Lancez 'questions.py' pour collecter les données.")
-    user_data = {"coordinates": [48.8566, 2.3522]}  # Coordonnées par défaut (Paris)
+    user_data = {"coordinates": POSITION_DEFAUT}
+else:
+    user_data = charger_user_data(FICHIER_UTILISATEUR, date_utilisateur)
 
-# Charger les festivals depuis le fichier CSV
-df_end = pd.read_csv('df_end.csv')
+date_festivals = date_modification(FICHIER_FESTIVALS)
+df_end = charger_festivals(FICHIER_FESTIVALS, date_festivals)
 
 # Vérifier si df_end est vide
 if df_end.empty:
     st.title("Carte des Festivals en France")
     st.error("Aucun festival trouvé avec les critères donnés. Veuillez élargir vos choix pour découvrir d'autres festivals.")
 else:
-    # Fonction pour décaler légèrement les marqueurs en cas de doublon
-    def ajuster_coordonnees(festivals):
-        """
-        Décale légèrement les coordonnées pour les festivals ayant les mêmes positions géographiques.
-        """
-        coords_count = {}
-        for i, row in festivals.iterrows():
-            coords = row['Géocodage xy'].strip()
-            if coords not in coords_count:
-                coords_count[coords] = 0
-            else:
-                coords_count[coords] += 1
-            
-            # Décaler légèrement la position
-            lat, lon = map(float, coords.split(','))
-            offset = coords_count[coords] * 0.005  # Décalage minime
-            lat += offset
-            lon += offset
-            festivals.at[i, 'Géocodage xy'] = f"{lat},{lon}"
-        return festivals
-
-    # Appliquer l'ajustement des coordonnées
-    df_end = ajuster_coordonnees(df_end)
-
-    # Fonction pour afficher les festivals sur une carte
-    def afficher_festivals_sur_carte(festivals, user_location):
-        """
-        Affiche les festivals sur une carte interactive avec l'adresse de l'utilisateur.
-        """
-        carte = folium.Map(location=user_location, zoom_start=6, tiles="OpenStreetMap")
-        
-        # Ajouter un marqueur pour l'utilisateur
-        folium.Marker(
-            location=user_location,
-            popup=f"<b>Votre adresse</b>",
-            tooltip="Votre position 📍",
-            icon=folium.Icon(color='red', icon='info-sign')
-        ).add_to(carte)
-        
-        # Ajouter un marqueur pour chaque festival
-        for _, row in festivals.iterrows():
-            try:
-                # Extraire les coordonnées depuis la colonne 'Géocodage xy'
-                lat, lon = map(float, row['Géocodage xy'].split(','))
-            except (ValueError, AttributeError):
-                continue  # Ignorer si les coordonnées ne sont pas valides
-
-            nom = row['Nom du festival']
-            date = row['Période principale de déroulement du festival']
-            description = f"{row['Discipline dominante']} - {row['Envergure territoriale']}"
-            lien = row['Site internet du festival'] if pd.notna(row['Site internet du festival']) else "#"
-
-            # Ajouter un marqueur avec popup
-            popup_content = f"""
-            <b>{nom}</b><br>
-            Date : {date}<br>
-            {description}<br>
-            <a href="{lien}" target="_blank" style="color:blue; text-decoration:underline;">Lien vers le site</a>
-            """
-            folium.Marker(
-                location=[lat, lon],
-                popup=popup_content,
-                tooltip=nom,
-                icon=folium.Icon(color='blue', icon='info-sign')
-            ).add_to(carte)
-        
-        return carte
-
     # Utiliser la localisation de l'utilisateur
-    user_location = user_data['coordinates']
+    user_location = tuple(user_data['coordinates'])
 
     # Titre dans Streamlit
     st.title("Carte des Festivals en France")
 
-    # Générer la carte
-    carte = afficher_festivals_sur_carte(df_end, user_location)
-
-    # Afficher la carte interactive avec Streamlit
-    map_result = st_folium(carte, width=800, height=600)
+    # Peu de festivals : un marqueur par festival. Sinon, marqueurs regroupés ou
+    # seulement les festivals de la zone affichée.
+    mode = "marqueurs"
+    if len(df_end) > SEUIL_REGROUPEMENT:
+        modes = {"Tous les festivals, regroupés": "regroupe", "Festivals de la zone affichée": "vue"}
+        mode = modes[st.sidebar.radio("Affichage des festivals", list(modes))]
+
+    if mode == "vue":
+        # Carte de base légère, reconstruite à chaque relance ; les festivals de
+        # l'emprise renvoyée par st_folium lors du dernier déplacement sont ajoutés en couche
+        emprise = (st.session_state.get("carte_vue") or {}).get("bounds")
+        if not emprise or emprise["_southWest"]["lat"] is None:
+            emprise = emprise_initiale(user_location)
+        lat_festivals, lon_festivals = coordonnees_festivals(FICHIER_FESTIVALS, date_festivals)
+        couche, nb_affiches, nb_vue = groupe_vue(df_end, lat_festivals, lon_festivals, emprise)
+        if nb_affiches < nb_vue:
+            st.caption(f"{nb_vue} festivals dans la zone affichée : {nb_affiches} sont montrés, répartis "
+                       "sur toute la zone. Zoomez pour les voir tous.")
+        else:
+            st.caption(f"{nb_vue} festivals dans la zone affichée")
+        map_result = st_folium(carte_de_base(user_location), width=800, height=600, key="carte_vue",
+                               feature_group_to_add=couche,
+                               returned_objects=["last_object_clicked", "last_object_clicked_tooltip", "bounds"])
+    else:
+        # Générer la carte (depuis le cache)
+        carte = carte_en_cache(FICHIER_FESTIVALS, date_festivals, user_location, mode)
+
+        # Afficher la carte interactive avec Streamlit. Seuls les clics sur un marqueur
+        # relancent le script (pas les déplacements ni les zooms), et la carte déjà
+        # rendue n'est pas reconstruite.
+        map_result = st_folium(carte, width=800, height=600, key="carte",
+                               returned_objects=["last_object_clicked", "last_object_clicked_tooltip"], render=False)
 
     # Afficher les informations du festival sélectionné
-    if map_result and map_result.get('last_object_clicked'):
-        lat = map_result['last_object_clicked']['lat']
-        lon = map_result['last_object_clicked']['lng']
-
-        # Rechercher le festival correspondant
-        for _, row in df_end.iterrows():
-            festival_lat, festival_lon = map(float, row['Géocodage xy'].split(','))
-            if abs(festival_lat - lat) < 0.0001 and abs(festival_lon - lon) < 0.0001:
-                st.subheader(f"Informations sur {row['Nom du festival']}")
-                st.write(f"**Date** : {row['Période principale de déroulement du festival']}")
-                st.write(f"**Description** : {row['Discipline dominante']} - {row['Envergure territoriale']}")
-                lien = row['Site internet du festival']
-                if pd.notna(lien):
-                    st.write(f"[Site du festival]({lien})")
-                break
\ No newline at end of file
+    position = index_clics(FICHIER_FESTIVALS, date_festivals).position(map_result)
+    if position is not None:
+        afficher_festival(df_end.iloc[position])
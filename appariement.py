@@ -0,0 +1,429 @@
+"""
+Appariement d'une liste externe de festivals (par exemple les 50 festivals les
+plus consultés sur infoconcert.com) avec la base nationale.
+
+Les critères sont ceux de fusion_des_données.ipynb : pour chaque paire de
+festivals,
+- +BONUS_DISTANCE points si les deux lieux sont à moins de SEUIL_DISTANCE_KM ;
+- + la similarité des noms (fuzz.token_sort_ratio, de 0 à 100) si elle atteint
+  SEUIL_SIMILARITE ;
+- + la similarité des communes, au même seuil.
+Le meilleur candidat (le premier de la base en cas d'égalité) est retenu s'il a
+au moins un critère rempli.
+
+Au lieu de comparer chaque festival externe à toute la base (boucle iterrows de
+N x M appels à fuzzywuzzy et geodesic), on ne compare que des candidats issus de
+blocs :
+- les festivals de la base à moins de SEUIL_DISTANCE_KM (index_spatial.py) ;
+- ceux de la même commune (accents et casse ignorés) ;
+- ceux dont la commune ou le nom partage un mot (mots trop fréquents comme
+  « festival » ou « saint » exclus) ;
+- ceux du même département, si la liste externe en a une colonne ;
+- les VOISINS_NOMS festivals dont le nom et la commune sont les plus proches en
+  trigrammes de caractères (index_noms.py), qui rattrapent les fautes de frappe.
+Les similarités de toutes les paires candidates sont ensuite calculées d'un coup
+avec rapidfuzz (process.cpdist), et les distances avec geodistance.py.
+
+Utilisation :
+    from appariement import apparier
+    resultats = apparier(df_top_50, df_france)
+
+ou en ligne de commande :
+    python appariement.py externe.csv resultats.csv [--colonne-nom Nom] [--colonne-commune Lieu]
+
+apparier_incremental() (option --incremental) garde les résultats dans
+cache_festivals/appariement/ avec une empreinte du contenu de chaque festival :
+une nouvelle exécution ne recalcule que les festivals externes nouveaux ou
+modifiés, et ne compare les autres qu'aux festivals ajoutés ou modifiés de la base.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz
+from rapidfuzz.process import cpdist
+from rapidfuzz.utils import default_process
+
+from base_festivals import DOSSIER_SNAPSHOT, charger_festivals
+from geodistance import ajouter_coordonnees, distance_ellipsoide_km
+from index_noms import IndexNoms, normaliser
+from index_spatial import IndexSpatial
+
+SEUIL_DISTANCE_KM = 5.0
+BONUS_DISTANCE = 50
+SEUIL_SIMILARITE = 80
+
+# Un mot présent dans plus de festivals de la base que cette limite ne sert pas de bloc
+MAX_FREQUENCE_MOT = 200
+# Longueur minimale d'un mot servant de bloc
+LONGUEUR_MIN_MOT = 2
+# Nombre de festivals les plus proches par le nom (index_noms.py) ajoutés aux candidats
+VOISINS_NOMS = 5
+
+# Colonnes de la base nationale
+NOM = "Nom du festival"
+COMMUNE = "Commune principale de déroulement"
+DEPARTEMENT = "Département principal de déroulement"
+
+# Cache des résultats pour apparier_incremental()
+DOSSIER_CACHE = DOSSIER_SNAPSHOT / "appariement"
+VERSION_CACHE = 1
+# Colonnes de la base dont dépend l'appariement
+COLONNES_EMPREINTE_BASE = ["Identifiant", NOM, COMMUNE, DEPARTEMENT, "Latitude", "Longitude"]
+
+COLONNES_RESULTAT = [
+    "Festival match", "Identifiant match", "Score", "Score nom", "Score commune", "Distance (km)",
+    "Second match", "Identifiant second", "Score second",
+]
+
+
+def mots(texte):
+    """
+    Mots d'un texte normalisé assez longs pour servir de bloc.
+    """
+    return {mot for mot in normaliser(texte).split() if len(mot) >= LONGUEUR_MIN_MOT}
+
+
+def index_mots(textes):
+    """
+    Index inversé mot -> tableau des positions, sans les mots trop fréquents.
+    """
+    positions = defaultdict(list)
+    for position, texte in enumerate(textes):
+        for mot in mots(texte):
+            positions[mot].append(position)
+    return {mot: np.array(liste, dtype=np.int64) for mot, liste in positions.items()
+            if len(liste) <= MAX_FREQUENCE_MOT}
+
+
+def index_valeurs(textes):
+    """
+    Index valeur normalisée -> tableau des positions (blocs par commune et par département).
+    """
+    positions = defaultdict(list)
+    for position, texte in enumerate(textes):
+        cle = normaliser(texte)
+        if cle:
+            positions[cle].append(position)
+    return {cle: np.array(liste, dtype=np.int64) for cle, liste in positions.items()}
+
+
+def paires_candidates(externe, reference, colonne_nom, colonne_commune, colonne_departement=None,
+                      seuil_distance_km=SEUIL_DISTANCE_KM, voisins_noms=VOISINS_NOMS):
+    """
+    Paires (position externe, position dans la base) à comparer, issues des blocs.
+
+    Renvoie deux tableaux d'entiers de même longueur, triés par position externe
+    puis par position dans la base, sans doublon.
+    """
+    index = IndexSpatial(reference["Latitude"].to_numpy(), reference["Longitude"].to_numpy())
+    par_nom = index_mots(reference[NOM])
+    par_commune = index_mots(reference[COMMUNE])
+    par_commune_exacte = index_valeurs(reference[COMMUNE])
+    par_departement = index_valeurs(reference[DEPARTEMENT]) if colonne_departement else {}
+    vide = np.empty(0, dtype=np.int64)
+
+    lat = externe["Latitude"].to_numpy(dtype=np.float64)
+    lon = externe["Longitude"].to_numpy(dtype=np.float64)
+    noms = externe[colonne_nom].tolist()
+    communes = externe[colonne_commune].tolist()
+    departements = externe[colonne_departement].tolist() if colonne_departement else [None] * len(externe)
+    if voisins_noms:
+        index_noms = IndexNoms(reference[NOM], reference[COMMUNE])
+        requetes = [f"{nom if isinstance(nom, str) else ''} {commune if isinstance(commune, str) else ''}"
+                    for nom, commune in zip(noms, communes)]
+        voisins, _ = index_noms.similaires(requetes, voisins_noms)
+
+    gauche, droite = [], []
+    for i in range(len(externe)):
+        blocs = [par_nom.get(mot, vide) for mot in mots(noms[i])]
+        blocs += [par_commune.get(mot, vide) for mot in mots(communes[i])]
+        blocs.append(par_commune_exacte.get(normaliser(communes[i]), vide))
+        if voisins_noms:
+            blocs.append(voisins[i][voisins[i] >= 0])
+        if departements[i] is not None:
+            blocs.append(par_departement.get(normaliser(departements[i]), vide))
+        if not (np.isnan(lat[i]) or np.isnan(lon[i])):
+            blocs.append(index.within_radius(lat[i], lon[i], seuil_distance_km)[0])
+        candidats = np.unique(np.concatenate(blocs)) if blocs else vide
+        gauche.append(np.full(len(candidats), i, dtype=np.int64))
+        droite.append(candidats)
+    if not gauche:
+        return vide, vide
+    return np.concatenate(gauche), np.concatenate(droite)
+
+
+def mots_tries(textes):
+    """
+    Textes prétraités pour fuzz.token_sort_ratio (default_process puis mots triés),
+    "" pour les valeurs manquantes. Calculé une fois par festival, pas par paire.
+    """
+    return np.array([" ".join(sorted(default_process(t).split())) if isinstance(t, str) else ""
+                     for t in textes], dtype=object)
+
+
+def similarites(tries_a, tries_b):
+    """
+    fuzz.token_sort_ratio de chaque paire (tries_a[k], tries_b[k]), textes passés par
+    mots_tries() ; 0 si un texte manque.
+    """
+    if len(tries_a) == 0:
+        return np.empty(0)
+    scores = cpdist(tries_a, tries_b, scorer=fuzz.ratio, processor=None, workers=-1)
+    manquants = (tries_a == "") | (tries_b == "")
+    return np.where(manquants, 0.0, scores)
+
+
+def apparier(externe, reference, colonne_nom="Nom", colonne_commune="Lieu", colonne_departement=None,
+             seuil_distance_km=SEUIL_DISTANCE_KM, seuil_similarite=SEUIL_SIMILARITE, voisins_noms=VOISINS_NOMS):
+    """
+    Cherche pour chaque festival de externe son meilleur correspondant dans reference
+    (base nationale, cf. base_festivals.charger_festivals).
+
+    externe doit avoir les colonnes colonne_nom, colonne_commune (seule la première
+    ligne est gardée, comme « Nîmes\\nArènes de Nîmes ») et, si possible, "Latitude" et
+    "Longitude". Renvoie un DataFrame de même index que externe avec les colonnes
+    COLONNES_RESULTAT : le festival retenu (NaN si aucun), le détail de son score et
+    le second candidat.
+    """
+    if "Latitude" not in reference or "Longitude" not in reference:
+        reference = ajouter_coordonnees(reference)
+    externe = externe.copy()
+    externe[colonne_commune] = externe[colonne_commune].where(
+        externe[colonne_commune].isna(), externe[colonne_commune].astype(str).str.split("\n").str[0]
+    )
+    for colonne in ("Latitude", "Longitude"):
+        if colonne not in externe:
+            externe[colonne] = np.nan
+
+    i, j = paires_candidates(externe, reference, colonne_nom, colonne_commune, colonne_departement,
+                             seuil_distance_km, voisins_noms)
+
+    # Scores de toutes les paires candidates
+    score_nom = similarites(mots_tries(externe[colonne_nom])[i], mots_tries(reference[NOM])[j])
+    score_commune = similarites(mots_tries(externe[colonne_commune])[i], mots_tries(reference[COMMUNE])[j])
+    distance = distance_ellipsoide_km(
+        externe["Latitude"].to_numpy(dtype=np.float64)[i], externe["Longitude"].to_numpy(dtype=np.float64)[i],
+        reference["Latitude"].to_numpy(dtype=np.float64)[j], reference["Longitude"].to_numpy(dtype=np.float64)[j],
+    )
+    score = (np.where(distance <= seuil_distance_km, BONUS_DISTANCE, 0)
+             + np.where(score_nom >= seuil_similarite, score_nom, 0)
+             + np.where(score_commune >= seuil_similarite, score_commune, 0))
+
+    # Tri par festival externe, score décroissant puis position dans la base :
+    # le premier de chaque groupe est le meilleur candidat, le suivant le second
+    ordre = np.lexsort((j, -score, i))
+    ordre = ordre[score[ordre] > 0]
+    premiers = np.flatnonzero(np.r_[True, i[ordre][1:] != i[ordre][:-1]]) if len(ordre) else ordre
+    meilleurs = ordre[premiers]
+    suivants = premiers + 1
+    a_second = suivants < len(ordre)
+    a_second[a_second] = i[ordre[suivants[a_second]]] == i[meilleurs[a_second]]
+    seconds = ordre[suivants[a_second]]
+
+    resultats = pd.DataFrame(index=externe.index, columns=COLONNES_RESULTAT, dtype=object)
+    lignes = i[meilleurs]
+    resultats.iloc[lignes, 0] = reference[NOM].to_numpy()[j[meilleurs]]
+    resultats.iloc[lignes, 1] = reference["Identifiant"].to_numpy()[j[meilleurs]]
+    resultats.iloc[lignes, 2] = score[meilleurs]
+    resultats.iloc[lignes, 3] = score_nom[meilleurs]
+    resultats.iloc[lignes, 4] = score_commune[meilleurs]
+    resultats.iloc[lignes, 5] = distance[meilleurs]
+    lignes = i[seconds]
+    resultats.iloc[lignes, 6] = reference[NOM].to_numpy()[j[seconds]]
+    resultats.iloc[lignes, 7] = reference["Identifiant"].to_numpy()[j[seconds]]
+    resultats.iloc[lignes, 8] = score[seconds]
+    for colonne in ["Score", "Score nom", "Score commune", "Distance (km)", "Score second"]:
+        resultats[colonne] = pd.to_numeric(resultats[colonne])
+    return resultats
+
+
+# ---------------------------------------------------------------------------
+# Appariement incrémental
+# ---------------------------------------------------------------------------
+
+def empreintes(df, colonnes):
+    """
+    Empreinte du contenu de chaque ligne sur les colonnes données (entiers 64 bits,
+    stables d'une exécution à l'autre).
+    """
+    colonnes = [colonne for colonne in colonnes if colonne in df]
+    return pd.util.hash_pandas_object(df[colonnes], index=False).to_numpy()
+
+
+def lire_cache(dossier, parametres):
+    """
+    Renvoie (résultats en cache, empreintes de la base en cache), ou (None, None) si le
+    cache est absent ou a été fait avec d'autres paramètres.
+    """
+    dossier = Path(dossier)
+    try:
+        with open(dossier / "appariement.json", "r", encoding="utf-8") as fichier:
+            if json.load(fichier) != parametres:
+                return None, None
+        return pd.read_parquet(dossier / "resultats.parquet"), pd.read_parquet(dossier / "base.parquet")
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None, None
+
+
+def ecrire_cache(dossier, parametres, resultats, base):
+    """
+    Écrit les résultats et les empreintes de la base (écritures atomiques, paramètres en dernier).
+    """
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+    for nom, df in (("resultats.parquet", resultats), ("base.parquet", base)):
+        df.to_parquet(dossier / (nom + ".tmp"), index=False)
+        os.replace(dossier / (nom + ".tmp"), dossier / nom)
+    with open(dossier / "appariement.json.tmp", "w", encoding="utf-8") as fichier:
+        json.dump(parametres, fichier)
+    os.replace(dossier / "appariement.json.tmp", dossier / "appariement.json")
+
+
+def fusionner(anciens, nouveaux, positions):
+    """
+    Meilleur et second candidats parmi ceux de deux résultats d'appariement d'une même
+    liste (anciens : sur la base inchangée, nouveaux : sur les festivals ajoutés ou
+    modifiés). positions donne la position de chaque Identifiant dans la base, pour
+    départager les égalités comme apparier().
+    """
+    # Quatre candidats par ligne : meilleur et second de chaque résultat
+    scores = np.column_stack([anciens["Score"], anciens["Score second"], nouveaux["Score"], nouveaux["Score second"]])
+    identifiants = np.column_stack([anciens["Identifiant match"], anciens["Identifiant second"],
+                                    nouveaux["Identifiant match"], nouveaux["Identifiant second"]])
+    noms = np.column_stack([anciens["Festival match"], anciens["Second match"],
+                            nouveaux["Festival match"], nouveaux["Second match"]])
+    scores = np.where(np.isnan(scores.astype(np.float64)), -np.inf, scores.astype(np.float64))
+    rangs = np.vectorize(lambda identifiant: positions.get(identifiant, len(positions)), otypes=[np.int64])(identifiants)
+    ordre = np.lexsort((rangs, -scores), axis=1)
+    lignes = np.arange(len(anciens))
+
+    # Le détail du score n'est connu que pour les meilleurs candidats (colonnes 0 et 2)
+    fusion = anciens.copy()
+    premier, second = ordre[:, 0], ordre[:, 1]
+    depuis_nouveaux = premier == 2
+    fusion.loc[depuis_nouveaux, COLONNES_RESULTAT[:6]] = nouveaux.loc[depuis_nouveaux, COLONNES_RESULTAT[:6]].to_numpy()
+    change = np.isin(premier, [0, 2])
+    a_second = change & np.isfinite(scores[lignes, second])
+    fusion.loc[change, COLONNES_RESULTAT[6:]] = np.nan
+    fusion.loc[a_second, "Second match"] = noms[lignes, second][a_second]
+    fusion.loc[a_second, "Identifiant second"] = identifiants[lignes, second][a_second]
+    fusion.loc[a_second, "Score second"] = scores[lignes, second][a_second]
+    return fusion
+
+
+def apparier_incremental(externe, reference, colonne_nom="Nom", colonne_commune="Lieu", colonne_departement=None,
+                         dossier=DOSSIER_CACHE, **options):
+    """
+    apparier() en réutilisant les résultats de l'exécution précédente, gardés dans
+    dossier avec une empreinte du contenu de chaque festival externe et de chaque
+    festival de la base.
+
+    - les festivals externes nouveaux ou modifiés sont appariés avec toute la base ;
+    - ceux dont le meilleur ou le second candidat a été modifié ou retiré de la base aussi ;
+    - les autres gardent leur résultat, comparé seulement aux festivals ajoutés ou
+      modifiés de la base.
+    Le résultat est le même qu'avec apparier(), aux candidats près (les blocs dépendent
+    de la fréquence des mots dans la base).
+
+    Renvoie (résultats comme apparier(), rapport) ; le rapport donne le nombre de festivals
+    de chaque cas et les index des festivals externes recalculés.
+    """
+    if "Latitude" not in reference or "Longitude" not in reference:
+        reference = ajouter_coordonnees(reference)
+    parametres = {"version": VERSION_CACHE, "colonne_nom": colonne_nom, "colonne_commune": colonne_commune,
+                  "colonne_departement": colonne_departement, **options}
+    empreintes_externe = empreintes(externe, [colonne_nom, colonne_commune, colonne_departement,
+                                              "Latitude", "Longitude"])
+    base = pd.DataFrame({"Identifiant": reference["Identifiant"].to_numpy(),
+                         "Empreinte": empreintes(reference, COLONNES_EMPREINTE_BASE)})
+    # Position de chaque Identifiant dans la base (la première en cas de doublon)
+    positions = {identifiant: position for position, identifiant in reversed(list(enumerate(base["Identifiant"])))}
+
+    anciens, ancienne_base = lire_cache(dossier, parametres)
+    if anciens is None:
+        anciens = pd.DataFrame(columns=["Empreinte"] + COLONNES_RESULTAT)
+        ancienne_base = base.iloc[:0]
+
+    # Festivals de la base ajoutés, modifiés ou retirés depuis l'exécution précédente
+    avant = ancienne_base.drop_duplicates("Identifiant").set_index("Identifiant")["Empreinte"]
+    connus_avant = base["Identifiant"].isin(avant.index).to_numpy()
+    inchanges = base["Empreinte"].to_numpy() == avant.reindex(base["Identifiant"]).to_numpy()
+    ajoutes_ou_modifies = np.flatnonzero(~inchanges)
+    # Candidats précédents qui ne sont plus dans la base sous la même forme
+    retires = set(avant.index[~avant.index.isin(base["Identifiant"][inchanges])])
+
+    # Festivals externes dont le résultat précédent est réutilisable
+    anciens = anciens.drop_duplicates("Empreinte").set_index("Empreinte")
+    connus = pd.Index(anciens.index).get_indexer(empreintes_externe)
+    nouveaux = int((connus < 0).sum())
+    for ligne in np.flatnonzero(connus >= 0):
+        precedent = anciens.iloc[connus[ligne]]
+        if precedent["Identifiant match"] in retires or precedent["Identifiant second"] in retires:
+            connus[ligne] = -1
+    a_recalculer = np.flatnonzero(connus < 0)
+    a_completer = np.flatnonzero(connus >= 0)
+
+    resultats = pd.DataFrame(index=externe.index, columns=COLONNES_RESULTAT, dtype=object)
+    if len(a_recalculer):
+        resultats.iloc[a_recalculer] = apparier(externe.iloc[a_recalculer], reference, colonne_nom, colonne_commune,
+                                                colonne_departement, **options).to_numpy()
+    if len(a_completer):
+        reutilises = anciens.iloc[connus[a_completer]][COLONNES_RESULTAT].reset_index(drop=True)
+        if len(ajoutes_ou_modifies):
+            complements = apparier(externe.iloc[a_completer], reference.iloc[ajoutes_ou_modifies], colonne_nom,
+                                   colonne_commune, colonne_departement, **options).reset_index(drop=True)
+            reutilises = fusionner(reutilises, complements, positions)
+        resultats.iloc[a_completer] = reutilises.to_numpy()
+    for colonne in ["Score", "Score nom", "Score commune", "Distance (km)", "Score second"]:
+        resultats[colonne] = pd.to_numeric(resultats[colonne])
+
+    cache = resultats.reset_index(drop=True)
+    cache.insert(0, "Empreinte", empreintes_externe)
+    ecrire_cache(dossier, parametres, cache, base)
+
+    rapport = {
+        "base : festivals ajoutés": int((~connus_avant).sum()),
+        "base : festivals modifiés": int((connus_avant & ~inchanges).sum()),
+        "base : festivals retirés": int((~avant.index.isin(base["Identifiant"])).sum()),
+        "externes nouveaux ou modifiés": nouveaux,
+        "externes recalculés car leur candidat a changé": len(a_recalculer) - nouveaux,
+        "externes réutilisés": len(a_completer),
+        "externes réutilisés comparés aux ajouts de la base": len(a_completer) if len(ajoutes_ou_modifies) else 0,
+        "index recalculés": externe.index[a_recalculer].tolist(),
+    }
+    return resultats, rapport
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apparie une liste de festivals avec la base nationale.")
+    parser.add_argument("externe", help="Fichier CSV des festivals à apparier")
+    parser.add_argument("resultats", help="Fichier CSV des résultats")
+    parser.add_argument("--colonne-nom", default="Nom", help="Colonne du nom du festival")
+    parser.add_argument("--colonne-commune", default="Lieu", help="Colonne de la commune")
+    parser.add_argument("--colonne-departement", default=None, help="Colonne du département (facultative)")
+    parser.add_argument("--dossier", default=str(DOSSIER_SNAPSHOT), help="Dossier du snapshot")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Réutiliser les résultats de l'exécution précédente (cache dans --cache)")
+    parser.add_argument("--cache", default=str(DOSSIER_CACHE), help="Dossier du cache de l'appariement incrémental")
+    args = parser.parse_args()
+
+    reference = charger_festivals(args.dossier)
+    externe = pd.read_csv(args.externe)
+    debut = time.perf_counter()
+    if args.incremental:
+        resultats, rapport = apparier_incremental(externe, reference, args.colonne_nom, args.colonne_commune,
+                                                  args.colonne_departement, dossier=args.cache)
+        for cas, valeur in rapport.items():
+            print(f"{cas} : {valeur}")
+    else:
+        resultats = apparier(externe, reference, args.colonne_nom, args.colonne_commune, args.colonne_departement)
+    duree = time.perf_counter() - debut
+    externe.join(resultats).to_csv(args.resultats, index=False, encoding="utf-8")
+    print(f"{len(externe)} festivals appariés en {duree:.2f} s ({resultats['Festival match'].notna().sum()} trouvés)")
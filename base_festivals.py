@@ -0,0 +1,266 @@
+"""
+Snapshot compilé de la base des festivals nettoyée.
+
+`from Nettoyage_base_donnees import df` retélécharge le CSV depuis le S3 et relance
+tout le nettoyage à chaque import. Ce module écrit une fois pour toutes le résultat
+du nettoyage dans un fichier Parquet versionné (dossier cache_festivals/), puis le
+recharge en quelques millisecondes. Le snapshot n'est reconstruit que si le CSV
+source ou les dictionnaires de regroupement (regroupements.py) ont changé.
+
+Utilisation :
+    from base_festivals import charger_festivals
+    df = charger_festivals()
+
+Construction manuelle (par exemple avant de lancer les workers) :
+    python base_festivals.py [--force]
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+import regroupements
+from geodistance import ajouter_coordonnees
+from masques import ajouter_masques
+from saisons import ajouter_code_periode
+from source_festivals import empreinte_source
+
+# Dossier où sont rangés les snapshots et leurs métadonnées
+DOSSIER_SNAPSHOT = Path(__file__).resolve().parent / "cache_festivals"
+FICHIER_META = "snapshot.json"
+
+# À incrémenter si le format du snapshot (colonnes, encodage) change
+# 2 : ajout des colonnes uint64 "Masque disciplines" et "Masque genres" (masques.py)
+# 3 : ajout des colonnes float64 "Latitude" et "Longitude" (geodistance.py)
+# 4 : ajout de la colonne int8 "Code période" (saisons.py)
+# 5 : coordonnées manquantes complétées par l'API Adresse (geocodage_lot.py)
+# 6 : empreinte des coordonnées dans la clé (géocodage)
+VERSION_FORMAT = 6
+
+# Colonnes contenant des listes de sous-catégories (ou None)
+COLONNES_LISTES = [
+    "Nouvelles sous-catégories spectacle vivant",
+    "Nouvelles sous-catégories arts visuels",
+    "Nouvelles sous-catégories cinéma et audiovisuel",
+    "Nouvelles sous-catégories livre et littérature",
+    "Nouvelles sous-catégories musique",
+]
+
+
+def empreinte_regroupements():
+    """
+    Calcule une empreinte des dictionnaires de regroupement de regroupements.py.
+    """
+    dictionnaires = {
+        nom: getattr(regroupements, nom)
+        for nom in sorted(dir(regroupements))
+        if nom.startswith("regroupements_")
+    }
+    contenu = json.dumps(dictionnaires, sort_keys=True, ensure_ascii=False)
+    return "sha256:" + hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+
+def empreinte_coordonnees(df):
+    """
+    Empreinte des colonnes Latitude et Longitude d'un DataFrame de festivals.
+    """
+    sha = hashlib.sha256()
+    for colonne in ("Latitude", "Longitude"):
+        sha.update(df[colonne].to_numpy(dtype="float64").tobytes())
+    return "sha256:" + sha.hexdigest()
+
+
+def cle_snapshot(empreinte_src, empreinte_regr, empreinte_coord=""):
+    """
+    Identifiant de version d'un snapshot (format + source + regroupements + coordonnées).
+
+    Les coordonnées en font partie parce que le géocodage les complète sans que la
+    source change : les fichiers dérivés nommés d'après la clé (index_<clé>.npz,
+    noms_<clé>.npz, cube_<clé>.parquet) sont alors reconstruits.
+    """
+    contenu = f"{VERSION_FORMAT}|{empreinte_src}|{empreinte_regr}|{empreinte_coord}"
+    return hashlib.sha256(contenu.encode("utf-8")).hexdigest()[:16]
+
+
+def executer_nettoyage():
+    """
+    Exécute Nettoyage_base_donnees.py et renvoie le module (df, cube).
+
+    Le script est relancé s'il a déjà été importé dans ce processus : import_module
+    renverrait sinon le module en cache, nettoyé depuis la source précédente.
+    """
+    nom = "Nettoyage_base_donnees"
+    if nom in sys.modules:
+        return importlib.reload(sys.modules[nom])
+    return importlib.import_module(nom)
+
+
+def lire_meta(dossier=DOSSIER_SNAPSHOT):
+    """
+    Renvoie les métadonnées du snapshot courant, ou None s'il n'y en a pas.
+    """
+    chemin = Path(dossier) / FICHIER_META
+    try:
+        with open(chemin, "r", encoding="utf-8") as fichier:
+            return json.load(fichier)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def snapshot_a_jour(dossier=DOSSIER_SNAPSHOT, verifier_source=None):
+    """
+    Indique si le snapshot courant correspond à la source et aux regroupements actuels.
+
+    Par défaut (verifier_source=None), la source n'est comparée que si c'est un CSV
+    local (FESTIVALS_CSV) : aucun accès réseau à chaque chargement. Avec
+    verifier_source=True, l'objet S3 est aussi comparé (requête de métadonnées), comme
+    le fait `python base_festivals.py` ; avec False, seuls le format et les regroupements
+    sont vérifiés (workers qui font confiance à l'étape de build).
+    """
+    meta = lire_meta(dossier)
+    if meta is None or meta.get("version_format") != VERSION_FORMAT:
+        return False
+    if not (Path(dossier) / meta["fichier"]).exists():
+        return False
+    if meta.get("empreinte_regroupements") != empreinte_regroupements():
+        return False
+    if verifier_source is not False:
+        empreinte = empreinte_source(distante=bool(verifier_source))
+        if empreinte is not None and meta.get("empreinte_source") != empreinte:
+            return False
+    return True
+
+
+def geocodage_a_refaire(meta):
+    """
+    Indique si le snapshot n'a pas été géocodé, ou si des lots envoyés à l'API Adresse
+    ont échoué (réseau, erreur serveur) : leurs festivals sont restés sans coordonnées.
+    """
+    geocodage = (meta or {}).get("geocodage")
+    return geocodage is None or geocodage.get("lots_en_erreur", 0) > 0
+
+
+def construire_snapshot(dossier=DOSSIER_SNAPSHOT, geocoder_manquants=False):
+    """
+    Lance le nettoyage complet (Nettoyage_base_donnees.py) et écrit le snapshot.
+
+    Le cube d'agrégats (agregats.py) calculé par le nettoyage est écrit à côté.
+    Avec geocoder_manquants, les festivals sans coordonnées valides sont géocodés
+    par lots (geocodage_lot.py) ; ceux que l'API ne trouve pas restent à NaN. Ce
+    n'est pas fait par défaut : les reconstructions implicites (charger_festivals,
+    charger_index...) n'appellent pas le réseau, seul `python base_festivals.py` le fait.
+    Renvoie le chemin du fichier Parquet écrit.
+    """
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+
+    empreinte_src = empreinte_source()
+    empreinte_regr = empreinte_regroupements()
+
+    debut = time.perf_counter()
+    nettoyage = executer_nettoyage()
+    df = nettoyage.df.reset_index(drop=True)
+    df = ajouter_code_periode(ajouter_coordonnees(ajouter_masques(df)))
+    duree_nettoyage = time.perf_counter() - debut
+
+    rapport_geocodage = None
+    if geocoder_manquants:
+        from geocodage_lot import completer_coordonnees  # requests et client HTTP seulement ici
+        df, rapport_geocodage = completer_coordonnees(df)
+        for numero, lot in enumerate(rapport_geocodage["lots"], 1):
+            print(f"Géocodage, lot {numero} : {lot}")
+    cle = cle_snapshot(empreinte_src, empreinte_regr, empreinte_coordonnees(df))
+
+    # Écriture atomique : fichier temporaire puis renommage
+    fichier = f"festivals_{cle}.parquet"
+    chemin_tmp = dossier / (fichier + ".tmp")
+    df.to_parquet(chemin_tmp, index=False)
+    os.replace(chemin_tmp, dossier / fichier)
+
+    # Cube d'agrégats : celui que le nettoyage a calculé pour ses comptes (le géocodage
+    # ne change aucune de ses dimensions), écrit une fois au lieu d'être recalculé
+    from agregats import construire_cube, ecrire_cube  # agregats importe base_festivals
+    cube = getattr(nettoyage, "cube", None)
+    ecrire_cube(construire_cube(df) if cube is None else cube, dossier, cle)
+
+    meta = {
+        "version_format": VERSION_FORMAT,
+        "cle": cle,
+        "fichier": fichier,
+        "empreinte_source": empreinte_src,
+        "empreinte_regroupements": empreinte_regr,
+        "nb_festivals": int(len(df)),
+        "duree_nettoyage_s": round(duree_nettoyage, 3),
+        "geocodage": None if rapport_geocodage is None else {
+            "festivals_sans_coordonnees": rapport_geocodage["festivals_sans_coordonnees"],
+            "festivals_completes": rapport_geocodage["festivals_completes"],
+            "lots_en_erreur": sum("erreur" in lot for lot in rapport_geocodage["lots"]),
+        },
+        "date_construction": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    chemin_meta_tmp = dossier / (FICHIER_META + ".tmp")
+    with open(chemin_meta_tmp, "w", encoding="utf-8") as fichier_meta:
+        json.dump(meta, fichier_meta, ensure_ascii=False, indent=2)
+    os.replace(chemin_meta_tmp, dossier / FICHIER_META)
+
+    # Supprimer les anciennes versions du snapshot
+    for ancien in dossier.glob("festivals_*.parquet"):
+        if ancien.name != fichier:
+            ancien.unlink()
+
+    print(f"Snapshot {cle} écrit : {len(df)} festivals ({duree_nettoyage:.1f} s de nettoyage)")
+    return dossier / fichier
+
+
+def lire_snapshot(chemin):
+    """
+    Lit un fichier snapshot et redonne aux colonnes de sous-catégories leur forme
+    d'origine (listes Python, ou None).
+    """
+    df = pd.read_parquet(chemin)
+    for col in COLONNES_LISTES:
+        if col in df.columns:
+            df[col] = [list(x) if x is not None else None for x in df[col]]
+    return df
+
+
+def charger_festivals(dossier=DOSSIER_SNAPSHOT, verifier_source=None, reconstruire=True):
+    """
+    Renvoie le DataFrame des festivals nettoyé, depuis le snapshot compilé.
+
+    Le snapshot est (re)construit si besoin lorsque reconstruire=True ; sinon une
+    erreur est levée s'il est absent ou périmé.
+    """
+    if not snapshot_a_jour(dossier, verifier_source=verifier_source):
+        if not reconstruire:
+            raise FileNotFoundError(
+                f"Aucun snapshot à jour dans {dossier}. Lancez 'python base_festivals.py'."
+            )
+        construire_snapshot(dossier)
+    meta = lire_meta(dossier)
+    return lire_snapshot(Path(dossier) / meta["fichier"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Construit le snapshot compilé des festivals.")
+    parser.add_argument("--force", action="store_true", help="Reconstruire même si le snapshot est à jour")
+    parser.add_argument("--dossier", default=str(DOSSIER_SNAPSHOT), help="Dossier du snapshot")
+    parser.add_argument("--sans-geocodage", action="store_true",
+                        help="Ne pas géocoder les festivals sans coordonnées (aucun appel à l'API Adresse)")
+    args = parser.parse_args()
+
+    # Un snapshot non géocodé (reconstruction implicite) ou dont des lots ont échoué
+    # est reconstruit : les communes déjà géocodées sont lues dans le cache
+    geocoder = not args.sans_geocodage
+    if (args.force or not snapshot_a_jour(args.dossier, verifier_source=True)
+            or (geocoder and geocodage_a_refaire(lire_meta(args.dossier)))):
+        construire_snapshot(args.dossier, geocoder_manquants=geocoder)
+    else:
+        print(f"Snapshot déjà à jour : {lire_meta(args.dossier)['cle']}")
@@ -0,0 +1,67 @@
+"""
+Mesure de la taille de la page et du temps de construction de la carte des
+festivals (carte.py), pour 100, 1 000 festivals et la base complète, dans les
+trois modes d'affichage :
+- "marqueurs" : un folium.Marker avec popup HTML par festival ;
+- "regroupe" : FastMarkerCluster, marqueurs et popups créés par le navigateur ;
+- "vue" : seulement les festivals de la vue initiale autour de l'utilisateur.
+
+La taille est celle de la page HTML complète produite par folium ; le temps
+comprend la construction de la carte et son rendu en HTML.
+
+Utilisation :
+    python bench_carte.py [--dossier cache_festivals] [--repetitions 3]
+"""
+
+import argparse
+import statistics
+import time
+
+from base_festivals import DOSSIER_SNAPSHOT, charger_festivals
+from carte import ajuster_coordonnees, carte_de_base, construire_carte, emprise_initiale, groupe_vue
+
+TAILLES = [100, 1000, None]  # None : base complète
+POSITION = (48.8566, 2.3522)  # Paris
+
+
+def page(festivals, lat, lon, mode):
+    """
+    Construit la carte dans le mode donné ; renvoie le HTML de la page.
+    """
+    if mode == "vue":
+        carte = carte_de_base(POSITION)
+        couche, _, _ = groupe_vue(festivals, lat, lon, emprise_initiale(POSITION))
+        couche.add_to(carte)
+        carte.get_root().render()
+    else:
+        carte = construire_carte(festivals, lat, lon, POSITION, mode)
+    return carte.get_root().render()
+
+
+def mesurer(festivals, mode, repetitions):
+    """
+    Renvoie (taille de la page en octets, médiane du temps de construction en s).
+    """
+    lat = festivals["Latitude"].to_numpy()
+    lon = festivals["Longitude"].to_numpy()
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        html = page(festivals, lat, lon, mode)
+        durees.append(time.perf_counter() - debut)
+    return len(html.encode("utf-8")), statistics.median(durees)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Taille et temps de construction de la carte des festivals.")
+    parser.add_argument("--dossier", default=str(DOSSIER_SNAPSHOT), help="Dossier du snapshot")
+    parser.add_argument("--repetitions", type=int, default=3, help="Nombre de mesures par cas")
+    args = parser.parse_args()
+
+    base = ajuster_coordonnees(charger_festivals(args.dossier))
+    base = base[base["Latitude"].notna() & base["Longitude"].notna()].reset_index(drop=True)
+    for taille in TAILLES:
+        festivals = base if taille is None else base.sample(min(taille, len(base)), random_state=0)
+        for mode in ("marqueurs", "regroupe", "vue"):
+            octets, duree = mesurer(festivals, mode, args.repetitions)
+            print(f"{len(festivals):>6} festivals, {mode:<9} : {octets / 1e6:7.2f} Mo, {duree * 1000:8.0f} ms")
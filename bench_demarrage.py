@@ -0,0 +1,92 @@
+"""
+Mesure du temps de démarrage de app.py et questions.py jusqu'au premier rendu.
+
+Chaque mesure lance un nouveau processus Python (machine « chaude » : fichiers
+déjà en cache disque), qui exécute le script avec streamlit.testing (AppTest)
+comme le ferait `streamlit run`, sans navigateur. Sont mesurés :
+- le lancement : import de streamlit, fait une fois par le serveur avant que le
+  navigateur ne se connecte ;
+- le premier rendu : première exécution du script, imports propres au script
+  compris (folium, pandas...) ;
+- la relance : une nouvelle exécution du script dans le même processus, comme
+  après une interaction de l'utilisateur (clic sur la carte de app.py) ; c'est
+  la médiane de NB_RELANCES exécutions, caches Streamlit déjà remplis.
+
+Utilisation :
+    python bench_demarrage.py [--repetitions 5] [--seuil 1.5] [--seuil-relance 0.1]
+
+Le code de sortie vaut 1 si la médiane du premier rendu dépasse l'objectif du script
+(SEUILS_PREMIER_RENDU, ou --seuil pour tous) ou si celle de la relance dépasse
+--seuil-relance (s).
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+DOSSIER = Path(__file__).resolve().parent
+SCRIPTS = ["questions.py", "app.py"]
+NB_RELANCES = 5
+
+# Objectif du premier rendu (s). Le premier rendu de app.py importe forcément folium
+# et streamlit_folium (la carte est affichée d'emblée) : un script qui ne fait que
+# cet import met déjà environ 1,1 s ; scipy (index_noms) n'est chargé qu'à la
+# première recherche.
+SEUILS_PREMIER_RENDU = {"questions.py": 1.0, "app.py": 1.5}
+
+# Code exécuté dans chaque processus de mesure
+MESURE = """
+import json, sys, time
+debut = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+serveur = time.perf_counter() - debut
+app = AppTest.from_file(sys.argv[1], default_timeout=60)
+debut = time.perf_counter()
+app.run()
+premier_rendu = time.perf_counter() - debut
+relances = []
+for _ in range(int(sys.argv[2])):
+    debut = time.perf_counter()
+    app.run()
+    relances.append(time.perf_counter() - debut)
+relance = sorted(relances)[len(relances) // 2]
+print(json.dumps({"serveur": serveur, "premier_rendu": premier_rendu, "relance": relance,
+                  "exception": bool(app.exception)}))
+"""
+
+
+def mesurer(script):
+    """
+    Lance une mesure dans un nouveau processus ; renvoie le dictionnaire des durées (s).
+    """
+    sortie = subprocess.run(
+        [sys.executable, "-c", MESURE, script, str(NB_RELANCES)], cwd=DOSSIER, capture_output=True, text=True, check=True
+    )
+    return json.loads(sortie.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temps de démarrage des applications Streamlit.")
+    parser.add_argument("--repetitions", type=int, default=5, help="Nombre de mesures par script")
+    parser.add_argument("--seuil", type=float,
+                        help="Temps maximal du premier rendu (s), pour tous les scripts (défaut : SEUILS_PREMIER_RENDU)")
+    parser.add_argument("--seuil-relance", type=float, default=0.1, help="Temps maximal d'une relance (s)")
+    args = parser.parse_args()
+
+    depasse = False
+    for script in SCRIPTS:
+        mesurer(script)  # Chauffe : cache disque et fichiers .pyc
+        mesures = [mesurer(script) for _ in range(args.repetitions)]
+        premier_rendu = statistics.median(m["premier_rendu"] for m in mesures)
+        relance = statistics.median(m["relance"] for m in mesures)
+        serveur = statistics.median(m["serveur"] for m in mesures)
+        erreur = " (exception dans le script)" if any(m["exception"] for m in mesures) else ""
+        print(f"{script} : lancement {serveur * 1000:.0f} ms, premier rendu {premier_rendu * 1000:.0f} ms, "
+              f"relance {relance * 1000:.0f} ms{erreur}")
+        seuil = args.seuil if args.seuil is not None else SEUILS_PREMIER_RENDU[script]
+        depasse |= premier_rendu > seuil or relance > args.seuil_relance or bool(erreur)
+
+    sys.exit(1 if depasse else 0)
@@ -0,0 +1,344 @@
+"""
+Construction de la carte folium des festivals affichée par app.py.
+
+Un folium.Marker avec son popup HTML par festival convient pour les quelques
+festivals recommandés, mais pas pour toute la base : la page pèse plusieurs
+mégaoctets et le navigateur se fige. Trois modes d'affichage :
+- "marqueurs" : un marqueur et un popup HTML par festival (peu de festivals) ;
+- "regroupe" : FastMarkerCluster. Les festivals sont envoyés sous forme d'un
+  tableau JavaScript compact [lat, lon, nom, date, description, lien, identifiant] ; les
+  marqueurs sont créés et regroupés par le navigateur, et le popup d'un festival
+  n'est construit que lorsqu'on l'ouvre ;
+- "vue" : seuls les festivals dans l'emprise affichée (bounds renvoyées par
+  st_folium) sont envoyés, en couche ajoutée à une carte de base légère
+  (feature_group_to_add de st_folium), et renvoyés à chaque déplacement. Au-delà
+  de MAX_FESTIVALS_VUE, un échantillon réparti sur toute l'emprise est envoyé, et
+  app.py indique combien de festivals la zone contient en tout.
+
+Le temps de construction et la taille de la page sont mesurés par bench_carte.py.
+
+L'infobulle de chaque marqueur contient, masqué, l'identifiant du festival : st_folium
+le renvoie avec le clic (last_object_clicked_tooltip), ce qui retrouve le festival
+cliqué par un simple dictionnaire (IndexClics), même si son marqueur a été décalé.
+"""
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import FastMarkerCluster
+
+from geodistance import ajouter_coordonnees
+
+MODES = ("marqueurs", "regroupe", "vue")
+
+# Au-delà de ce nombre de festivals, app.py n'utilise plus un marqueur par festival
+SEUIL_REGROUPEMENT = 200
+
+# Nombre maximal de festivals envoyés en mode "vue" ; au-delà, un échantillon réparti
+# sur une grille de CASES_ECHANTILLON x CASES_ECHANTILLON cases de l'emprise
+MAX_FESTIVALS_VUE = 2000
+CASES_ECHANTILLON = 32
+
+# Demi-hauteur et demi-largeur (degrés) de la vue initiale : zoom 6, carte de 800 x 600 px
+EMPRISE_INITIALE = (4.5, 8.8)
+
+# Décalage (degrés de latitude) entre deux festivals ayant la même position géographique
+PAS_DECALAGE = 0.005
+ANGLE_DOR = np.pi * (3 - np.sqrt(5))
+
+# Séparateur entre le nom et l'identifiant (masqué) dans l'infobulle des marqueurs
+SEPARATEUR_IDENTIFIANT = "||"
+
+# Précision (décimales) des positions de marqueurs comparées par IndexClics
+DECIMALES_POSITION = 5
+
+# Création d'un marqueur à partir d'une ligne [lat, lon, nom, date, description, lien, identifiant]
+# (même apparence que les folium.Marker ; le popup est construit à l'ouverture)
+CALLBACK_MARQUEUR = """(function () {
+    var echapper = function (texte) {
+        return String(texte).replace(/[&<>"']/g, function (c) {
+            return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+        });
+    };
+    return function (row) {
+        var icon = L.AwesomeMarkers.icon({icon: "info-sign", markerColor: "blue", prefix: "glyphicon"});
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+        marker.bindTooltip(echapper(row[2]) + '<span style="display:none">||' + echapper(row[6]) + "</span>");
+        marker.bindPopup(function () {
+            return "<b>" + echapper(row[2]) + "</b><br>"
+                + "Date : " + echapper(row[3]) + "<br>"
+                + echapper(row[4]) + "<br>"
+                + '<a href="' + echapper(row[5]) + '" target="_blank" '
+                + 'style="color:blue; text-decoration:underline;">Lien vers le site</a>';
+        }, {maxWidth: 300});
+        return marker;
+    };
+})()"""
+
+
+class CarteRendue(folium.Map):
+    """
+    Carte folium rendue une seule fois, à sa construction.
+
+    st_folium rend la carte qu'on lui passe à chaque appel, donc à chaque relance
+    pour une carte gardée en cache (et folium ajoute alors une nouvelle fois les
+    mêmes lignes de script). Les rendus suivants sont ici sans effet.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._id = "div"  # Identifiant que st_folium donne de toute façon à la carte
+        self._rendue = False
+
+    def render(self, **kwargs):
+        if not self._rendue:
+            super().render(**kwargs)
+            self._rendue = True
+
+
+# Fonction pour décaler légèrement les marqueurs en cas de doublon
+def ajuster_coordonnees(festivals):
+    """
+    Décale légèrement les coordonnées pour les festivals ayant les mêmes positions géographiques.
+
+    Le n-ième doublon d'une position (n = 1, 2...) est placé sur une spirale autour
+    de celle-ci (rayon PAS_DECALAGE * racine de n, angle n fois l'angle d'or) : les
+    marqueurs restent groupés autour du lieu au lieu de s'en éloigner en diagonale.
+    Renvoie une copie avec les colonnes numériques "Latitude" et "Longitude" décalées.
+    """
+    if "Latitude" not in festivals or "Longitude" not in festivals:
+        festivals = ajouter_coordonnees(festivals)
+    lat = festivals["Latitude"].to_numpy(dtype=np.float64)
+    lon = festivals["Longitude"].to_numpy(dtype=np.float64)
+
+    # Rang de chaque festival parmi ceux de même position (0 pour le premier)
+    rang = festivals.groupby([lat, lon]).cumcount().to_numpy(dtype=np.float64)
+    rang = np.nan_to_num(rang)  # Coordonnées manquantes : pas de décalage
+    rayon = PAS_DECALAGE * np.sqrt(rang)
+    angle = rang * ANGLE_DOR
+    # Le décalage en longitude est corrigé pour garder des cercles sur la carte
+    echelle = 1 / np.maximum(np.cos(np.radians(lat)), 0.01)
+
+    festivals = festivals.copy()
+    festivals["Latitude"] = lat + rayon * np.sin(angle)
+    festivals["Longitude"] = lon + rayon * np.cos(angle) * echelle
+    return festivals
+
+
+def lien_festival(festival):
+    """
+    Site internet du festival, ou "#" s'il n'est pas renseigné.
+    """
+    lien = festival['Site internet du festival']
+    return lien if pd.notna(lien) else "#"
+
+
+def identifiants_festivals(festivals):
+    """
+    Identifiants des festivals (colonne "Identifiant", sinon le numéro de ligne), en texte.
+    """
+    if "Identifiant" in festivals:
+        return festivals["Identifiant"].astype(str).to_numpy()
+    return np.arange(len(festivals)).astype(str)
+
+
+def infobulle(nom, identifiant):
+    """
+    Infobulle d'un marqueur : le nom du festival, suivi de son identifiant masqué.
+    """
+    return f'{nom}<span style="display:none">{SEPARATEUR_IDENTIFIANT}{identifiant}</span>'
+
+
+def carte_de_base(user_location):
+    """
+    Carte centrée sur l'utilisateur, avec seulement le marqueur de sa position.
+    """
+    carte = CarteRendue(location=list(user_location), zoom_start=6, tiles="OpenStreetMap")
+
+    # Ajouter un marqueur pour l'utilisateur
+    folium.Marker(
+        location=list(user_location),
+        popup=f"<b>Votre adresse</b>",
+        tooltip="Votre position 📍",
+        icon=folium.Icon(color='red', icon='info-sign')
+    ).add_to(carte)
+    return carte
+
+
+def ajouter_marqueurs(carte, festivals, lat_festivals, lon_festivals):
+    """
+    Ajoute un marqueur avec popup HTML pour chaque festival (mode "marqueurs").
+    """
+    identifiants = identifiants_festivals(festivals)
+    for (_, row), lat, lon, identifiant in zip(festivals.iterrows(), lat_festivals, lon_festivals, identifiants):
+        if np.isnan(lat) or np.isnan(lon):
+            continue  # Ignorer si les coordonnées ne sont pas valides
+
+        nom = row['Nom du festival']
+        date = row['Période principale de déroulement du festival']
+        description = f"{row['Discipline dominante']} - {row['Envergure territoriale']}"
+        lien = lien_festival(row)
+
+        # Ajouter un marqueur avec popup
+        popup_content = f"""
+        <b>{nom}</b><br>
+        Date : {date}<br>
+        {description}<br>
+        <a href="{lien}" target="_blank" style="color:blue; text-decoration:underline;">Lien vers le site</a>
+        """
+        folium.Marker(
+            location=[lat, lon],
+            popup=popup_content,
+            tooltip=infobulle(nom, identifiant),
+            icon=folium.Icon(color='blue', icon='info-sign')
+        ).add_to(carte)
+    return carte
+
+
+def groupe_regroupe(festivals, lat_festivals, lon_festivals):
+    """
+    FastMarkerCluster des festivals (mode "regroupe") : une ligne de données par
+    festival, les marqueurs et les popups sont créés par le navigateur.
+    """
+    valides = ~(np.isnan(lat_festivals) | np.isnan(lon_festivals))
+    festivals = festivals[valides]
+    lignes = pd.DataFrame({
+        "lat": lat_festivals[valides],
+        "lon": lon_festivals[valides],
+        "nom": festivals['Nom du festival'].astype(str).to_numpy(),
+        "date": festivals['Période principale de déroulement du festival'].fillna("").astype(str).to_numpy(),
+        "description": (festivals['Discipline dominante'].astype(str) + " - "
+                        + festivals['Envergure territoriale'].astype(str)).to_numpy(),
+        "lien": festivals['Site internet du festival'].fillna("#").astype(str).to_numpy(),
+        "identifiant": identifiants_festivals(festivals),
+    })
+    return FastMarkerCluster(lignes.values.tolist(), callback=CALLBACK_MARQUEUR, name="Festivals")
+
+
+def construire_carte(festivals, lat_festivals, lon_festivals, user_location, mode="marqueurs"):
+    """
+    Carte des festivals et de la position de l'utilisateur, en mode "marqueurs" ou "regroupe".
+    """
+    carte = carte_de_base(user_location)
+    if mode == "marqueurs":
+        ajouter_marqueurs(carte, festivals, lat_festivals, lon_festivals)
+    elif mode == "regroupe":
+        groupe_regroupe(festivals, lat_festivals, lon_festivals).add_to(carte)
+    else:
+        raise ValueError(f"Mode de carte inconnu : {mode!r} (attendu : 'marqueurs' ou 'regroupe')")
+    carte.get_root().render()
+    return carte
+
+
+def emprise_initiale(user_location):
+    """
+    Emprise approximative de la vue initiale, au format des bounds de st_folium.
+    """
+    dlat, dlon = EMPRISE_INITIALE
+    lat, lon = user_location
+    return {"_southWest": {"lat": lat - dlat, "lng": lon - dlon},
+            "_northEast": {"lat": lat + dlat, "lng": lon + dlon}}
+
+
+def echantillon_reparti(lat, lon, emprise, limite, graine=0):
+    """
+    Indices de limite points parmi (lat, lon), répartis sur l'emprise : les points
+    sont pris tour à tour dans chaque case d'une grille, au hasard dans une case
+    (avec une graine fixe, pour que la carte ne change pas d'une relance à l'autre).
+    """
+    sud, ouest = emprise["_southWest"]["lat"], emprise["_southWest"]["lng"]
+    nord, est = emprise["_northEast"]["lat"], emprise["_northEast"]["lng"]
+    ligne = np.clip(((lat - sud) / max(nord - sud, 1e-9) * CASES_ECHANTILLON).astype(np.int64),
+                    0, CASES_ECHANTILLON - 1)
+    colonne = np.clip((((lon - ouest) % 360) / max(est - ouest, 1e-9) * CASES_ECHANTILLON).astype(np.int64),
+                      0, CASES_ECHANTILLON - 1)
+    cases = ligne * CASES_ECHANTILLON + colonne
+
+    # Rang de chaque point dans sa case, dans un ordre aléatoire
+    hasard = np.random.default_rng(graine).permutation(len(cases))
+    tri = hasard[np.argsort(cases[hasard], kind="stable")]
+    cases_triees = cases[tri]
+    debuts = np.flatnonzero(np.r_[True, cases_triees[1:] != cases_triees[:-1]])
+    rangs = np.empty(len(cases), dtype=np.int64)
+    rangs[tri] = np.arange(len(cases)) - np.repeat(debuts, np.diff(np.r_[debuts, len(cases)]))
+
+    # D'abord le premier point de chaque case, puis le deuxième, etc.
+    ordre = np.lexsort((np.argsort(hasard), rangs))
+    return np.sort(ordre[:limite])
+
+
+def positions_dans_emprise(lat_festivals, lon_festivals, emprise, limite=MAX_FESTIVALS_VUE):
+    """
+    Positions (dans l'ordre de la table) des festivals situés dans l'emprise, au plus
+    limite, et nombre total de festivals dans l'emprise. Au-delà de limite, les
+    positions sont un échantillon réparti sur toute l'emprise (echantillon_reparti).
+    """
+    sud, ouest = emprise["_southWest"]["lat"], emprise["_southWest"]["lng"]
+    nord, est = emprise["_northEast"]["lat"], emprise["_northEast"]["lng"]
+    dedans = (lat_festivals >= sud) & (lat_festivals <= nord)
+    if est - ouest < 360:  # Sinon toutes les longitudes sont visibles
+        # Leaflet peut renvoyer des longitudes hors de [-180, 180] après plusieurs tours du monde
+        decalage = (lon_festivals - ouest) % 360
+        dedans &= decalage <= (est - ouest)
+    positions = np.flatnonzero(dedans)
+    if len(positions) <= limite:
+        return positions, len(positions)
+    choisis = echantillon_reparti(lat_festivals[positions], lon_festivals[positions], emprise, limite)
+    return positions[choisis], len(positions)
+
+
+def groupe_vue(festivals, lat_festivals, lon_festivals, emprise):
+    """
+    Couche des festivals situés dans l'emprise (mode "vue"), à passer à
+    st_folium(feature_group_to_add=...). Renvoie (couche, nombre de festivals
+    affichés, nombre de festivals dans l'emprise).
+    """
+    positions, nb_emprise = positions_dans_emprise(lat_festivals, lon_festivals, emprise)
+    couche = folium.FeatureGroup(name="Festivals de la vue")
+    groupe_regroupe(festivals.iloc[positions], lat_festivals[positions],
+                    lon_festivals[positions]).add_to(couche)
+    return couche, len(positions), nb_emprise
+
+
+def cles_positions(lat, lon):
+    """
+    Clés (lat, lon) arrondies à DECIMALES_POSITION décimales.
+    """
+    lat = np.round(np.asarray(lat, dtype=np.float64), DECIMALES_POSITION)
+    lon = np.round(np.asarray(lon, dtype=np.float64), DECIMALES_POSITION)
+    return list(zip(lat.tolist(), lon.tolist()))
+
+
+class IndexClics:
+    """
+    Retrouve en temps constant le festival correspondant à un clic sur la carte.
+
+    Le festival est cherché d'après l'identifiant contenu dans l'infobulle du
+    marqueur cliqué ; à défaut (marqueur sans identifiant), d'après la position du
+    marqueur, arrondie. Les positions sont celles des marqueurs, déjà décalées par
+    ajuster_coordonnees.
+    """
+
+    def __init__(self, festivals, lat_festivals, lon_festivals):
+        identifiants = identifiants_festivals(festivals)
+        positions = range(len(identifiants) - 1, -1, -1)
+        # Parcours à l'envers : en cas de doublon, c'est le premier festival qui est gardé
+        self.par_identifiant = dict(zip(identifiants[::-1].tolist(), positions))
+        valides = ~(np.isnan(lat_festivals) | np.isnan(lon_festivals))
+        cles = cles_positions(lat_festivals, lon_festivals)
+        self.par_position = {cles[i]: i for i in reversed(np.flatnonzero(valides).tolist())}
+
+    def position(self, resultat):
+        """
+        Position dans la table du festival cliqué, d'après le résultat de st_folium
+        (last_object_clicked_tooltip et last_object_clicked), ou None.
+        """
+        if not resultat or not resultat.get("last_object_clicked"):
+            return None
+        infobulle = resultat.get("last_object_clicked_tooltip") or ""
+        if SEPARATEUR_IDENTIFIANT in infobulle:
+            identifiant = infobulle.rsplit(SEPARATEUR_IDENTIFIANT, 1)[1].strip()
+            if identifiant in self.par_identifiant:
+                return self.par_identifiant[identifiant]
+        clic = resultat["last_object_clicked"]
+        return self.par_position.get(cles_positions([clic["lat"]], [clic["lng"]])[0])
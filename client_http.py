@@ -0,0 +1,329 @@
+"""
+Client HTTP commun à tous les appels sortants (API Adresse, infoconcert.com, Nominatim).
+
+- Une seule requests.Session par processus : les connexions sont gardées ouvertes
+  (keep-alive) et réutilisées d'un appel à l'autre, sans nouvelle poignée de main
+  TCP + TLS à chaque requête.
+- Des limites par hôte (nombre de requêtes simultanées, requêtes par seconde)
+  respectent les conditions d'utilisation de chaque service.
+- Les erreurs réseau et les statuts 429/5xx sont réessayés avec un délai
+  exponentiel (ou le délai indiqué par l'en-tête Retry-After).
+- Des métriques de durée, d'erreurs et de réessais sont tenues par hôte.
+
+Une variante asynchrone (ClientAsync, basée sur httpx) permet de lancer beaucoup
+de requêtes en parallèle avec les mêmes limites et les mêmes métriques :
+
+    async with ClientAsync() as client:
+        reponses = await client.get_tous(urls)
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "festival_scraper"
+TIMEOUT = 10
+
+# Limites par hôte : requêtes simultanées et requêtes par seconde
+# (Nominatim impose au plus une requête par seconde, l'API Adresse 50 par seconde et par IP)
+LIMITES_HOTES = {
+    "api-adresse.data.gouv.fr": {"concurrence": 10, "requetes_par_seconde": 40},
+    "infoconcert.com": {"concurrence": 2, "requetes_par_seconde": 1},
+    "www.infoconcert.com": {"concurrence": 2, "requetes_par_seconde": 1},
+    "nominatim.openstreetmap.org": {"concurrence": 1, "requetes_par_seconde": 1},
+}
+LIMITES_DEFAUT = {"concurrence": 4, "requetes_par_seconde": 10}
+
+# Réessais : nombre total d'essais, délai de base (s, doublé à chaque essai) et plafond
+NB_ESSAIS = 4
+DELAI_BASE = 0.5
+DELAI_MAX = 30
+STATUTS_A_REESSAYER = {429, 500, 502, 503, 504}
+
+# Taille du pool de connexions gardées ouvertes par hôte
+TAILLE_POOL = 20
+
+
+def hote(url):
+    """
+    Nom d'hôte d'une URL (avec le port s'il est précisé).
+    """
+    return urlsplit(url).netloc.lower()
+
+
+def limites(nom_hote):
+    """
+    Limites (concurrence, requêtes par seconde) applicables à un hôte.
+    """
+    return LIMITES_HOTES.get(nom_hote, LIMITES_DEFAUT)
+
+
+def delai_avant_essai(essai, reponse=None):
+    """
+    Délai (s) avant l'essai suivant : Retry-After s'il est donné, sinon exponentiel
+    avec une part aléatoire pour ne pas relancer tous les clients en même temps.
+    """
+    if reponse is not None:
+        retry_after = reponse.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), DELAI_MAX)
+            except ValueError:
+                try:
+                    return min(max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0), DELAI_MAX)
+                except (TypeError, ValueError):
+                    pass
+    return min(DELAI_BASE * 2 ** essai, DELAI_MAX) * random.uniform(0.5, 1)
+
+
+# --- Métriques ---
+
+class Metriques:
+    """
+    Durées, erreurs et réessais des requêtes, par hôte.
+    """
+
+    def __init__(self, taille_historique=1000):
+        self.verrou = threading.Lock()
+        self.durees = defaultdict(lambda: deque(maxlen=taille_historique))
+        self.compteurs = defaultdict(lambda: {"requetes": 0, "erreurs": 0, "reessais": 0, "duree_totale": 0.0})
+
+    def enregistrer(self, nom_hote, duree, erreur=False, reessai=False):
+        with self.verrou:
+            compteurs = self.compteurs[nom_hote]
+            compteurs["requetes"] += 1
+            compteurs["erreurs"] += int(erreur)
+            compteurs["reessais"] += int(reessai)
+            compteurs["duree_totale"] += duree
+            self.durees[nom_hote].append(duree)
+
+    def resume(self):
+        """
+        Renvoie {hôte: statistiques} (durées en millisecondes, sur les dernières requêtes).
+        """
+        with self.verrou:
+            resume = {}
+            for nom_hote, compteurs in self.compteurs.items():
+                durees = np.array(self.durees[nom_hote]) * 1000
+                resume[nom_hote] = {
+                    "requetes": compteurs["requetes"],
+                    "erreurs": compteurs["erreurs"],
+                    "reessais": compteurs["reessais"],
+                    "duree_moyenne_ms": round(compteurs["duree_totale"] * 1000 / compteurs["requetes"], 1),
+                    "duree_p50_ms": round(float(np.percentile(durees, 50)), 1),
+                    "duree_p95_ms": round(float(np.percentile(durees, 95)), 1),
+                    "duree_max_ms": round(float(durees.max()), 1),
+                }
+            return resume
+
+    def reinitialiser(self):
+        with self.verrou:
+            self.durees.clear()
+            self.compteurs.clear()
+
+
+# Métriques partagées par le client synchrone et les clients asynchrones
+METRIQUES = Metriques()
+
+
+def metriques():
+    """
+    Statistiques par hôte de toutes les requêtes faites par ce module.
+    """
+    return METRIQUES.resume()
+
+
+# --- Client synchrone ---
+
+class LimiteHote:
+    """
+    Sémaphore de concurrence et espacement minimal entre deux requêtes vers un hôte.
+    """
+
+    def __init__(self, concurrence, requetes_par_seconde):
+        self.semaphore = threading.BoundedSemaphore(concurrence)
+        self.intervalle = 1 / requetes_par_seconde
+        self.verrou = threading.Lock()
+        self.prochain = 0.0
+
+    def attendre_tour(self):
+        with self.verrou:
+            maintenant = time.monotonic()
+            depart = max(maintenant, self.prochain)
+            self.prochain = depart + self.intervalle
+        if depart > maintenant:
+            time.sleep(depart - maintenant)
+
+
+_session = None
+_limites_hotes = {}
+_verrou = threading.Lock()
+
+
+def session():
+    """
+    Session requests partagée du processus, avec un pool de connexions keep-alive.
+    """
+    global _session
+    if _session is None:
+        with _verrou:
+            if _session is None:
+                nouvelle = requests.Session()
+                adaptateur = HTTPAdapter(pool_connections=TAILLE_POOL, pool_maxsize=TAILLE_POOL, max_retries=0)
+                nouvelle.mount("http://", adaptateur)
+                nouvelle.mount("https://", adaptateur)
+                nouvelle.headers["User-Agent"] = USER_AGENT
+                _session = nouvelle
+    return _session
+
+
+def _limite(nom_hote):
+    with _verrou:
+        if nom_hote not in _limites_hotes:
+            _limites_hotes[nom_hote] = LimiteHote(**limites(nom_hote))
+        return _limites_hotes[nom_hote]
+
+
+def definir_limites(nom_hote, concurrence, requetes_par_seconde):
+    """
+    Remplace les limites d'un hôte pour la suite du processus (client synchrone).
+    """
+    with _verrou:
+        _limites_hotes[nom_hote.lower()] = LimiteHote(concurrence, requetes_par_seconde)
+
+
+def requete(methode, url, nb_essais=NB_ESSAIS, **kwargs):
+    """
+    Envoie une requête avec la session partagée, en respectant les limites de l'hôte
+    et en réessayant les erreurs réseau et les statuts 429/5xx.
+
+    Renvoie la dernière réponse obtenue ; lève l'exception requests si aucun essai
+    n'a abouti à une réponse.
+    """
+    kwargs.setdefault("timeout", TIMEOUT)
+    nom_hote = hote(url)
+    limite = _limite(nom_hote)
+    for essai in range(nb_essais):
+        dernier = essai == nb_essais - 1
+        with limite.semaphore:
+            limite.attendre_tour()
+            debut = time.perf_counter()
+            try:
+                reponse = session().request(methode, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                METRIQUES.enregistrer(nom_hote, time.perf_counter() - debut, erreur=True, reessai=not dernier)
+                if dernier:
+                    raise
+                reponse = None
+            else:
+                a_reessayer = reponse.status_code in STATUTS_A_REESSAYER and not dernier
+                METRIQUES.enregistrer(nom_hote, time.perf_counter() - debut,
+                                      erreur=reponse.status_code >= 400, reessai=a_reessayer)
+                if not a_reessayer:
+                    return reponse
+        time.sleep(delai_avant_essai(essai, reponse))
+
+
+def get(url, **kwargs):
+    """
+    Requête GET (cf. requete()).
+    """
+    return requete("GET", url, **kwargs)
+
+
+# --- Client asynchrone ---
+
+class LimiteHoteAsync:
+    """
+    Équivalent asynchrone de LimiteHote.
+    """
+
+    def __init__(self, concurrence, requetes_par_seconde):
+        self.semaphore = asyncio.Semaphore(concurrence)
+        self.intervalle = 1 / requetes_par_seconde
+        self.prochain = 0.0
+
+    async def attendre_tour(self):
+        maintenant = time.monotonic()
+        depart = max(maintenant, self.prochain)
+        self.prochain = depart + self.intervalle
+        if depart > maintenant:
+            await asyncio.sleep(depart - maintenant)
+
+
+class ClientAsync:
+    """
+    Client httpx asynchrone avec pool de connexions, limites par hôte, réessais
+    et métriques (partagées avec le client synchrone).
+
+    À utiliser dans un bloc async with, à l'intérieur d'une seule boucle asyncio.
+    """
+
+    def __init__(self, timeout=TIMEOUT, nb_essais=NB_ESSAIS, **kwargs_httpx):
+        import httpx  # Dépendance nécessaire seulement pour la variante asynchrone
+        self.httpx = httpx
+        self.nb_essais = nb_essais
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=TAILLE_POOL * 4, max_keepalive_connections=TAILLE_POOL),
+            follow_redirects=True,
+            **kwargs_httpx,
+        )
+        self.limites_hotes = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+
+    def _limite(self, nom_hote):
+        if nom_hote not in self.limites_hotes:
+            self.limites_hotes[nom_hote] = LimiteHoteAsync(**limites(nom_hote))
+        return self.limites_hotes[nom_hote]
+
+    async def requete(self, methode, url, **kwargs):
+        """
+        Équivalent asynchrone de client_http.requete().
+        """
+        nom_hote = hote(url)
+        limite = self._limite(nom_hote)
+        for essai in range(self.nb_essais):
+            dernier = essai == self.nb_essais - 1
+            async with limite.semaphore:
+                await limite.attendre_tour()
+                debut = time.perf_counter()
+                try:
+                    reponse = await self.client.request(methode, url, **kwargs)
+                except self.httpx.TransportError:
+                    METRIQUES.enregistrer(nom_hote, time.perf_counter() - debut, erreur=True, reessai=not dernier)
+                    if dernier:
+                        raise
+                    reponse = None
+                else:
+                    a_reessayer = reponse.status_code in STATUTS_A_REESSAYER and not dernier
+                    METRIQUES.enregistrer(nom_hote, time.perf_counter() - debut,
+                                          erreur=reponse.status_code >= 400, reessai=a_reessayer)
+                    if not a_reessayer:
+                        return reponse
+            await asyncio.sleep(delai_avant_essai(essai, reponse))
+
+    async def get(self, url, **kwargs):
+        return await self.requete("GET", url, **kwargs)
+
+    async def get_tous(self, urls, **kwargs):
+        """
+        Lance toutes les requêtes GET en parallèle (dans les limites de chaque hôte).
+
+        Renvoie les réponses dans l'ordre des URL ; une requête en échec donne son exception.
+        """
+        return await asyncio.gather(*(self.get(url, **kwargs) for url in urls), return_exceptions=True)
@@ -0,0 +1,197 @@
+"""
+Répertoire local des communes, construit à partir des coordonnées de la base
+nationale, pour géocoder les lieux des festivals sans appel réseau.
+
+La base nettoyée a des milliers de points ("Géocodage xy") avec leur commune et
+leur département. Pour chaque couple (commune, département), la position retenue
+est la médiane des latitudes et des longitudes de ses festivals, peu sensible à un
+festival mal placé. Les noms de communes sont comparés sans accents, sans casse
+ni ponctuation, avec « St »/« Ste » lus « Saint »/« Sainte » : « ST ETIENNE »,
+« Saint-Étienne » et « saint etienne » sont la même commune.
+
+La recherche se fait par dictionnaire sur le nom complet, puis, pour un lieu
+plus long (« Parc de Saint-Étienne », « Nîmes (Gard) »), par un arbre de préfixes
+sur les mots qui trouve le plus long nom de commune contenu dans le texte. Un nom
+d'un seul mot trouvé ainsi (« Mer », « Port » dans « Salle de la Mer ») n'est
+retenu que si le département le confirme, donné ou écrit dans le lieu ; sinon le
+lieu part au géocodeur réseau. Une commune présente dans plusieurs départements est
+départagée par le département s'il est donné, sinon par le nombre de festivals.
+
+Seuls les lieux absents du répertoire sont envoyés au géocodeur réseau (par défaut
+Nominatim via geocodage.py, avec son cache).
+
+Utilisation :
+    from communes import geocoder_lieux
+    coordonnees = geocoder_lieux(df["Lieu"])            # Latitude, Longitude, Source
+    coordonnees = geocoder_lieux(df["Lieu"], repli=None)  # sans réseau
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from base_festivals import DOSSIER_SNAPSHOT, construire_snapshot, lire_meta, snapshot_a_jour
+from index_noms import MOTS_VIDES, normaliser
+
+COMMUNE = "Commune principale de déroulement"
+DEPARTEMENT = "Département principal de déroulement"
+
+# Abréviations lues comme le mot complet
+ABREVIATIONS = {"st": "saint", "ste": "sainte", "sts": "saints", "stes": "saintes"}
+
+# Longueur minimale d'un nom de commune trouvé à l'intérieur d'un texte plus long
+LONGUEUR_MIN_SOUS_CHAINE = 3
+
+# Clé de fin de nom dans l'arbre de préfixes (aucun mot normalisé n'est vide)
+FIN = ""
+
+
+def cle_commune(texte):
+    """
+    Clé de comparaison d'un nom de commune ou de département.
+    """
+    return " ".join(ABREVIATIONS.get(mot, mot) for mot in normaliser(texte).split())
+
+
+class RepertoireCommunes:
+    """
+    Position médiane des festivals de chaque commune, par département.
+    """
+
+    def __init__(self, communes, departements, lat, lon):
+        points = pd.DataFrame({
+            "commune": [cle_commune(c) for c in communes],
+            "departement": [cle_commune(d) for d in departements],
+            "lat": np.asarray(lat, dtype=np.float64),
+            "lon": np.asarray(lon, dtype=np.float64),
+        })
+        points = points[(points["commune"] != "") & points["lat"].notna() & points["lon"].notna()]
+        positions = (points.groupby(["commune", "departement"], sort=False)
+                     .agg(lat=("lat", "median"), lon=("lon", "median"), nombre=("lat", "size"))
+                     .reset_index()
+                     .sort_values(["commune", "nombre"], ascending=[True, False], kind="stable"))
+
+        # commune -> [(département, lat, lon, nombre)], le département le plus fourni en premier
+        self.communes = {}
+        for commune, departement, lat, lon, nombre in positions.itertuples(index=False):
+            self.communes.setdefault(commune, []).append((departement, lat, lon, nombre))
+
+        # Arbre de préfixes sur les mots des noms de communes
+        self.arbre = {}
+        for commune in self.communes:
+            noeud = self.arbre
+            for mot in commune.split():
+                noeud = noeud.setdefault(mot, {})
+            noeud[FIN] = commune
+
+    def __len__(self):
+        return len(self.communes)
+
+    def commune_dans(self, cle):
+        """
+        Plus long nom de commune formé de mots consécutifs de cle (le premier en cas
+        d'égalité), ou None.
+        """
+        mots = cle.split()
+        meilleure = None
+        for debut in range(len(mots)):
+            noeud = self.arbre
+            for mot in mots[debut:]:
+                noeud = noeud.get(mot)
+                if noeud is None:
+                    break
+                commune = noeud.get(FIN)
+                if (commune and commune not in MOTS_VIDES and len(commune) >= LONGUEUR_MIN_SOUS_CHAINE
+                        and (meilleure is None or len(commune) > len(meilleure))):
+                    meilleure = commune
+        return meilleure
+
+    def localiser(self, lieu, departement=None):
+        """
+        (lat, lon) du lieu, ou None s'il n'est pas dans le répertoire (ou pas dans
+        le département donné, ou seulement par un nom d'un mot non confirmé par le
+        département).
+        """
+        cle = cle_commune(lieu) if isinstance(lieu, str) else ""
+        departement_donne = isinstance(departement, str) and departement.strip()
+        entrees = self.communes.get(cle)
+        if entrees is None:
+            commune = self.commune_dans(cle)
+            if commune is None:
+                return None
+            entrees = self.communes[commune]
+            # Un seul mot dans un texte plus long : seulement si le lieu nomme aussi le département
+            if " " not in commune and not departement_donne:
+                entrees = [entree for entree in entrees if f" {entree[0]} " in f" {cle} "]
+        if departement_donne:
+            cle_departement = cle_commune(departement)
+            entrees = [entree for entree in entrees if entree[0] == cle_departement]
+        if not entrees:
+            return None
+        return entrees[0][1], entrees[0][2]
+
+
+# Répertoire du snapshot courant, construit une fois par processus
+_repertoires = {}
+
+
+def charger_repertoire(dossier=DOSSIER_SNAPSHOT, verifier_source=None):
+    """
+    Renvoie le répertoire des communes du snapshot courant (reconstruit si besoin).
+    """
+    dossier = Path(dossier)
+    if not snapshot_a_jour(dossier, verifier_source=verifier_source):
+        construire_snapshot(dossier)
+    meta = lire_meta(dossier)
+    cle = (str(dossier), meta["cle"])
+    if cle not in _repertoires:
+        points = pd.read_parquet(dossier / meta["fichier"], columns=[COMMUNE, DEPARTEMENT, "Latitude", "Longitude"])
+        _repertoires.clear()
+        _repertoires[cle] = RepertoireCommunes(points[COMMUNE], points[DEPARTEMENT],
+                                               points["Latitude"], points["Longitude"])
+    return _repertoires[cle]
+
+
+def repli_nominatim(lieu):
+    """
+    Géocodage réseau d'un lieu absent du répertoire (Nominatim, avec cache).
+    """
+    from geocodage import geocoder_nominatim  # Seulement en cas d'absence dans le répertoire
+    coordonnees, _ = geocoder_nominatim(lieu)
+    return coordonnees
+
+
+def geocoder_lieux(lieux, departements=None, repertoire=None, repli=repli_nominatim):
+    """
+    Coordonnées de chaque lieu : depuis le répertoire des communes, sinon (une fois
+    par lieu distinct) depuis repli(lieu) -> (lat, lon) ou None ; repli=None pour
+    rester hors ligne.
+
+    Renvoie un DataFrame de même index que lieux (s'il en a un) avec les colonnes
+    Latitude, Longitude (NaN si introuvable) et Source ("répertoire", "réseau" ou None).
+    """
+    if repertoire is None:
+        repertoire = charger_repertoire()
+    index = lieux.index if isinstance(lieux, pd.Series) else None
+    lieux = list(lieux)
+    departements = [None] * len(lieux) if departements is None else list(departements)
+
+    # Un seul calcul par couple (lieu, département) distinct
+    trouves = {}
+    for cle in set(zip(lieux, departements)):
+        position = repertoire.localiser(*cle)
+        trouves[cle] = (position, "répertoire") if position else (None, None)
+    if repli is not None:
+        for cle, (position, _) in trouves.items():
+            if position is None and isinstance(cle[0], str) and cle[0].strip():
+                position = repli(cle[0])
+                if position:
+                    trouves[cle] = (tuple(position), "réseau")
+
+    resultats = [trouves[cle] for cle in zip(lieux, departements)]
+    return pd.DataFrame({
+        "Latitude": [position[0] if position else np.nan for position, _ in resultats],
+        "Longitude": [position[1] if position else np.nan for position, _ in resultats],
+        "Source": [source for _, source in resultats],
+    }, index=index)
@@ -0,0 +1,42 @@
+"""
+Vérification des dépendances au démarrage de app.py et questions.py.
+
+Les deux applications installaient leurs modules avec pip à chaque exécution du
+script, c'est-à-dire à chaque interaction sous Streamlit. Elles vérifient
+maintenant seulement que les modules sont présents (sans les importer), et
+s'arrêtent avec un message qui donne la commande d'installation sinon.
+"""
+
+import importlib.util
+import sys
+
+# Nom du module à importer -> nom du paquet à installer avec pip
+PAQUETS = {
+    "streamlit": "streamlit",
+    "folium": "folium",
+    "streamlit_folium": "streamlit-folium",
+    "pandas": "pandas",
+    "numpy": "numpy",
+    "requests": "requests",
+    "pyarrow": "pyarrow",
+}
+
+
+def modules_manquants(modules):
+    """
+    Renvoie la liste des modules introuvables dans l'environnement courant.
+    """
+    return [module for module in modules if importlib.util.find_spec(module) is None]
+
+
+def verifier_dependances(modules):
+    """
+    Arrête le programme avec un message clair si un des modules est absent.
+    """
+    manquants = modules_manquants(modules)
+    if manquants:
+        paquets = " ".join(PAQUETS.get(module, module) for module in manquants)
+        sys.exit(
+            f"Modules manquants : {', '.join(manquants)}.\n"
+            f"Installez-les une fois pour toutes avec : {sys.executable} -m pip install {paquets}"
+        )
@@ -0,0 +1,274 @@
+"""
+Géocodage d'adresses avec l'API Adresse (api-adresse.data.gouv.fr), avec cache.
+
+Streamlit relance tout le script de questions.py à chaque modification d'un
+widget : sans cache, la même adresse est redemandée à l'API à chaque fois. Les
+réponses sont gardées à deux niveaux :
+- un cache LRU en mémoire, propre au processus ;
+- une base SQLite sur disque (cache_festivals/geocodage.sqlite), partagée entre
+  les sessions et les redémarrages.
+La clé est la requête normalisée (casse et espaces). Chaque entrée a une durée de
+vie (TTL), les deux niveaux sont bornés en taille (les entrées les moins récemment
+utilisées sont supprimées), et des compteurs de hits/misses sont tenus à jour.
+
+L'URL de l'API peut être remplacée par la variable d'environnement API_ADRESSE_URL
+(par exemple un serveur local de test). Les lieux des gros festivals, hors du champ
+de l'API Adresse, sont géocodés avec Nominatim (NOMINATIM_URL) par le même cache.
+Les requêtes passent par le client HTTP commun (client_http.py).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+import requests
+
+import client_http
+
+API_ADRESSE_URL = os.environ.get("API_ADRESSE_URL", "https://api-adresse.data.gouv.fr").rstrip("/")
+NOMINATIM_URL = os.environ.get("NOMINATIM_URL", "https://nominatim.openstreetmap.org").rstrip("/")
+
+FICHIER_CACHE = Path(os.environ.get(
+    "GEOCODAGE_CACHE", Path(__file__).resolve().parent / "cache_festivals" / "geocodage.sqlite"
+))
+
+# Durée de vie des réponses (s) : les adresses bougent peu, les échecs peuvent être corrigés
+TTL_TROUVE = 30 * 24 * 3600
+TTL_INTROUVABLE = 24 * 3600
+
+# Tailles maximales (nombre d'entrées) des deux niveaux de cache
+TAILLE_MEMOIRE = 1024
+TAILLE_DISQUE = 100_000
+
+# Nombre d'écritures entre deux vérifications de la taille du cache disque (au plus) :
+# la table peut dépasser taille_disque d'autant avant d'être réduite
+ECRITURES_ENTRE_EVICTIONS = 1000
+
+# Valeur renvoyée par CacheGeocodage.lire() quand la requête n'est pas en cache
+ABSENT = object()
+
+
+def normaliser_requete(requete):
+    """
+    Clé de cache d'une requête : Unicode normalisé, minuscules, espaces réduits.
+    """
+    requete = unicodedata.normalize("NFKC", requete)
+    return " ".join(requete.lower().split())
+
+
+class CacheGeocodage:
+    """
+    Cache à deux niveaux (LRU en mémoire + SQLite) pour les réponses de géocodage.
+
+    Utilisable depuis plusieurs threads (sessions Streamlit).
+    """
+
+    def __init__(self, chemin=FICHIER_CACHE, taille_memoire=TAILLE_MEMOIRE, taille_disque=TAILLE_DISQUE):
+        self.taille_memoire = taille_memoire
+        self.taille_disque = taille_disque
+        self.memoire = OrderedDict()  # clé -> (valeur, expiration)
+        self.verrou = threading.Lock()
+        self.compteurs = {"hits_memoire": 0, "hits_disque": 0, "misses": 0, "expirations": 0, "evictions": 0}
+        self.intervalle_eviction = max(1, min(ECRITURES_ENTRE_EVICTIONS, taille_disque // 10))
+        self.ecritures = 0
+
+        self.connexion = None
+        if chemin is not None:
+            Path(chemin).parent.mkdir(parents=True, exist_ok=True)
+            self.connexion = sqlite3.connect(str(chemin), check_same_thread=False)
+            self.connexion.execute(
+                "CREATE TABLE IF NOT EXISTS geocodage ("
+                " cle TEXT PRIMARY KEY, valeur TEXT, expiration REAL, dernier_acces REAL)"
+            )
+            self.connexion.execute("CREATE INDEX IF NOT EXISTS acces_idx ON geocodage(dernier_acces)")
+            self.connexion.commit()
+
+    def lire(self, cle):
+        """
+        Renvoie la valeur en cache pour cle, ou ABSENT (absente ou expirée).
+        """
+        maintenant = time.time()
+        expiree = False
+        with self.verrou:
+            if cle in self.memoire:
+                valeur, expiration = self.memoire[cle]
+                if expiration > maintenant:
+                    self.memoire.move_to_end(cle)
+                    self.compteurs["hits_memoire"] += 1
+                    return valeur
+                del self.memoire[cle]
+                expiree = True
+
+            if self.connexion is not None:
+                ligne = self.connexion.execute(
+                    "SELECT valeur, expiration FROM geocodage WHERE cle = ?", (cle,)
+                ).fetchone()
+                if ligne is not None:
+                    if ligne[1] > maintenant:
+                        self.connexion.execute(
+                            "UPDATE geocodage SET dernier_acces = ? WHERE cle = ?", (maintenant, cle)
+                        )
+                        self.connexion.commit()
+                        valeur = json.loads(ligne[0])
+                        self._memoriser(cle, valeur, ligne[1])
+                        self.compteurs["hits_disque"] += 1
+                        return valeur
+                    self.connexion.execute("DELETE FROM geocodage WHERE cle = ?", (cle,))
+                    self.connexion.commit()
+                    expiree = True
+
+            # Une entrée expirée en mémoire et sur disque ne compte qu'une fois
+            self.compteurs["expirations"] += expiree
+            self.compteurs["misses"] += 1
+            return ABSENT
+
+    def ecrire(self, cle, valeur, ttl):
+        """
+        Met valeur (sérialisable en JSON) en cache pour ttl secondes.
+        """
+        maintenant = time.time()
+        expiration = maintenant + ttl
+        with self.verrou:
+            self._memoriser(cle, valeur, expiration)
+            if self.connexion is not None:
+                self.connexion.execute(
+                    "INSERT OR REPLACE INTO geocodage VALUES (?, ?, ?, ?)",
+                    (cle, json.dumps(valeur, ensure_ascii=False), expiration, maintenant),
+                )
+                self.ecritures += 1
+                if self.ecritures % self.intervalle_eviction == 0:
+                    self._evincer_disque()
+                self.connexion.commit()
+
+    def _memoriser(self, cle, valeur, expiration):
+        self.memoire[cle] = (valeur, expiration)
+        self.memoire.move_to_end(cle)
+        while len(self.memoire) > self.taille_memoire:
+            self.memoire.popitem(last=False)
+            self.compteurs["evictions"] += 1
+
+    def _evincer_disque(self):
+        """
+        Supprime les entrées expirées puis, au-delà de taille_disque, les moins
+        récemment utilisées (par paquets de 10 %). Appelée toutes les
+        intervalle_eviction écritures seulement : COUNT(*) parcourt toute la table.
+        """
+        nb = self.connexion.execute("SELECT COUNT(*) FROM geocodage").fetchone()[0]
+        if nb <= self.taille_disque:
+            return
+        self.connexion.execute("DELETE FROM geocodage WHERE expiration <= ?", (time.time(),))
+        nb = self.connexion.execute("SELECT COUNT(*) FROM geocodage").fetchone()[0]
+        surplus = nb - int(self.taille_disque * 0.9)
+        if surplus > 0:
+            self.connexion.execute(
+                "DELETE FROM geocodage WHERE cle IN"
+                " (SELECT cle FROM geocodage ORDER BY dernier_acces LIMIT ?)", (surplus,)
+            )
+            self.compteurs["evictions"] += surplus
+
+    def statistiques(self):
+        """
+        Compteurs de hits/misses, taux de hit et taille des deux niveaux.
+        """
+        with self.verrou:
+            stats = dict(self.compteurs)
+            stats["taille_memoire"] = len(self.memoire)
+            if self.connexion is not None:
+                stats["taille_disque"] = self.connexion.execute("SELECT COUNT(*) FROM geocodage").fetchone()[0]
+        hits = stats["hits_memoire"] + stats["hits_disque"]
+        stats["taux_hit"] = hits / (hits + stats["misses"]) if hits + stats["misses"] else 0.0
+        return stats
+
+    def vider(self):
+        """
+        Supprime toutes les entrées des deux niveaux.
+        """
+        with self.verrou:
+            self.memoire.clear()
+            if self.connexion is not None:
+                self.connexion.execute("DELETE FROM geocodage")
+                self.connexion.commit()
+
+
+# Cache partagé par geocoder(), ouvert au premier appel
+_cache = None
+_verrou_cache = threading.Lock()
+
+
+def cache_par_defaut():
+    """
+    Renvoie le cache partagé du processus.
+    """
+    global _cache
+    if _cache is None:
+        with _verrou_cache:
+            if _cache is None:
+                _cache = CacheGeocodage()
+    return _cache
+
+
+def interroger_api(requete, limite=1, timeout=10):
+    """
+    Interroge l'API Adresse ; renvoie ((lat, lon), libellé) du premier résultat,
+    ou (None, None) si l'adresse est introuvable.
+
+    Les erreurs réseau ou HTTP lèvent une exception (requests.RequestException).
+    """
+    reponse = client_http.get(f"{API_ADRESSE_URL}/search/", params={"q": requete, "limit": limite}, timeout=timeout)
+    reponse.raise_for_status()
+    features = reponse.json().get("features", [])
+    if not features:
+        return None, None
+    coords = features[0]["geometry"]["coordinates"]
+    return (float(coords[1]), float(coords[0])), features[0]["properties"]["label"]
+
+
+def interroger_nominatim(lieu, timeout=10):
+    """
+    Interroge Nominatim (OpenStreetMap) ; renvoie ((lat, lon), nom affiché) du premier
+    résultat, ou (None, None) si le lieu est introuvable.
+    """
+    reponse = client_http.get(f"{NOMINATIM_URL}/search", params={"q": lieu, "format": "json", "limit": 1},
+                              timeout=timeout)
+    reponse.raise_for_status()
+    resultats = reponse.json()
+    if not resultats:
+        return None, None
+    return (float(resultats[0]["lat"]), float(resultats[0]["lon"])), resultats[0].get("display_name")
+
+
+def geocoder(requete, cache=None, service=interroger_api, prefixe=""):
+    """
+    Géocode une adresse : ((lat, lon), libellé), ou (None, None) si introuvable ou
+    si l'API ne répond pas. Seules les réponses de l'API sont mises en cache.
+    """
+    cache = cache or cache_par_defaut()
+    cle = normaliser_requete(requete)
+    if not cle:
+        return None, None
+    cle = prefixe + cle
+
+    valeur = cache.lire(cle)
+    if valeur is ABSENT:
+        try:
+            coordonnees, libelle = service(requete)
+        except (requests.RequestException, ValueError, KeyError):
+            return None, None  # Pas de mise en cache : on réessaiera au prochain appel
+        valeur = {"coordonnees": coordonnees, "libelle": libelle}
+        cache.ecrire(cle, valeur, TTL_TROUVE if coordonnees else TTL_INTROUVABLE)
+
+    if valeur["coordonnees"] is None:
+        return None, None
+    return tuple(valeur["coordonnees"]), valeur["libelle"]
+
+
+def geocoder_nominatim(lieu, cache=None):
+    """
+    Géocode un lieu avec Nominatim, avec le même cache que geocoder().
+    """
+    return geocoder(lieu, cache=cache, service=interroger_nominatim, prefixe="nominatim:")
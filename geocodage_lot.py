@@ -0,0 +1,196 @@
+"""
+Géocodage par lots des festivals sans coordonnées, avec le point d'accès CSV de
+l'API Adresse (POST /search/csv/).
+
+Les festivals dont "Géocodage xy" est absent ou mal formaté étaient écartés sans
+bruit par le filtre de distance et par Stats_impact_gros_fest.ipynb. Ils sont
+maintenant rassemblés, et leur commune (avec le département) est envoyée à l'API
+par lots de TAILLE_LOT lignes dans un fichier CSV, au lieu d'une requête par
+festival. La recherche est restreinte aux communes (filtre type=municipality) : le
+texte libre « commune département » ne peut pas tomber sur une rue ou un lieu-dit
+d'une autre ville. Les coordonnées trouvées sont rattachées aux festivals par leur
+Identifiant, et gardées dans le cache de geocodage.py (mémoire + SQLite) : une
+commune déjà géocodée n'est plus renvoyée à l'API.
+
+L'URL de l'API est celle de geocodage.py (variable d'environnement API_ADRESSE_URL,
+par exemple un serveur local de test).
+
+Utilisation :
+    from geocodage_lot import completer_coordonnees
+    df, rapport = completer_coordonnees(df)
+
+ou, pour voir ce qui serait géocodé dans la base :
+    python geocodage_lot.py [--dossier cache_festivals] [--taille-lot 1000]
+"""
+
+import argparse
+import io
+import time
+
+import numpy as np
+import pandas as pd
+import requests
+
+import client_http
+import geocodage
+from geocodage import ABSENT, TTL_INTROUVABLE, TTL_TROUVE, cache_par_defaut, normaliser_requete
+from geodistance import parser_geocodage
+
+# Nombre de lignes par fichier envoyé (l'API accepte des fichiers de quelques Mo)
+TAILLE_LOT = 1000
+# Score minimal (0 à 1) d'un résultat de l'API pour être retenu
+SCORE_MIN = 0.5
+# Type de résultat cherché (filtre "type" de l'API, passé par une colonne du fichier)
+TYPE_RESULTAT = "municipality"
+
+COMMUNE = "Commune principale de déroulement"
+DEPARTEMENT = "Département principal de déroulement"
+# Les réponses d'avant le filtre sur le type (préfixe "csv:") ne sont plus lues
+PREFIXE_CACHE = "csv-commune:"
+
+
+def lignes_sans_coordonnees(df, colonne="Géocodage xy"):
+    """
+    Masque des festivals dont les coordonnées sont absentes ou mal formatées.
+    """
+    if "Latitude" in df and "Longitude" in df:
+        lat, lon = df["Latitude"].to_numpy(dtype=np.float64), df["Longitude"].to_numpy(dtype=np.float64)
+    else:
+        lat, lon = parser_geocodage(df[colonne])
+    return np.isnan(lat) | np.isnan(lon)
+
+
+def requete_lieu(commune, departement):
+    """
+    Texte envoyé à l'API pour un festival : commune et département.
+    """
+    return " ".join(str(x) for x in (commune, departement) if isinstance(x, str) and x.strip())
+
+
+def envoyer_lot(requetes, url=None, timeout=60):
+    """
+    Géocode une liste de requêtes en un seul appel à /search/csv/, parmi les communes.
+
+    Renvoie une liste de {"coordonnees", "libelle", "score"} dans l'ordre des requêtes
+    (coordonnees None si rien n'est trouvé avec un score suffisant, ou si le résultat
+    n'est pas une commune). Les erreurs réseau ou HTTP lèvent une exception requests.
+    """
+    url = url or f"{geocodage.API_ADRESSE_URL}/search/csv/"
+    fichier = pd.DataFrame({"q": requetes, "type": TYPE_RESULTAT}).to_csv(index=False).encode("utf-8")
+    reponse = client_http.requete("POST", url, files={"data": ("lot.csv", fichier, "text/csv")},
+                                  data={"columns": "q", "type": "type"}, timeout=timeout)
+    reponse.raise_for_status()
+    resultats = pd.read_csv(io.StringIO(reponse.content.decode("utf-8-sig")), dtype={"q": str})
+    if len(resultats) != len(requetes):
+        raise ValueError(f"{len(resultats)} lignes renvoyées pour {len(requetes)} envoyées")
+
+    lat = pd.to_numeric(resultats.get("latitude"), errors="coerce")
+    lon = pd.to_numeric(resultats.get("longitude"), errors="coerce")
+    score = pd.to_numeric(resultats.get("result_score"), errors="coerce")
+    libelles = resultats.get("result_label", pd.Series([None] * len(resultats)))
+    types = resultats.get("result_type", pd.Series([TYPE_RESULTAT] * len(resultats)))
+    sortie = []
+    for la, lo, sc, libelle, type_resultat in zip(lat, lon, score, libelles, types):
+        trouve = not (np.isnan(la) or np.isnan(lo)) and sc >= SCORE_MIN and type_resultat == TYPE_RESULTAT
+        sortie.append({
+            "coordonnees": [float(la), float(lo)] if trouve else None,
+            "libelle": libelle if trouve and isinstance(libelle, str) else None,
+            "score": None if np.isnan(sc) else float(sc),
+        })
+    return sortie
+
+
+def geocoder_lot(requetes, taille_lot=TAILLE_LOT, cache=None):
+    """
+    Géocode des requêtes (communes) : celles en cache sont lues, les autres (chacune
+    une seule fois) envoyées à l'API par lots de taille_lot.
+
+    Renvoie ({requête: valeur comme envoyer_lot()}, rapport) ; le rapport donne pour
+    chaque lot le nombre de lignes, la durée et le débit. Un lot en erreur est noté
+    dans le rapport et ses requêtes restent sans coordonnées (non mises en cache).
+    """
+    cache = cache or cache_par_defaut()
+    valeurs, a_envoyer = {}, []
+    for requete in dict.fromkeys(requetes):
+        cle = normaliser_requete(requete)
+        if not cle:
+            continue
+        valeur = cache.lire(PREFIXE_CACHE + cle)
+        if valeur is ABSENT:
+            a_envoyer.append(requete)
+        else:
+            valeurs[requete] = valeur
+
+    rapport = {"requetes": len(valeurs) + len(a_envoyer), "en_cache": len(valeurs), "lots": []}
+    for debut in range(0, len(a_envoyer), taille_lot):
+        lot = a_envoyer[debut:debut + taille_lot]
+        chrono = time.perf_counter()
+        try:
+            reponses = envoyer_lot(lot)
+        except (requests.RequestException, ValueError) as erreur:
+            rapport["lots"].append({"lignes": len(lot), "erreur": str(erreur)})
+            continue
+        duree = time.perf_counter() - chrono
+        for requete, valeur in zip(lot, reponses):
+            valeurs[requete] = valeur
+            cache.ecrire(PREFIXE_CACHE + normaliser_requete(requete), valeur,
+                         TTL_TROUVE if valeur["coordonnees"] else TTL_INTROUVABLE)
+        rapport["lots"].append({
+            "lignes": len(lot),
+            "trouvees": sum(valeur["coordonnees"] is not None for valeur in reponses),
+            "duree_s": round(duree, 3),
+            "lignes_par_s": round(len(lot) / duree, 1) if duree > 0 else None,
+        })
+    return valeurs, rapport
+
+
+def completer_coordonnees(df, taille_lot=TAILLE_LOT, cache=None):
+    """
+    Géocode les festivals de df sans coordonnées valides et complète "Latitude",
+    "Longitude" et "Géocodage xy" (au format "lat, lon"), par Identifiant.
+
+    Renvoie (copie de df complétée, rapport de geocoder_lot() avec le nombre de
+    festivals sans coordonnées et de festivals complétés).
+    """
+    manquants = lignes_sans_coordonnees(df)
+    lignes = df.loc[manquants, ["Identifiant", COMMUNE, DEPARTEMENT]]
+    requetes = [requete_lieu(commune, departement)
+                for commune, departement in zip(lignes[COMMUNE], lignes[DEPARTEMENT])]
+    valeurs, rapport = geocoder_lot([r for r in requetes if r], taille_lot=taille_lot, cache=cache)
+
+    # Coordonnées trouvées, rattachées par Identifiant
+    trouvees = pd.DataFrame(
+        [(identifiant, *valeurs[requete]["coordonnees"])
+         for identifiant, requete in zip(lignes["Identifiant"], requetes)
+         if requete in valeurs and valeurs[requete]["coordonnees"]],
+        columns=["Identifiant", "Latitude", "Longitude"],
+    ).drop_duplicates("Identifiant").set_index("Identifiant")
+
+    df = df.copy()
+    if "Latitude" not in df or "Longitude" not in df:
+        df["Latitude"], df["Longitude"] = parser_geocodage(df["Géocodage xy"])
+    a_completer = manquants & df["Identifiant"].isin(trouvees.index).to_numpy()
+    identifiants = df.loc[a_completer, "Identifiant"]
+    lat = trouvees["Latitude"].reindex(identifiants).to_numpy(dtype=np.float64)
+    lon = trouvees["Longitude"].reindex(identifiants).to_numpy(dtype=np.float64)
+    df.loc[a_completer, "Latitude"] = lat
+    df.loc[a_completer, "Longitude"] = lon
+    df.loc[a_completer, "Géocodage xy"] = [f"{la}, {lo}" for la, lo in zip(lat, lon)]
+
+    rapport["festivals_sans_coordonnees"] = int(manquants.sum())
+    rapport["festivals_completes"] = int(a_completer.sum())
+    return df, rapport
+
+
+if __name__ == "__main__":
+    from base_festivals import DOSSIER_SNAPSHOT, charger_festivals
+
+    parser = argparse.ArgumentParser(description="Géocode par lots les festivals sans coordonnées.")
+    parser.add_argument("--dossier", default=str(DOSSIER_SNAPSHOT), help="Dossier du snapshot")
+    parser.add_argument("--taille-lot", type=int, default=TAILLE_LOT, help="Lignes par lot envoyé à l'API")
+    args = parser.parse_args()
+
+    _, rapport = completer_coordonnees(charger_festivals(args.dossier), taille_lot=args.taille_lot)
+    for numero, lot in enumerate(rapport.pop("lots"), 1):
+        print(f"Lot {numero} : {lot}")
+    print(rapport)
@@ -0,0 +1,197 @@
+"""
+Calcul vectorisé des distances entre festivals.
+
+Remplace les appels à geopy.distance.geodesic faits un par un dans des boucles
+iterrows : la colonne "Géocodage xy" est convertie une seule fois en tableaux
+float64 de latitudes/longitudes, puis les distances d'un point (ou d'un lot de
+points) à tous les festivals sont calculées d'un coup avec NumPy (formule de
+haversine). La distance sur l'ellipsoïde WGS84 (équivalente à geodesic à quelques
+mètres près) est recalculée uniquement pour les festivals proches du rayon demandé,
+là où l'écart entre les deux formules (au plus ~0,5 %) peut changer le résultat.
+
+Pour un lot de points (les gros festivals de Stats_impact_gros_fest.ipynb), les
+couples proches sont tirés de la matrice des distances, puis comptés par code et
+par rayon en un seul bincount (compter_paires).
+"""
+
+import numpy as np
+import pandas as pd
+
+# Rayon moyen de la Terre (km)
+RAYON_TERRE_KM = 6371.0088
+
+# Ellipsoïde WGS84
+DEMI_GRAND_AXE_WGS84_KM = 6378.137
+APLATISSEMENT_WGS84 = 1 / 298.257223563
+
+# Écart relatif maximal entre haversine et distance géodésique WGS84
+TOLERANCE_HAVERSINE = 0.005
+
+# Nombre de points par lot de la matrice des distances (lot x festivals en float64)
+TAILLE_LOT_POINTS = 64
+
+
+def parser_geocodage(valeurs):
+    """
+    Convertit des chaînes "lat, lon" (colonne "Géocodage xy") en deux tableaux float64.
+
+    Les valeurs manquantes ou mal formatées donnent NaN.
+    """
+    textes = pd.Series(valeurs, dtype=object)
+    morceaux = textes.str.split(",", expand=True)  # Valeurs non textuelles : NaN
+    if morceaux.shape[1] < 2:
+        vide = np.full(len(textes), np.nan)
+        return vide, vide.copy()
+    lat = pd.to_numeric(morceaux[0], errors="coerce").to_numpy(dtype=np.float64)
+    lon = pd.to_numeric(morceaux[1], errors="coerce").to_numpy(dtype=np.float64)
+    if morceaux.shape[1] > 2:
+        # "lat, lon, autre" : mal formaté, comme dans l'ancien map(float, split(','))
+        invalides = morceaux.iloc[:, 2:].notna().any(axis=1).to_numpy()
+        lat[invalides] = np.nan
+        lon[invalides] = np.nan
+    return lat, lon
+
+
+def ajouter_coordonnees(df, colonne="Géocodage xy"):
+    """
+    Ajoute à df les colonnes float64 "Latitude" et "Longitude" tirées de "Géocodage xy".
+    """
+    lat, lon = parser_geocodage(df[colonne])
+    df = df.copy()
+    df["Latitude"] = lat
+    df["Longitude"] = lon
+    return df
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Distance de haversine (km) entre des points ; les arguments sont diffusés (broadcast).
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RAYON_TERRE_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distances_km(point, lat, lon):
+    """
+    Distances (km) d'un point (lat, lon) à tous les festivals ; NaN si coordonnées absentes.
+    """
+    return haversine_km(point[0], point[1], lat, lon)
+
+
+def matrice_distances_km(points, lat, lon):
+    """
+    Matrice des distances (km) entre un lot de points (n, 2) et tous les festivals (m,).
+
+    Renvoie un tableau (n, m).
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return haversine_km(points[:, :1], points[:, 1:], np.asarray(lat)[None, :], np.asarray(lon)[None, :])
+
+
+def distance_ellipsoide_km(lat1, lon1, lat2, lon2):
+    """
+    Distance (km) sur l'ellipsoïde WGS84 par la formule de Lambert, vectorisée.
+
+    Précision de l'ordre de la dizaine de mètres, comparable à geopy.distance.geodesic
+    pour les distances qui nous intéressent (quelques centaines de km au plus).
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
+    # Latitudes réduites
+    beta1 = np.arctan((1 - APLATISSEMENT_WGS84) * np.tan(lat1))
+    beta2 = np.arctan((1 - APLATISSEMENT_WGS84) * np.tan(lat2))
+    a = np.sin((beta2 - beta1) / 2) ** 2 + np.cos(beta1) * np.cos(beta2) * np.sin((lon2 - lon1) / 2) ** 2
+    sigma = 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    p = (beta1 + beta2) / 2
+    q = (beta2 - beta1) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = (sigma - np.sin(sigma)) * np.sin(p) ** 2 * np.cos(q) ** 2 / np.cos(sigma / 2) ** 2
+        y = (sigma + np.sin(sigma)) * np.cos(p) ** 2 * np.sin(q) ** 2 / np.sin(sigma / 2) ** 2
+        distance = DEMI_GRAND_AXE_WGS84_KM * (sigma - APLATISSEMENT_WGS84 / 2 * (x + y))
+    return np.where(sigma == 0, 0.0, distance)
+
+
+def dans_rayon(point, lat, lon, rayon_km, affiner=True, distances=None):
+    """
+    Masque booléen des festivals situés à moins de rayon_km du point.
+
+    Avec affiner=True, seuls les festivals dont la distance de haversine est à
+    moins de TOLERANCE_HAVERSINE du rayon sont recalculés sur l'ellipsoïde.
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    if distances is None:
+        distances = distances_km(point, lat, lon)
+    if affiner:
+        marge = rayon_km * TOLERANCE_HAVERSINE
+        douteux = np.flatnonzero(np.abs(distances - rayon_km) <= marge)
+        if len(douteux):
+            distances = np.array(distances, dtype=np.float64)
+            distances[douteux] = distance_ellipsoide_km(point[0], point[1], lat[douteux], lon[douteux])
+    return distances <= rayon_km  # NaN (coordonnées absentes) : False
+
+
+def paires_dans_rayon(points, lat, lon, rayon_km, taille_lot=TAILLE_LOT_POINTS, seuils=None):
+    """
+    Couples (point, festival) à moins de rayon_km, à partir de la matrice des
+    distances de haversine calculée par lots de taille_lot points.
+
+    Les distances de haversine à moins de TOLERANCE_HAVERSINE d'un des seuils
+    (par défaut : de toute distance jusqu'à rayon_km) sont recalculées sur
+    l'ellipsoïde : la position de chaque couple par rapport aux seuils est celle
+    que donnerait la distance géodésique. Les festivals sans coordonnées sont
+    ignorés. Renvoie (lignes des points, positions des festivals, distances en km),
+    triés par point puis par position.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    valides = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+    lat_valides, lon_valides = lat[valides], lon[valides]
+    if seuils is not None:
+        seuils = np.unique(np.append(np.asarray(seuils, dtype=np.float64), rayon_km))
+
+    lignes, positions, distances = [], [], []
+    for debut in range(0, len(points), taille_lot):
+        lot = points[debut:debut + taille_lot]
+        approx = matrice_distances_km(lot, lat_valides, lon_valides)
+        ligne, colonne = np.nonzero(approx <= rayon_km * (1 + TOLERANCE_HAVERSINE))
+        distance = approx[ligne, colonne]
+        if seuils is None:
+            douteux = np.arange(len(distance))
+        else:
+            # Seuil le plus proche de chaque distance (un au-dessus, un au-dessous)
+            rang = np.searchsorted(seuils, distance)
+            au_dessus = seuils[np.minimum(rang, len(seuils) - 1)]
+            au_dessous = seuils[np.maximum(rang - 1, 0)]
+            douteux = np.flatnonzero((np.abs(au_dessus - distance) <= au_dessus * TOLERANCE_HAVERSINE)
+                                     | (np.abs(distance - au_dessous) <= au_dessous * TOLERANCE_HAVERSINE))
+        distance[douteux] = distance_ellipsoide_km(lot[ligne[douteux], 0], lot[ligne[douteux], 1],
+                                                   lat_valides[colonne[douteux]], lon_valides[colonne[douteux]])
+        garder = distance <= rayon_km
+        lignes.append(ligne[garder] + debut)
+        positions.append(valides[colonne[garder]])
+        distances.append(distance[garder])
+    if not lignes:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    return np.concatenate(lignes), np.concatenate(positions), np.concatenate(distances)
+
+
+def compter_paires(lignes, codes, distances, nb_points, nb_codes, rayons):
+    """
+    Comptes cumulés par rayon à partir de couples (point, festival) : pour chaque
+    point, chaque code (0 à nb_codes - 1) et chaque rayon de rayons (croissants),
+    le nombre de couples du point de ce code à moins de ce rayon.
+
+    Les couples de code négatif ne sont pas comptés.
+    Renvoie un tableau int64 (nb_points, nb_codes, len(rayons)).
+    """
+    rayons = np.asarray(rayons, dtype=np.float64)
+    codes = np.asarray(codes)
+    garder = codes >= 0
+    # Premier rayon qui contient le couple (len(rayons) s'il est au-delà du dernier)
+    paliers = np.searchsorted(rayons, distances[garder], side="left")
+    cles = (np.asarray(lignes)[garder] * nb_codes + codes[garder]) * (len(rayons) + 1) + paliers
+    comptes = np.bincount(cles, minlength=nb_points * nb_codes * (len(rayons) + 1))
+    comptes = comptes.reshape(nb_points, nb_codes, len(rayons) + 1)[:, :, :len(rayons)]
+    return np.cumsum(comptes, axis=2)
@@ -0,0 +1,126 @@
+"""
+Statistiques de voisinage autour de festivals « ancres » (les gros festivals de
+festivals_fusionnes_complets.csv) pour Stats_impact_gros_fest.ipynb.
+
+Le notebook parcourait toute la base pour chaque gros festival (iterrows imbriqués),
+recalculait geodesic couple par couple en relisant "Géocodage xy", et le faisait
+deux fois (disque de 50 km par saison, puis anneau 50-100 km). Ici, les couples
+(ancre, festival) à moins du plus grand rayon sont obtenus d'un coup à partir de la
+matrice des distances (geodistance.paires_dans_rayon), puis un seul bincount donne,
+pour chaque ancre, chaque période, chaque discipline et chaque rayon, le nombre de
+festivals à moins de ce rayon. Les anneaux sont les différences entre deux rayons
+consécutifs ; avec une grille fine de rayons, on obtient les courbes complètes du
+nombre de festivals en fonction du rayon.
+
+Utilisation :
+    from impact import statistiques_anneaux
+    stats = statistiques_anneaux(points, df, rayons=[50, 100])
+    courbes = statistiques_anneaux(points, df, rayons=np.arange(1, 201))
+
+où points est un tableau (n, 2) de (latitude, longitude) et df la base de
+charger_festivals().
+"""
+
+import numpy as np
+import pandas as pd
+
+from geodistance import TAILLE_LOT_POINTS, compter_paires, paires_dans_rayon
+from masques import BITS_DISCIPLINES, masques_festivals
+from saisons import COLONNE_PERIODE, SAISONS, codes_periodes
+
+# Valeur des colonnes "Période" et "Discipline" pour l'ensemble des festivals
+TOUTES = "Toutes"
+
+PERIODES = [TOUTES, *SAISONS]
+DISCIPLINES = [TOUTES, *BITS_DISCIPLINES]
+
+
+def surfaces_km2(rayons):
+    """
+    Surface (km², plane) du disque de chaque rayon et de l'anneau qui le sépare du
+    rayon précédent (disque pour le premier).
+    """
+    disques = np.pi * np.asarray(rayons, dtype=np.float64) ** 2
+    return disques, np.diff(disques, prepend=0.0)
+
+
+def positions_exclues(noms_ancres, noms_festivals):
+    """
+    Pour chaque ancre, positions des festivals de même nom (à exclure des comptes,
+    comme le gros festival lui-même dans le notebook).
+    """
+    noms_ancres = list(noms_ancres)
+    noms = pd.Series(np.asarray(noms_festivals, dtype=object))
+    noms = noms[noms.isin(noms_ancres)]
+    positions = pd.Series(noms.index).groupby(noms.to_numpy()).agg(list)
+    return [positions.get(nom, []) for nom in noms_ancres]
+
+
+def statistiques_anneaux(points, festivals, rayons, exclure=None, taille_lot=TAILLE_LOT_POINTS):
+    """
+    Nombre et densité de festivals autour de chaque point de points (n, 2), par
+    période, par discipline et par rayon.
+
+    festivals : DataFrame de charger_festivals() (colonnes "Latitude", "Longitude",
+    "Code période" et "Masque disciplines", recalculées si absentes). rayons : en km,
+    triés et dédoublonnés. exclure : None, ou pour chaque point une liste de
+    positions de festivals à ne pas compter (cf. positions_exclues()).
+
+    Un festival de plusieurs disciplines est compté dans chacune ; les lignes
+    Période/Discipline "Toutes" comptent tous les festivals, y compris ceux de
+    période inconnue. Renvoie un DataFrame d'une ligne par (Ancre, Période,
+    Discipline, Rayon (km)) avec les colonnes Nombre, Densité (par km², sur le
+    disque), Nombre anneau et Densité anneau (entre le rayon précédent et celui-ci).
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    rayons = np.unique(np.asarray(rayons, dtype=np.float64))
+    lat = festivals["Latitude"].to_numpy(dtype=np.float64)
+    lon = festivals["Longitude"].to_numpy(dtype=np.float64)
+    if "Code période" in festivals:
+        periodes = festivals["Code période"].to_numpy(dtype=np.int64)
+    else:
+        periodes = codes_periodes(festivals[COLONNE_PERIODE]).astype(np.int64)
+    if "Masque disciplines" in festivals:
+        disciplines = festivals["Masque disciplines"].to_numpy(dtype=np.uint64)
+    else:
+        disciplines = masques_festivals(festivals)[0]
+
+    lignes, positions, distances = paires_dans_rayon(points, lat, lon, rayons[-1], taille_lot=taille_lot,
+                                                     seuils=rayons)
+    if exclure is not None:
+        cles_exclues = np.array([ligne * len(lat) + position
+                                 for ligne, exclues in enumerate(exclure) for position in exclues], dtype=np.int64)
+        garder = ~np.isin(lignes * len(lat) + positions, cles_exclues)
+        lignes, positions, distances = lignes[garder], positions[garder], distances[garder]
+
+    # Code de chaque couple : (discipline, période), la période inconnue (-1) ayant
+    # sa propre case ; un couple est répété pour chacune des disciplines du festival
+    nb_periodes = len(SAISONS) + 1
+    periodes_couples = np.where(periodes[positions] >= 0, periodes[positions], len(SAISONS))
+    masques_couples = disciplines[positions]
+    codes = [periodes_couples]
+    for numero, bit in enumerate(BITS_DISCIPLINES.values(), 1):
+        codes.append(np.where((masques_couples & bit) != 0, numero * nb_periodes + periodes_couples, -1))
+    comptes = compter_paires(np.tile(lignes, len(codes)), np.concatenate(codes), np.tile(distances, len(codes)),
+                             len(points), len(DISCIPLINES) * nb_periodes, rayons)
+    comptes = comptes.reshape(len(points), len(DISCIPLINES), nb_periodes, len(rayons))
+
+    # Période "Toutes" en tête, case de la période inconnue retirée ;
+    # axes : ancre, période, discipline, rayon
+    comptes = np.concatenate([comptes.sum(axis=2, keepdims=True), comptes[:, :, :len(SAISONS)]], axis=2)
+    comptes = comptes.transpose(0, 2, 1, 3)
+    anneaux = np.diff(comptes, axis=3, prepend=0)
+    disques, surfaces_anneaux = surfaces_km2(rayons)
+
+    forme = comptes.shape
+    ancre, periode, discipline, rayon = (indices.ravel() for indices in np.indices(forme))
+    return pd.DataFrame({
+        "Ancre": ancre,
+        "Période": pd.Categorical.from_codes(periode, PERIODES),
+        "Discipline": pd.Categorical.from_codes(discipline, DISCIPLINES),
+        "Rayon (km)": rayons[rayon],
+        "Nombre": comptes.ravel(),
+        "Densité": comptes.ravel() / disques[rayon],
+        "Nombre anneau": anneaux.ravel(),
+        "Densité anneau": anneaux.ravel() / surfaces_anneaux[rayon],
+    })
@@ -0,0 +1,273 @@
+"""
+Index des noms de festivals pour la recherche en texte libre et l'appariement.
+
+Chaque festival est décrit par les n-grammes de caractères (trigrammes) de son nom
+et de sa commune, après passage en minuscules et suppression des accents et de la
+ponctuation : « Jazz à Vienne » et « JAZZ A VIENNE » ont les mêmes trigrammes, et
+une faute de frappe n'en change que quelques-uns. Les trigrammes sont pondérés par
+TF-IDF ; ceux des mots très courants dans les noms (« festival », « de »...) ont
+un poids réduit (POIDS_MOT_VIDE), ceux de la commune aussi (POIDS_COMMUNE). Une
+recherche renvoie les k festivals de plus grande similarité cosinus avec la
+requête, par un produit de matrices creuses (scipy.sparse).
+
+L'index est persisté à côté du snapshot (cache_festivals/noms_<clé>.npz) et n'est
+reconstruit que si le snapshot change.
+
+Utilisation :
+    from index_noms import charger_index_noms
+    index = charger_index_noms()
+    positions, scores = index.rechercher("francofolies la rochelle", k=5)
+
+Les positions renvoyées sont les numéros de ligne du DataFrame de charger_festivals().
+"""
+
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from base_festivals import DOSSIER_SNAPSHOT, construire_snapshot, lire_meta, snapshot_a_jour
+
+TAILLE_NGRAMME = 3
+
+# Mots fréquents dans les noms de festivals, peu informatifs pour les distinguer
+MOTS_VIDES = {
+    "festival", "festivals", "fest", "fete", "fetes", "rencontres", "edition",
+    "de", "du", "des", "la", "le", "les", "l", "d", "et", "en", "a", "au", "aux", "sur", "sous",
+    "the", "of", "and",
+}
+POIDS_MOT_VIDE = 0.1
+POIDS_COMMUNE = 0.5
+
+# Les trigrammes présents dans plus de cette fraction des festivals (ceux de « festival »,
+# « de la »...) sont gardés en matrice dense pour les recherches par lots
+FRACTION_DENSE = 0.02
+
+NON_ALPHANUMERIQUE = re.compile(r"[\W_]+")
+
+NOM = "Nom du festival"
+COMMUNE = "Commune principale de déroulement"
+
+
+def normaliser(texte):
+    """
+    Texte en minuscules, sans accents, la ponctuation remplacée par des espaces.
+    """
+    if not isinstance(texte, str):
+        return ""
+    texte = unicodedata.normalize("NFKD", texte)
+    texte = "".join(c for c in texte if not unicodedata.combining(c)).lower()
+    return NON_ALPHANUMERIQUE.sub(" ", texte).strip()
+
+
+def ngrammes(texte, poids=1.0, comptes=None):
+    """
+    Ajoute à comptes (n-gramme -> poids cumulé) les n-grammes de chaque mot de texte,
+    entouré d'espaces ; renvoie comptes.
+    """
+    if comptes is None:
+        comptes = defaultdict(float)
+    for mot in normaliser(texte).split():
+        poids_mot = poids * (POIDS_MOT_VIDE if mot in MOTS_VIDES else 1.0)
+        mot = f" {mot} "
+        for debut in range(max(len(mot) - TAILLE_NGRAMME + 1, 1)):
+            comptes[mot[debut:debut + TAILLE_NGRAMME]] += poids_mot
+    return comptes
+
+
+def normaliser_lignes(matrice):
+    """
+    Divise (sur place) chaque ligne d'une matrice creuse CSR par sa norme euclidienne.
+    """
+    lignes = np.repeat(np.arange(matrice.shape[0]), np.diff(matrice.indptr))
+    normes = np.sqrt(np.bincount(lignes, weights=matrice.data ** 2, minlength=matrice.shape[0]))
+    normes[normes == 0] = 1.0
+    matrice.data /= normes[lignes]
+    return matrice
+
+
+class IndexNoms:
+    """
+    Matrice TF-IDF festivals x trigrammes (noms et communes).
+    """
+
+    def __init__(self, noms, communes=None, identifiants=None):
+        self.noms = np.array([n if isinstance(n, str) else "" for n in noms], dtype=str)
+        communes = [""] * len(self.noms) if communes is None else communes
+        self.communes = np.array([c if isinstance(c, str) else "" for c in communes], dtype=str)
+        identifiants = range(len(self.noms)) if identifiants is None else identifiants
+        self.identifiants = np.array([str(i) for i in identifiants], dtype=str)
+
+        self.vocabulaire = {}
+        lignes, colonnes, valeurs = [], [], []
+        for ligne, (nom, commune) in enumerate(zip(self.noms, self.communes)):
+            comptes = ngrammes(commune, POIDS_COMMUNE, ngrammes(nom))
+            for ngramme, poids in comptes.items():
+                lignes.append(ligne)
+                colonnes.append(self.vocabulaire.setdefault(ngramme, len(self.vocabulaire)))
+                valeurs.append(poids)
+        forme = (len(self.noms), len(self.vocabulaire))
+        comptes = sparse.csr_matrix((valeurs, (lignes, colonnes)), shape=forme, dtype=np.float64)
+
+        # IDF lissé : ln((1 + N) / (1 + nombre de festivals contenant le n-gramme)) + 1
+        frequences = np.bincount(colonnes, minlength=forme[1])
+        self.idf = np.log((1 + forme[0]) / (1 + frequences)) + 1
+        self._finaliser(normaliser_lignes((comptes @ sparse.diags(self.idf)).tocsr()))
+
+    def _finaliser(self, matrice):
+        self.matrice = matrice
+        # Transposée (trigrammes x festivals) : une requête ne lit que les lignes de ses trigrammes
+        self.transposee = matrice.T.tocsr()
+        # Pour les lots, les trigrammes fréquents rendraient le produit creux presque
+        # plein : leurs lignes sont multipliées en dense, les autres en creux
+        frequents = np.diff(self.transposee.indptr) > FRACTION_DENSE * matrice.shape[0]
+        self.frequents = np.flatnonzero(frequents)
+        self.rares = np.flatnonzero(~frequents)
+        self.transposee_dense = self.transposee[self.frequents].toarray()
+        self.transposee_rares = self.transposee[self.rares]
+
+    @classmethod
+    def charger(cls, chemin):
+        """
+        Recharge un index écrit par sauvegarder().
+        """
+        with np.load(chemin) as donnees:
+            index = cls.__new__(cls)
+            index.noms = donnees["noms"]
+            index.communes = donnees["communes"]
+            index.identifiants = donnees["identifiants"]
+            index.idf = donnees["idf"]
+            index.vocabulaire = {ngramme: i for i, ngramme in enumerate(donnees["vocabulaire"].tolist())}
+            matrice = sparse.csr_matrix((donnees["donnees"], donnees["indices"], donnees["indptr"]),
+                                        shape=tuple(donnees["forme"]))
+        index._finaliser(matrice)
+        return index
+
+    def sauvegarder(self, chemin):
+        """
+        Écrit l'index dans un fichier .npz (écriture atomique).
+        """
+        chemin = Path(chemin)
+        chemin_tmp = chemin.with_name(chemin.name + ".tmp")
+        vocabulaire = np.array(sorted(self.vocabulaire, key=self.vocabulaire.get), dtype=str)
+        with open(chemin_tmp, "wb") as fichier:
+            np.savez(fichier, noms=self.noms, communes=self.communes, identifiants=self.identifiants,
+                     idf=self.idf, vocabulaire=vocabulaire, donnees=self.matrice.data,
+                     indices=self.matrice.indices, indptr=self.matrice.indptr,
+                     forme=np.array(self.matrice.shape))
+        os.replace(chemin_tmp, chemin)
+
+    def __len__(self):
+        return self.matrice.shape[0]
+
+    def vecteurs(self, requetes):
+        """
+        Matrice creuse normalisée (requêtes x trigrammes) ; les trigrammes absents de
+        l'index sont ignorés.
+        """
+        lignes, colonnes, valeurs = [], [], []
+        for ligne, requete in enumerate(requetes):
+            for ngramme, poids in ngrammes(requete).items():
+                colonne = self.vocabulaire.get(ngramme)
+                if colonne is not None:
+                    lignes.append(ligne)
+                    colonnes.append(colonne)
+                    valeurs.append(poids * self.idf[colonne])
+        forme = (len(requetes), len(self.vocabulaire))
+        return normaliser_lignes(sparse.csr_matrix((valeurs, (lignes, colonnes)), shape=forme, dtype=np.float64))
+
+    @staticmethod
+    def _meilleurs(scores, k):
+        """
+        Positions des k plus grands scores non nuls (égalités : plus petite position d'abord).
+        """
+        candidats = np.flatnonzero(scores > 0)
+        if len(candidats) > k:
+            seuil = -np.partition(-scores[candidats], k - 1)[k - 1]
+            candidats = candidats[scores[candidats] >= seuil]
+        tri = np.lexsort((candidats, -scores[candidats]))[:k]
+        return candidats[tri], scores[candidats[tri]]
+
+    def rechercher(self, requete, k=10):
+        """
+        Les k festivals les plus similaires à la requête (texte libre : nom et/ou commune).
+
+        Renvoie (positions, similarités cosinus entre 0 et 1), par similarité décroissante.
+        """
+        vecteur = self.vecteurs([requete])
+        # Somme pondérée des seules lignes de la transposée correspondant aux trigrammes de la requête
+        scores = self.transposee[vecteur.indices].T @ vecteur.data
+        return self._meilleurs(np.asarray(scores).ravel(), k)
+
+    def similaires(self, requetes, k=10, taille_lot=500):
+        """
+        rechercher() pour une liste de requêtes, par lots : un produit de matrices
+        creuses donne les similarités de tout un lot avec tous les festivals.
+
+        Renvoie deux tableaux (requêtes x k) : positions et similarités, par similarité
+        décroissante ; les cases sans candidat (similarité nulle) valent -1 et 0.
+        """
+        requetes = list(requetes)
+        k = min(k, len(self))
+        positions = np.full((len(requetes), k), -1, dtype=np.int64)
+        similarites = np.zeros((len(requetes), k))
+        for debut in range(0, len(requetes), taille_lot):
+            vecteurs = self.vecteurs(requetes[debut:debut + taille_lot]).tocsc()
+            scores = (vecteurs[:, self.rares] @ self.transposee_rares).toarray()
+            scores += vecteurs[:, self.frequents] @ self.transposee_dense
+            lignes = np.arange(len(scores))[:, None]
+            meilleurs = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k < scores.shape[1] else \
+                np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            # Tri des k meilleurs par similarité décroissante puis position croissante
+            ordre = np.lexsort((meilleurs, -scores[lignes, meilleurs]), axis=1)
+            meilleurs = np.take_along_axis(meilleurs, ordre, axis=1)
+            valeurs = scores[lignes, meilleurs]
+            fin = debut + len(scores)
+            positions[debut:fin] = np.where(valeurs > 0, meilleurs, -1)
+            similarites[debut:fin] = np.where(valeurs > 0, valeurs, 0)
+        return positions, similarites
+
+    def festivals(self, positions, scores=None):
+        """
+        DataFrame (Identifiant, Nom du festival, Commune...) des positions données.
+        """
+        resultat = pd.DataFrame({
+            "Identifiant": self.identifiants[positions],
+            NOM: self.noms[positions],
+            COMMUNE: self.communes[positions],
+        }, index=np.asarray(positions))
+        if scores is not None:
+            resultat["Similarité"] = scores
+        return resultat
+
+
+def charger_index_noms(dossier=DOSSIER_SNAPSHOT, verifier_source=None, reconstruire=True):
+    """
+    Renvoie l'index des noms du snapshot courant, construit et écrit au premier appel.
+
+    Avec reconstruire=False, lève FileNotFoundError si le snapshot est absent ou périmé.
+    """
+    dossier = Path(dossier)
+    if not snapshot_a_jour(dossier, verifier_source=verifier_source):
+        if not reconstruire:
+            raise FileNotFoundError(f"Aucun snapshot à jour dans {dossier}. Lancez 'python base_festivals.py'.")
+        construire_snapshot(dossier)
+    meta = lire_meta(dossier)
+    chemin = dossier / f"noms_{meta['cle']}.npz"
+    if chemin.exists():
+        return IndexNoms.charger(chemin)
+
+    festivals = pd.read_parquet(dossier / meta["fichier"], columns=["Identifiant", NOM, COMMUNE])
+    index = IndexNoms(festivals[NOM], festivals[COMMUNE], festivals["Identifiant"])
+    index.sauvegarder(chemin)
+
+    # Supprimer les index des anciens snapshots
+    for ancien in dossier.glob("noms_*.npz"):
+        if ancien.name != chemin.name:
+            ancien.unlink()
+    return index
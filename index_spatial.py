@@ -0,0 +1,214 @@
+"""
+Index spatial des festivals pour les requêtes de rayon et des plus proches voisins.
+
+Les festivals sont rangés dans une grille régulière en degrés (cellules de
+PAS_GRILLE_DEGRES de côté) : les positions des festivals sont triées par numéro de
+cellule, et chaque cellule non vide pointe vers une tranche contiguë de ce tableau. Une
+requête ne calcule les distances (geodistance.py) que pour les festivals des
+cellules qui recouvrent le cercle demandé, au lieu de parcourir toute la base.
+
+Dans une même ligne de la grille, les cellules d'une plage de longitudes sont
+consécutives dans ce tri : chaque ligne qui coupe le cercle se résout en une seule
+tranche, trouvée par recherche dichotomique.
+
+L'index est persisté à côté du snapshot (cache_festivals/index_<clé>.npz) et
+n'est reconstruit que si le snapshot change. Il est en lecture seule une fois
+construit : une même instance peut servir plusieurs requêtes concurrentes.
+
+Utilisation :
+    from index_spatial import charger_index
+    index = charger_index()
+    positions, distances = index.within_radius(43.53, 5.45, 100)
+    positions, distances = index.nearest(43.53, 5.45, 3, predicate=masque_booleen)
+
+Les positions renvoyées sont les numéros de ligne du DataFrame de charger_festivals().
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from base_festivals import DOSSIER_SNAPSHOT, construire_snapshot, lire_meta, snapshot_a_jour
+from geodistance import TOLERANCE_HAVERSINE, dans_rayon, distance_ellipsoide_km, distances_km
+
+# Côté d'une cellule de la grille (degrés) : ~28 km en latitude
+PAS_GRILLE_DEGRES = 0.25
+
+# Longueur d'un degré de latitude (km), borne basse pour rester conservateur
+KM_PAR_DEGRE = 110.5
+
+
+class IndexSpatial:
+    """
+    Grille de cellules en degrés sur les coordonnées des festivals.
+
+    Les festivals sans coordonnées (NaN) ne sont pas indexés.
+    """
+
+    def __init__(self, lat, lon, pas_degres=PAS_GRILLE_DEGRES):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lon = np.asarray(lon, dtype=np.float64)
+        self.pas = float(pas_degres)
+        self.nb_colonnes = int(np.ceil(360 / self.pas)) + 1
+
+        positions = np.flatnonzero(~(np.isnan(self.lat) | np.isnan(self.lon)))
+        cles = self._cles(self.lat[positions], self.lon[positions])
+        tri = np.argsort(cles, kind="stable")
+        # Positions des festivals triées par cellule ; la i-ème cellule non vide
+        # correspond à la tranche ordre[bornes[i]:bornes[i + 1]]
+        self.ordre = positions[tri]
+        self.cles, debut = np.unique(cles[tri], return_index=True)
+        self.bornes = np.append(debut, len(self.ordre))
+
+    @classmethod
+    def charger(cls, chemin):
+        """
+        Recharge un index écrit par sauvegarder().
+        """
+        with np.load(chemin) as donnees:
+            return cls.depuis_tableaux({nom: donnees[nom] for nom in donnees.files})
+
+    @classmethod
+    def depuis_tableaux(cls, tableaux):
+        """
+        Reconstruit un index à partir de ses tableaux (cf. tableaux()), par exemple
+        depuis la mémoire partagée d'un processus de calcul (parallele.py).
+        """
+        index = cls.__new__(cls)
+        index.lat = tableaux["lat"]
+        index.lon = tableaux["lon"]
+        index.pas = float(np.ravel(tableaux["pas"])[0])
+        index.nb_colonnes = int(np.ceil(360 / index.pas)) + 1
+        index.ordre = tableaux["ordre"]
+        index.cles = tableaux["cles"]
+        index.bornes = tableaux["bornes"]
+        return index
+
+    def tableaux(self):
+        """
+        Tableaux NumPy qui décrivent l'index.
+        """
+        return {"lat": self.lat, "lon": self.lon, "pas": np.array(self.pas), "ordre": self.ordre,
+                "cles": self.cles, "bornes": self.bornes}
+
+    def sauvegarder(self, chemin):
+        """
+        Écrit l'index dans un fichier .npz (écriture atomique).
+        """
+        chemin = Path(chemin)
+        chemin_tmp = chemin.with_name(chemin.name + ".tmp")
+        with open(chemin_tmp, "wb") as fichier:
+            np.savez(fichier, **self.tableaux())
+        os.replace(chemin_tmp, chemin)
+
+    def __len__(self):
+        return len(self.ordre)
+
+    # --- Grille ---
+
+    def _cles(self, lat, lon):
+        """
+        Numéro de cellule de chaque point.
+        """
+        ligne = np.floor((np.asarray(lat) + 90) / self.pas).astype(np.int64)
+        colonne = np.floor((np.asarray(lon) + 180) / self.pas).astype(np.int64)
+        return ligne * self.nb_colonnes + colonne
+
+    def candidats(self, lat, lon, km):
+        """
+        Positions des festivals des cellules qui recouvrent le cercle (lat, lon, km).
+
+        C'est un sur-ensemble des festivals à moins de km ; l'ordre n'est pas significatif.
+        La grille ne fait pas le tour de l'antiméridien (aucun festival concerné).
+        """
+        marge_lat = km / KM_PAR_DEGRE
+        lat_min, lat_max = max(lat - marge_lat, -90.0), min(lat + marge_lat, 90.0)
+        cos_min = np.cos(np.radians(max(abs(lat_min), abs(lat_max))))
+        marge_lon = km / (KM_PAR_DEGRE * cos_min) if cos_min > 1e-6 else 180.0
+        lon_min, lon_max = max(lon - marge_lon, -180.0), min(lon + marge_lon, 180.0)
+
+        lignes = np.arange(np.floor((lat_min + 90) / self.pas), np.floor((lat_max + 90) / self.pas) + 1, dtype=np.int64)
+        col_min = np.int64(np.floor((lon_min + 180) / self.pas))
+        col_max = np.int64(np.floor((lon_max + 180) / self.pas))
+
+        # Une tranche de cellules (donc de festivals) par ligne de la grille
+        premiere = np.searchsorted(self.cles, lignes * self.nb_colonnes + col_min, side="left")
+        derniere = np.searchsorted(self.cles, lignes * self.nb_colonnes + col_max, side="right")
+        debut, fin = self.bornes[premiere], self.bornes[derniere]
+
+        # Concaténation vectorisée des tranches ordre[debut:fin]
+        longueurs = fin - debut
+        decalages = np.repeat(debut - np.cumsum(longueurs) + longueurs, longueurs)
+        return self.ordre[decalages + np.arange(longueurs.sum())]
+
+    # --- Requêtes ---
+
+    def within_radius(self, lat, lon, km):
+        """
+        Festivals à moins de km du point (lat, lon).
+
+        Renvoie (positions, distances en km), triés par position. Même résultat que
+        geodistance.dans_rayon sur toute la base.
+        """
+        positions = np.sort(self.candidats(lat, lon, km))
+        distances = distances_km((lat, lon), self.lat[positions], self.lon[positions])
+        garder = dans_rayon((lat, lon), self.lat[positions], self.lon[positions], km, distances=distances)
+        return positions[garder], distances[garder]
+
+    def nearest(self, lat, lon, k, predicate=None):
+        """
+        Les k festivals les plus proches du point (lat, lon) vérifiant predicate.
+
+        predicate est un masque booléen aligné sur les lignes de la base (par exemple
+        masques.filtre_genres(...)), ou None. Le rayon de recherche est doublé tant
+        que moins de k festivals valides sont trouvés. Renvoie (positions, distances
+        en km sur l'ellipsoïde), triés par distance croissante.
+        """
+        if predicate is not None:
+            predicate = np.asarray(predicate, dtype=bool)
+        km = self.pas * KM_PAR_DEGRE
+        while True:
+            positions = self.candidats(lat, lon, km)
+            tout = len(positions) == len(self.ordre)
+            if predicate is not None:
+                positions = positions[predicate[positions]]
+            if not tout:
+                # Seuls les festivals du cercle sont sûrs d'être les plus proches :
+                # présélection en haversine avec marge, puis distance exacte
+                approx = distances_km((lat, lon), self.lat[positions], self.lon[positions])
+                positions = positions[approx <= km * (1 + TOLERANCE_HAVERSINE)]
+            distances = distance_ellipsoide_km(lat, lon, self.lat[positions], self.lon[positions])
+            if not tout:
+                dans_cercle = distances <= km
+                positions, distances = positions[dans_cercle], distances[dans_cercle]
+            if len(positions) >= k or tout:
+                break
+            km *= 2
+
+        tri = np.lexsort((positions, distances))[:k]
+        return positions[tri], distances[tri]
+
+
+def charger_index(dossier=DOSSIER_SNAPSHOT, verifier_source=None):
+    """
+    Renvoie l'index spatial du snapshot courant, construit et écrit au premier appel.
+    """
+    dossier = Path(dossier)
+    if not snapshot_a_jour(dossier, verifier_source=verifier_source):
+        construire_snapshot(dossier)
+    meta = lire_meta(dossier)
+    chemin = dossier / f"index_{meta['cle']}.npz"
+    if chemin.exists():
+        return IndexSpatial.charger(chemin)
+
+    coordonnees = pd.read_parquet(dossier / meta["fichier"], columns=["Latitude", "Longitude"])
+    index = IndexSpatial(coordonnees["Latitude"].to_numpy(), coordonnees["Longitude"].to_numpy())
+    index.sauvegarder(chemin)
+
+    # Supprimer les index des anciens snapshots
+    for ancien in dossier.glob("index_*.npz"):
+        if ancien.name != chemin.name:
+            ancien.unlink()
+    return index
@@ -0,0 +1,142 @@
+"""
+Encodage des disciplines et des genres des festivals en masques de bits.
+
+Chaque discipline (les cinq types proposés dans questions.py) et chaque nouvelle
+sous-catégorie des dictionnaires de regroupements.py reçoit un bit fixe. Les
+festivals sont encodés une fois (colonnes uint64 "Masque disciplines" et
+"Masque genres"), les préférences d'un utilisateur sont compilées vers les mêmes
+masques, et le filtre par type/genre devient un simple ET binaire vectorisé :
+
+    (df["Masque genres"].to_numpy() & masque_genres_utilisateur(user_data)) != 0
+"""
+
+import numpy as np
+import pandas as pd
+
+from regroupements import (
+    regroupements_arts_visuels,
+    regroupements_cinema,
+    regroupements_livre_litterature,
+    regroupements_musique,
+    regroupements_spectacle_vivant,
+)
+
+# Une entrée par discipline :
+# (type dans questions.py, valeur de "Discipline dominante", colonne des nouvelles
+#  sous-catégories, clé des genres dans user_data.json, dictionnaire de regroupement)
+DISCIPLINES = [
+    ("Musique", "Musique", "Nouvelles sous-catégories musique",
+     "genres musique", regroupements_musique),
+    ("Spectacle vivant", "Spectacle vivant", "Nouvelles sous-catégories spectacle vivant",
+     "genres spectacles vivants", regroupements_spectacle_vivant),
+    ("Cinéma et audiovisuel", "Cinéma, audiovisuel", "Nouvelles sous-catégories cinéma et audiovisuel",
+     "genres cinéma et audiovisuel", regroupements_cinema),
+    ("Arts visuels et numériques", "Arts visuels, arts numériques", "Nouvelles sous-catégories arts visuels",
+     "genres arts visuels et numériques", regroupements_arts_visuels),
+    ("Livre et littérature", "Livre, littérature", "Nouvelles sous-catégories livre et littérature",
+     "genres livre et littérature", regroupements_livre_litterature),
+]
+
+# Bit de chaque discipline (indexé par la valeur de "Discipline dominante")
+BITS_DISCIPLINES = {
+    discipline: np.uint64(1 << i) for i, (_, discipline, _, _, _) in enumerate(DISCIPLINES)
+}
+
+# Bit de chaque genre, propre à sa discipline : (discipline, genre) -> bit
+BITS_GENRES = {}
+for _, discipline, _, _, dictionnaire in DISCIPLINES:
+    for genre in dictionnaire:
+        BITS_GENRES[(discipline, genre)] = np.uint64(1 << len(BITS_GENRES))
+
+if len(BITS_GENRES) > 64:
+    raise ValueError(f"{len(BITS_GENRES)} genres : trop pour un masque uint64")
+
+# Tous les bits de genre d'une discipline
+GENRES_PAR_DISCIPLINE = {
+    discipline: np.bitwise_or.reduce(
+        [bit for (disc, _), bit in BITS_GENRES.items() if disc == discipline], dtype=np.uint64
+    )
+    for _, discipline, _, _, _ in DISCIPLINES
+}
+
+
+def masque_disciplines(valeur):
+    """
+    Masque des disciplines d'une valeur de "Discipline dominante" ("Musique ; Livre, littérature").
+    """
+    if not isinstance(valeur, str):
+        return np.uint64(0)
+    masque = np.uint64(0)
+    for discipline in valeur.split(";"):
+        masque |= BITS_DISCIPLINES.get(discipline.strip(), np.uint64(0))
+    return masque
+
+
+def masques_festivals(df):
+    """
+    Calcule les masques de disciplines et de genres de tous les festivals.
+
+    Renvoie deux tableaux NumPy uint64 alignés sur les lignes de df. Un genre n'est
+    retenu que si sa discipline figure dans la discipline dominante du festival.
+    """
+    # Disciplines : peu de valeurs distinctes, on encode chacune une seule fois
+    codes, valeurs = pd.factorize(df["Discipline dominante"])
+    par_valeur = np.array([masque_disciplines(v) for v in valeurs] + [np.uint64(0)], dtype=np.uint64)
+    disciplines = par_valeur[codes]  # Code -1 (valeur manquante) : dernier élément, 0
+
+    # Genres : une passe vectorisée par colonne de listes
+    genres = np.zeros(len(df), dtype=np.uint64)
+    for _, discipline, colonne, _, dictionnaire in DISCIPLINES:
+        eclate = df[colonne].reset_index(drop=True).explode().dropna()
+        table = {genre: BITS_GENRES[(discipline, genre)] for genre in dictionnaire}
+        bits = eclate.map(table).dropna()
+        np.bitwise_or.at(genres, bits.index.to_numpy(), bits.to_numpy(dtype=np.uint64))
+
+    # Restreindre les genres aux disciplines du festival
+    autorises = np.zeros(len(df), dtype=np.uint64)
+    for discipline, bit in BITS_DISCIPLINES.items():
+        autorises[(disciplines & bit) != 0] |= GENRES_PAR_DISCIPLINE[discipline]
+    return disciplines, genres & autorises
+
+
+def ajouter_masques(df):
+    """
+    Ajoute à df les colonnes uint64 "Masque disciplines" et "Masque genres".
+    """
+    disciplines, genres = masques_festivals(df)
+    df = df.copy()
+    df["Masque disciplines"] = disciplines
+    df["Masque genres"] = genres
+    return df
+
+
+def masque_disciplines_utilisateur(user_data):
+    """
+    Compile les types choisis dans le questionnaire en masque de disciplines.
+    """
+    masque = np.uint64(0)
+    for type_festival, discipline, _, _, _ in DISCIPLINES:
+        if type_festival in user_data.get("types", []):
+            masque |= BITS_DISCIPLINES[discipline]
+    return masque
+
+
+def masque_genres_utilisateur(user_data):
+    """
+    Compile les genres choisis dans le questionnaire en masque de genres.
+
+    Seuls les genres des types sélectionnés sont pris en compte.
+    """
+    masque = np.uint64(0)
+    for type_festival, discipline, _, cle_genres, _ in DISCIPLINES:
+        if type_festival in user_data.get("types", []):
+            for genre in user_data.get(cle_genres, []):
+                masque |= BITS_GENRES.get((discipline, genre), np.uint64(0))
+    return masque
+
+
+def filtre_genres(masques_genres, user_data):
+    """
+    Renvoie le masque booléen des festivals ayant au moins un genre choisi par l'utilisateur.
+    """
+    return (np.asarray(masques_genres, dtype=np.uint64) & masque_genres_utilisateur(user_data)) != 0
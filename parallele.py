@@ -0,0 +1,125 @@
+"""
+Exécution parallèle par processus, avec tableaux NumPy en mémoire partagée.
+
+Les calculs lourds (recommandation en lot, comptages de festivals voisins) sont
+découpés en tâches exécutées par un ProcessPoolExecutor. Les grands tableaux
+communs à toutes les tâches (coordonnées, masques, codes de période) sont copiés
+une seule fois dans des blocs multiprocessing.shared_memory : chaque processus s'y
+attache au démarrage au lieu de recevoir un DataFrame sérialisé avec chaque tâche.
+Les résultats sont renvoyés dans l'ordre des tâches, quel que soit l'ordre dans
+lequel les processus terminent : le résultat ne dépend pas du nombre de processus.
+
+Utilisation :
+    with TableauxPartages({"lat": lat, "lon": lon}) as partages:
+        resultats = list(executer(fonction, taches, partages, nb_processus=4))
+
+où fonction(tache) est une fonction de niveau module qui lit les tableaux avec
+tableaux_partages().
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Tableaux partagés du processus courant (rempli dans chaque processus de calcul)
+_TABLEAUX = {}
+_BLOCS = []
+
+
+def nb_processus_par_defaut():
+    """
+    Nombre de processus utilisés par défaut : un par cœur disponible.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class TableauxPartages:
+    """
+    Copie un dictionnaire de tableaux NumPy dans des blocs de mémoire partagée.
+
+    À utiliser dans un bloc with : les blocs sont libérés à la sortie.
+    """
+
+    def __init__(self, tableaux):
+        self.blocs = []
+        # nom -> (nom du bloc, forme, dtype), transmis aux processus de calcul
+        self.descriptions = {}
+        for nom, tableau in tableaux.items():
+            tableau = np.ascontiguousarray(tableau)
+            bloc = shared_memory.SharedMemory(create=True, size=max(tableau.nbytes, 1))
+            np.ndarray(tableau.shape, dtype=tableau.dtype, buffer=bloc.buf)[...] = tableau
+            self.blocs.append(bloc)
+            self.descriptions[nom] = (bloc.name, tableau.shape, tableau.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.liberer()
+
+    def liberer(self):
+        """
+        Ferme et supprime les blocs de mémoire partagée.
+        """
+        for bloc in self.blocs:
+            bloc.close()
+            bloc.unlink()
+        self.blocs = []
+
+
+def attacher(descriptions):
+    """
+    Rattache le processus courant aux tableaux décrits par TableauxPartages.descriptions.
+
+    Les tableaux sont en lecture seule.
+    """
+    _TABLEAUX.clear()
+    for nom, (nom_bloc, forme, dtype) in descriptions.items():
+        # Les processus du pool partagent le resource_tracker du parent : le bloc
+        # n'est supprimé que par TableauxPartages.liberer()
+        bloc = shared_memory.SharedMemory(name=nom_bloc)
+        tableau = np.ndarray(forme, dtype=np.dtype(dtype), buffer=bloc.buf)
+        tableau.flags.writeable = False
+        _BLOCS.append(bloc)
+        _TABLEAUX[nom] = tableau
+
+
+def tableaux_partages():
+    """
+    Renvoie le dictionnaire des tableaux partagés, depuis une tâche.
+    """
+    return _TABLEAUX
+
+
+def executer(fonction, taches, partages, nb_processus=None):
+    """
+    Exécute fonction(tache) pour chaque tâche dans un pool de processus.
+
+    Les résultats sont produits au fil de l'eau, dans l'ordre des tâches.
+    """
+    nb_processus = nb_processus or nb_processus_par_defaut()
+    with ProcessPoolExecutor(max_workers=nb_processus, initializer=attacher,
+                             initargs=(partages.descriptions,)) as executeur:
+        yield from executeur.map(fonction, taches)
+
+
+def decouper(poids, nb_morceaux):
+    """
+    Découpe une suite d'éléments pondérés en au plus nb_morceaux tranches contiguës
+    de poids total comparable.
+
+    Renvoie la liste des (début, fin) ; le découpage ne dépend que des poids.
+    """
+    poids = np.asarray(poids, dtype=np.float64)
+    if len(poids) == 0:
+        return []
+    cumul = np.cumsum(poids)
+    cibles = cumul[-1] * np.arange(1, nb_morceaux) / nb_morceaux
+    coupures = np.unique(np.searchsorted(cumul, cibles, side="right"))
+    bornes = [0] + [int(c) for c in coupures if 0 < c < len(poids)] + [len(poids)]
+    return list(zip(bornes[:-1], bornes[1:]))
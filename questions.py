@@ -1,32 +1,17 @@
-import subprocess
-import sys
+# --- Vérification des modules nécessaires (sans pip install à chaque exécution) ---
+from dependances import verifier_dependances
+verifier_dependances(["streamlit", "requests"])
+
 import streamlit as st
-import pandas as pd
-import requests
-from geopy.distance import geodesic
 from datetime import date
 import json
-
-# --- Fonction : Installer les packages nécessaires ---
-def install_packages():
-    packages = ["streamlit", "pandas", "requests", "geopy"]
-    for package in packages:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-
-install_packages()
+from geocodage import geocoder
 
 # --- Fonction : Récupération des suggestions d'adresses ---
+# Les réponses de l'API Adresse sont mises en cache (mémoire + SQLite, cf. geocodage.py) :
+# les relances de Streamlit ne redemandent pas une adresse déjà géocodée.
 def get_address_suggestions(query):
-    url = 'https://api-adresse.data.gouv.fr/search/'
-    params = {'q': query, 'limit': 1}
-    response = requests.get(url, params=params)
-    if response.status_code == 200:
-        features = response.json().get('features', [])
-        if features:
-            coords = features[0]['geometry']['coordinates']
-            address_text = features[0]['properties']['label']
-            return (float(coords[1]), float(coords[0])), address_text
-    return None, None
+    return geocoder(query)
 
 # --- Fonction principale ---
 def collect_user_data():
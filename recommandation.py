@@ -0,0 +1,108 @@
+"""
+Moteur de recommandation des festivals, utilisable sans passer par le notebook.
+
+Reprend la logique de filtre_festivals.ipynb (distance, saison, genres, puis
+classement par distance) sur une table chargée une seule fois en mémoire :
+
+    from recommandation import recommend
+    df_end = recommend(user_data, k=3)
+
+Les trois filtres sont évalués en une passe : l'index spatial ne renvoie que les
+festivals des cellules proches, puis le filtre des genres (un ET binaire) et celui
+des saisons (une lecture indexée par le code de période) éliminent la plupart des candidats
+avant que les distances ne soient calculées sur les seuls survivants.
+"""
+
+import threading
+
+import numpy as np
+
+from base_festivals import DOSSIER_SNAPSHOT, charger_festivals
+from geodistance import dans_rayon, distance_ellipsoide_km
+from index_spatial import IndexSpatial, charger_index
+from masques import masque_genres_utilisateur
+from saisons import saisons_compatibles
+
+
+class MoteurRecommandation:
+    """
+    Table des festivals préchargée, avec son index spatial et ses colonnes de filtre
+    sous forme de tableaux NumPy.
+    """
+
+    def __init__(self, df=None, index=None, dossier=DOSSIER_SNAPSHOT, verifier_source=None):
+        if df is None:
+            df = charger_festivals(dossier, verifier_source=verifier_source)
+            if index is None:
+                index = charger_index(dossier, verifier_source=False)
+        self.df = df.reset_index(drop=True)
+        if index is None:
+            index = IndexSpatial(self.df["Latitude"].to_numpy(), self.df["Longitude"].to_numpy())
+        self.index = index
+        self.lat = self.df["Latitude"].to_numpy(dtype=np.float64)
+        self.lon = self.df["Longitude"].to_numpy(dtype=np.float64)
+        self.masques_genres = self.df["Masque genres"].to_numpy(dtype=np.uint64)
+        self.codes_periodes = self.df["Code période"].to_numpy(dtype=np.int8)
+
+    def positions(self, user_prefs):
+        """
+        Positions des festivals qui passent les trois filtres, et leur distance (km).
+        """
+        point = tuple(user_prefs["coordinates"])
+        distance_max = user_prefs["distance_max"]
+
+        # Distance : seulement les festivals des cellules proches (sur-ensemble)
+        candidats = self.index.candidats(point[0], point[1], distance_max)
+
+        # Genres : un ET binaire sur les candidats
+        masque = masque_genres_utilisateur(user_prefs)
+        candidats = candidats[(self.masques_genres[candidats] & masque) != 0]
+
+        # Saison : lecture dans la table des saisons compatibles (cf. saisons.py)
+        candidats = candidats[saisons_compatibles(user_prefs["dates"])[self.codes_periodes[candidats]]]
+
+        # Distance exacte sur les survivants
+        lat, lon = self.lat[candidats], self.lon[candidats]
+        garder = dans_rayon(point, lat, lon, distance_max)
+        candidats = candidats[garder]
+        distances = distance_ellipsoide_km(point[0], point[1], lat[garder], lon[garder])
+        return candidats, distances
+
+    def recommend(self, user_prefs, k=3):
+        """
+        Renvoie les k festivals les plus proches qui correspondent aux préférences
+        (toutes les correspondances si k vaut None), avec une colonne "Distance" (km).
+        """
+        positions, distances = self.positions(user_prefs)
+        ordre = np.lexsort((positions, distances))
+        if k is not None:
+            ordre = ordre[:k]
+        resultat = self.df.iloc[positions[ordre]].copy()
+        resultat["Distance"] = distances[ordre]
+        return resultat
+
+
+# Moteur partagé par les appels à recommend(), chargé au premier appel
+_moteur = None
+_verrou = threading.Lock()
+
+
+def moteur_par_defaut():
+    """
+    Renvoie le moteur partagé, en le chargeant depuis le snapshot au premier appel.
+    """
+    global _moteur
+    if _moteur is None:
+        with _verrou:
+            if _moteur is None:
+                _moteur = MoteurRecommandation()
+    return _moteur
+
+
+def recommend(user_prefs, k=3):
+    """
+    Recommande les k festivals les plus proches correspondant aux préférences
+    (même format que user_data.json), sans lire ni écrire de fichier après le
+    premier chargement.
+    """
+    return moteur_par_defaut().recommend(user_prefs, k=k)
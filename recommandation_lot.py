@@ -0,0 +1,255 @@
+"""
+Recommandation en lot : top-k des festivals pour des milliers de profils à la fois.
+
+Les profils (même format que user_data.json) sont lus depuis un fichier JSONL
+(un profil par ligne) ou Parquet, puis regroupés par préférences compilées
+(masque de genres et saisons compatibles) : le filtre des genres et des saisons
+n'est évalué qu'une fois par groupe. Pour chaque groupe, la matrice des distances
+profils × festivals est calculée par tuiles avec NumPy, et les k festivals les
+plus proches de chaque profil sont écrits au fil de l'eau dans un fichier JSONL.
+
+Les résultats sont identiques à ceux de recommandation.recommend() profil par profil.
+
+Utilisation :
+    python recommandation_lot.py profils.jsonl resultats.jsonl [--k 3]
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from base_festivals import DOSSIER_SNAPSHOT
+from geodistance import TOLERANCE_HAVERSINE, distance_ellipsoide_km, haversine_km
+from masques import masque_genres_utilisateur
+from parallele import TableauxPartages, decouper, executer, nb_processus_par_defaut, tableaux_partages
+from recommandation import MoteurRecommandation
+from saisons import saisons_compatibles
+
+# Nombre maximal de cases d'une tuile de la matrice des distances (~8 Mo en float64)
+TAILLE_TUILE = 1 << 20
+
+# Nombre de morceaux de groupes par processus en mode parallèle
+MORCEAUX_PAR_PROCESSUS = 4
+
+# Colonnes des festivals recopiées dans le fichier de résultats
+COLONNES_RESULTAT = ["Identifiant", "Nom du festival", "Commune principale de déroulement"]
+
+
+def lire_profils(chemin):
+    """
+    Lit les profils d'un fichier JSONL ou Parquet, sous forme de dictionnaires.
+    """
+    chemin = Path(chemin)
+    if chemin.suffix == ".parquet":
+        profils = pd.read_parquet(chemin).to_dict("records")
+        # Les colonnes de listes sont relues en tableaux NumPy
+        return [{cle: (list(v) if isinstance(v, np.ndarray) else v) for cle, v in profil.items()}
+                for profil in profils]
+    with open(chemin, "r", encoding="utf-8") as fichier:
+        return [json.loads(ligne) for ligne in fichier if ligne.strip()]
+
+
+def cle_preferences(profil):
+    """
+    Préférences compilées d'un profil : (masque de genres, saisons compatibles).
+
+    Deux profils de même clé ne diffèrent que par leur position et leur distance maximale.
+    """
+    return int(masque_genres_utilisateur(profil)), tuple(saisons_compatibles(profil["dates"]).tolist())
+
+
+def grouper_profils(profils):
+    """
+    Regroupe les numéros des profils par clé de préférences.
+
+    Les profils sans coordonnées ou sans dates sont mis à part (clé None).
+    """
+    groupes = defaultdict(list)
+    for num, profil in enumerate(profils):
+        if not profil.get("coordinates") or not profil.get("dates"):
+            groupes[None].append(num)
+        else:
+            groupes[cle_preferences(profil)].append(num)
+    return groupes
+
+
+def top_k_tuile(distances, positions, k):
+    """
+    Les k plus petites distances de chaque ligne d'une tuile (inf = festival exclu).
+
+    Renvoie deux tableaux (lignes, k) de positions et de distances, triés par distance
+    puis par position (comme recommend()) ; les cases vides valent -1 et inf.
+    """
+    nb_lignes, nb_colonnes = distances.shape
+    if nb_colonnes <= k:
+        colonnes = np.tile(np.arange(nb_colonnes), (nb_lignes, 1))
+    else:
+        colonnes = np.sort(np.argpartition(distances, k - 1, axis=1)[:, :k], axis=1)
+        # Égalités à la k-ième distance (festivals au même endroit) : départager par position
+        seuil = np.take_along_axis(distances, colonnes, axis=1).max(axis=1)
+        ambigus = np.flatnonzero(np.isfinite(seuil) & ((distances <= seuil[:, None]).sum(axis=1) > k))
+        for ligne in ambigus:
+            retenues = np.flatnonzero(distances[ligne] <= seuil[ligne])
+            colonnes[ligne] = retenues[np.lexsort((retenues, distances[ligne, retenues]))[:k]]
+    valeurs = np.take_along_axis(distances, colonnes, axis=1)
+    ordre = np.argsort(valeurs, axis=1, kind="stable")  # Colonnes déjà triées par position
+    colonnes = np.take_along_axis(colonnes, ordre, axis=1)
+    valeurs = np.take_along_axis(valeurs, ordre, axis=1)
+
+    resultat = np.full((nb_lignes, k), -1, dtype=np.int64)
+    resultat_distances = np.full((nb_lignes, k), np.inf)
+    largeur = colonnes.shape[1]
+    resultat[:, :largeur] = np.where(np.isfinite(valeurs), positions[colonnes], -1)
+    resultat_distances[:, :largeur] = valeurs
+    return resultat, resultat_distances
+
+
+def tableaux_moteur(moteur):
+    """
+    Tableaux de la table des festivals utilisés par recommander_groupe().
+    """
+    return {
+        "lat": moteur.lat,
+        "lon": moteur.lon,
+        "masques_genres": moteur.masques_genres,
+        "codes_periodes": moteur.codes_periodes,
+    }
+
+
+def recommander_groupe(tableaux, cle, nums, points, distances_max, k, taille_tuile=TAILLE_TUILE):
+    """
+    Génère (numéro de profil, positions, distances) pour les profils d'un même groupe.
+    """
+    vide = (np.empty(0, dtype=np.int64), np.empty(0))
+    if cle is None:
+        for num in nums:
+            yield num, *vide
+        return
+
+    # Festivals compatibles avec les préférences du groupe, une seule fois
+    masque_genres, saisons = cle
+    compatibles = ((tableaux["masques_genres"] & np.uint64(masque_genres)) != 0) \
+        & np.array(saisons)[tableaux["codes_periodes"]]
+    positions = np.flatnonzero(compatibles & ~np.isnan(tableaux["lat"]))
+    if len(positions) == 0:
+        for num in nums:
+            yield num, *vide
+        return
+    lat, lon = tableaux["lat"][positions], tableaux["lon"][positions]
+    lignes_par_tuile = max(1, taille_tuile // len(positions))
+
+    for debut in range(0, len(nums), lignes_par_tuile):
+        fin = debut + lignes_par_tuile
+        rayons = distances_max[debut:fin, None]
+        # Haversine sur toute la tuile, distance exacte seulement près ou dans le rayon
+        tuile = haversine_km(points[debut:fin, :1], points[debut:fin, 1:], lat[None, :], lon[None, :])
+        proches = tuile <= rayons * (1 + TOLERANCE_HAVERSINE)
+        lignes, colonnes = np.nonzero(proches)
+        tuile[~proches] = np.inf
+        tuile[lignes, colonnes] = distance_ellipsoide_km(
+            points[debut + lignes, 0], points[debut + lignes, 1], lat[colonnes], lon[colonnes]
+        )
+        tuile[tuile > rayons] = np.inf
+        top, top_distances = top_k_tuile(tuile, positions, k)
+        for num, ligne, ligne_distances in zip(nums[debut:fin], top, top_distances):
+            garder = ligne >= 0
+            yield num, ligne[garder], ligne_distances[garder]
+
+
+def _recommander_morceau(tache):
+    """
+    Tâche d'un processus de calcul : recommandations d'une suite de groupes.
+    """
+    groupes, k, taille_tuile = tache
+    tableaux = tableaux_partages()
+    return [resultat for groupe in groupes
+            for resultat in recommander_groupe(tableaux, *groupe, k, taille_tuile)]
+
+
+def recommander_lot(profils, moteur, k=3, taille_tuile=TAILLE_TUILE, nb_processus=1):
+    """
+    Renvoie un générateur de (numéro de profil, positions, distances) pour chaque
+    profil, groupe par groupe.
+
+    Les positions (numéros de ligne de moteur.df) sont triées par distance croissante.
+    Avec nb_processus > 1, les groupes sont répartis entre plusieurs processus
+    (cf. parallele.py) ; les résultats sortent dans le même ordre qu'en série.
+    k doit valoir au moins 1 : ValueError dès l'appel sinon.
+    """
+    if k < 1:
+        raise ValueError(f"k doit valoir au moins 1 (reçu : {k})")
+    return _recommander_groupes(profils, moteur, k, taille_tuile, nb_processus)
+
+
+def _recommander_groupes(profils, moteur, k, taille_tuile, nb_processus):
+    """
+    Générateur de recommander_lot(), paramètres déjà vérifiés.
+    """
+    groupes = []
+    for cle, nums in grouper_profils(profils).items():
+        points = distances_max = None
+        if cle is not None:
+            points = np.array([profils[num]["coordinates"] for num in nums], dtype=np.float64)
+            distances_max = np.array([profils[num]["distance_max"] for num in nums], dtype=np.float64)
+        groupes.append((cle, nums, points, distances_max))
+
+    if nb_processus <= 1:
+        tableaux = tableaux_moteur(moteur)
+        for groupe in groupes:
+            yield from recommander_groupe(tableaux, *groupe, k, taille_tuile)
+        return
+
+    # Plusieurs morceaux par processus pour équilibrer la charge
+    morceaux = decouper([len(nums) for _, nums, _, _ in groupes], nb_processus * MORCEAUX_PAR_PROCESSUS)
+    taches = [(groupes[debut:fin], k, taille_tuile) for debut, fin in morceaux]
+    with TableauxPartages(tableaux_moteur(moteur)) as partages:
+        for resultats in executer(_recommander_morceau, taches, partages, nb_processus):
+            yield from resultats
+
+
+def ecrire_resultats(resultats, profils, moteur, chemin):
+    """
+    Écrit les résultats au fil de l'eau dans un fichier JSONL, une ligne par profil.
+
+    Renvoie le nombre de profils écrits.
+    """
+    colonnes = [col for col in COLONNES_RESULTAT if col in moteur.df.columns]
+    valeurs = {col: moteur.df[col].to_numpy(dtype=object) for col in colonnes}
+    nb = 0
+    with open(chemin, "w", encoding="utf-8") as fichier:
+        for num, positions, distances in resultats:
+            festivals = [
+                {**{col: valeurs[col][pos] for col in colonnes}, "Distance": round(float(dist), 3)}
+                for pos, dist in zip(positions, distances)
+            ]
+            ligne = {"profil": num, "email": profils[num].get("email"), "festivals": festivals}
+            fichier.write(json.dumps(ligne, ensure_ascii=False, default=str) + "\n")
+            nb += 1
+    return nb
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recommande les festivals d'un lot de profils.")
+    parser.add_argument("profils", help="Fichier des profils (.jsonl ou .parquet)")
+    parser.add_argument("resultats", help="Fichier JSONL des résultats")
+    parser.add_argument("--k", type=int, default=3, help="Nombre de festivals par profil")
+    parser.add_argument("--dossier", default=str(DOSSIER_SNAPSHOT), help="Dossier du snapshot")
+    parser.add_argument("--processus", type=int, default=1,
+                        help="Nombre de processus de calcul (0 : un par cœur)")
+    args = parser.parse_args()
+    if args.k < 1:
+        parser.error("--k doit valoir au moins 1")
+
+    moteur = MoteurRecommandation(dossier=args.dossier)
+    nb_processus = args.processus or nb_processus_par_defaut()
+    debut = time.perf_counter()
+    profils = lire_profils(args.profils)
+    resultats = recommander_lot(profils, moteur, k=args.k, nb_processus=nb_processus)
+    nb = ecrire_resultats(resultats, profils, moteur, args.resultats)
+    duree = time.perf_counter() - debut
+    print(f"{nb} profils traités en {duree:.2f} s ({nb / duree:.0f} profils/s)")
@@ -0,0 +1,451 @@
+"""
+Dictionnaires de regroupement des sous-catégories de festivals.
+
+Chaque dictionnaire associe une nouvelle sous-catégorie (clé) à la liste des
+libellés bruts de la base data.gouv qui y sont rattachés. Ils sont utilisés par
+Nettoyage_base_donnees.py et leur contenu entre dans la version du snapshot
+compilé (base_festivals.py) : toute modification déclenche une reconstruction.
+"""
+
+# --- Spectacle vivant ---
+regroupements_spectacle_vivant = {
+    "Théâtre": [
+        "Théâtre", "Théâtre - humour", "Théâtre ; Lecture publique", "Arts du théâtre",
+        "Théâtre, Danse", "Théâtre, Marionnettes", "Théâtre, arts du conte",
+        "Théâtre amateur", "Théâtre de rue", "Arts du théâtre théâtre d'humour",
+        "Théâtre musical", "Théâtre - humour comédie", "Théâtre forain", "Du théâtre",
+        "Contes", "Représentation", "Poésie", "Lecture…", "Arts du théâtre  théâtre d'humour",
+        "Piano jazz théâtre"
+    ],
+    "Danse": [
+        "Danse", "Danses traditionnelles", "Danse contemporaine", "Danse, théâtre",
+        "Danses de rue", "Danse afro-contemporaine", "Danse de music’ hall",
+        "Danse classique", "Danse theme monde arabe", "Danse theme  europe de l'est",
+        "Danse et concerts tango", "Hip hop (danse)", "Capoeira", "Danse contemporaine et danse traditionnelle",
+        "Danses", "Bal sévillan"
+    ],
+    "Arts de la Rue": [
+        "Arts de la Rue", "Cirque et Arts de la rue", "Arts de la rue ; Théâtre",
+        "Spectacles de rue", "Arts de la rue et Cirque", "Spectacle de rue",
+        "Spectacle déambulatoire", "Spectacle de rues", "Arts de la rue et du cirque",
+        "Street art", "Arts de la rue - concert - conte", "Des arts de la rue", "Rue",
+        "Arts d la rue", "Cultures urbaines ", "Arts de la rue Musique", "Spectacles de rue concerts"
+    ],
+    "Cirque": [
+        "Arts de la piste", "Nouveau Cirque", "Arts du cirque", "Cirque",
+        "Clown", "Pyrotechnie", "Magie nouvelle", "Cirque traditionnel", "Mime", "Du cirque",
+        "Spectacles équestres", "Arts du crique", " arts du clown"
+    ],
+    "Musique et Chant": [
+        "Musique", "Musiques traditionnelles", "Chanson", "Concerts", "Opéra",
+        "Musiques", "Musique ancienne", "Musique médiévale", "Musique et lectures",
+        "Chansons théâtrales", "Blues (rythm'n'blues)", "Comédie musicale",
+        "Jazz et musiques improvisées", "Musique classique", "Musiques arméniennes",
+        "Reggae", "Rock", "Variétés", "Flamenco (musique)", "Musiques du monde",
+        "Musiques amplifiées ou électroniques", "Soul funk", "Concerts pop electro",
+        "Du chant", "Lecture en musique", "Musiques actuelles", "Musiques traditionnelles de provence",
+        " amérique d'avant guerre) des spectacles pour enfants", "Cinéma", "(jazz", " musique savante ",
+        " musique savante ", " Chant", " Bal sévillan", "Concours de chants", "Stage musique danse",
+        "Rencontres autour de la musique", " Chant", " musique savante ", "Art lyrique ", "Hip-hop ", "Rap", " hip-hop ", " hip-hop / rap"
+    ],
+    "Marionnettes et Théâtre d'objets": [
+        "Théâtre d'objet", "Marionnettes", "Théâtre d'objets", "Marionnettes et Théâtre visuel",
+        "Arts de la marionnette", "Marionnettes et théâtre d'objet", "Marionnettes et théâtre d'objets-théâtre d'ombres",
+        "Marionnettes-théâtre d'objets-théâtre d'ombres", "Art du mime et du geste", "Marionettes",
+        "Marionnettes et théâtre d’objet", "Marionnette", "Marionnettes et théâtre d'objets"
+    ],
+    "Spectacles pour Jeune Public": [
+        "Conte", "Jeune Public", "Conte musical", "Arts du conte",
+        "Spectacle pour enfants", "Théâtre jeune public", "Concours de poésie",
+        "Découverte des Amériques pour enfants", "Lecture publique", "De la poésie", " decouverte des ameriques pour enfants"
+    ],
+    "Performance et Arts Visuels": [
+        "Performance", "Arts visuels", "photo", "vidéo", "Exposition",
+        "Cinéma et audiovisuel", "Magie", "Sculptures", "Parité homme-femme",
+        "Pyrotechnie", "Rencontres voyageurs", "Audiovisuel-cinéma", "Ciné-concert",
+        "Lecture publique", "Découverte du patrimoine de l’Occitanie autrement",
+        "Découverte du Japon", "Culture asiatique", "Thème culture franco colombienne", "theme culture franco colombienne", "La création artistique",
+        "L´innovation technologique", "Le recyclage des matériaux", "Le partage des compétences techniques et artistiques",
+        "Performance - installation", "Arts", "Rencontrer sur le theme de l'usage du faux et démocratie"
+    ],
+    "Humour et Café-Théâtre": [
+        "Humour", "Théâtre d'humour/café-théâtre", "Café-Théâtre",
+        "Théâtre d'humour", "Rires et saveurs: soirée dégustation et concert d'exception", " arts du clown"
+    ],
+    "Pluridisciplinaire": [
+        "Pluridisciplinaire", "Pluridisciplinaire culture", "Pluridisciplinaire à dominante spectacle vivant",
+        "Spectacle vivant pluridisciplinaire", "SV hors MUA", "Spectacle vivant",
+        "Dégustation de vin", "Thème du Moyen Âge", "Découverte des Amériques pour enfants",
+        "Terroir", "Performances", "Toutes les disciplines du spectacle vivant",
+        "Conférence", "Solidarités", "Approche de la langue et la culture occitane",
+        "Ateliers ouvertures vers l'autres", "Animaux", "Thème du voyage", "Sur le thème du voyage", "Theme du voyage et les sciences",
+        "Theme amerique", "Le partage des compétences techniques et artistiques et les Droits Culturels dans le contexte géopolitique transfrontalier suivant les méthodologies de l´Écologie Acoustique.","Marché producteur locaux",
+        "Découvrir le patrimoine de l’Occitanie autrement", "Autres (voix d'enfants)", "Animations", "Spectacles", "Et autres…",
+        "Des bonnes tablées", "Representation", "Cultures urbaines ", "Bodégas", "Cultures urbaines ", " "
+    ]
+}
+
+
+# --- Arts visuels, arts numériques ---
+regroupements_arts_visuels = {
+    "Arts numériques et vidéo": [
+        "Numérique", "Arts audiovisuels", "Vidéo", "Video : oeuvres multiples d'artistes",
+         "Installation numérique", "Jeu vidéo", "Jeux vidéos", 
+        "Arts visuels numériques", "Création sur internet", "Vulgarisation", "Formes immersives et interactives", "Art vidéo", "Vidéos d'artistes", "Oeuvres XR (réalité virtuelle et réalité augmentée)", "Arts numériques", "Arts visuels (arts multimédia) ; création contemporaine ; numérique"
+    ],
+
+    "Arts plastiques et visuels": [
+        "Arts plastiques", "Art plastique", "Sculptures", "Sculpture", "Peinture", "Arts plastiques et visuels",
+        "Expositions", "Arts visuels", "Gravure", "Gravures", "Estampes", "Dessin", "Graphisme",
+        "Calligraphie et Patrimoine Ecrit", "Art contemporain en général (peinture",
+        "Art contemporain au sens large", "Art contemporain et patrimoine", "Expositions d'art contemporain", "Exposition de clocher en clocher", "Art contemporain", "Arts graphiques", "Typographie", "Autres (estampe)", "Céramique", "Vitrail", "Création contemporaine", "Installations artistiques", "Exposition d'art contemporain dans des sites naturels", 
+        "Art contemporain en général (peinture, sculpture,...)"
+    ],
+    
+    "Design et architecture": [
+        "Design", "Architecture", "Design graphique", "Paysagisme",
+        "Mode et design", "Biennale d'architecture et d'urbanisme", 
+        "Festival d'architecture", "Festival des Architectures vives", "Paris Design Week", "Festival international de design - design parade Hyères", "Design textile", "Autres : Design", "Autres (textile)", "Art textile",
+
+    ],
+
+    "Arts urbains": [
+        "Arts urbains", "Street art", "Graff", 
+        "Expériences urbaines", "Arts de la rue", "Graffiti", "Art dans l'espace public",
+        "Art en plein air", "In situ", "Bien Urbain, art dans (et avec) l'espace public", "Arts visuel / Art dans l'espace public / Street Art", "Land art", "Parcours Land Art"
+    ],
+
+    "Performance et multimédia": [
+        "Performance", "Performances", "Installation", "Installations", "Performances multimédias",
+        "Ateliers avec les habitants de la ville", "Performances et spectacles hybrides contemporains entre corps et son",
+        "Démonstrations", "Rencontres", "Animations diverses", "Performance costume", 
+"Performance costume", "Performances multimédias", "Performance - installation", "danse", 'arts de la scène', "Art contemporain ; performance - installation"
+    ],
+
+    "Musique et arts sonores": [
+        "Musique", "Art sonore et nouvelle musique", "Musiques actuelles",
+        "Vinyls", "Nouvelle musique", "Jeune Création", "Street Music", "Arts visuels ; danse ; musique ; théâtre"
+    ],
+
+    "Littérature et illustration": [
+        "Dessin de presse", "Bande dessinée", "Autre (Dessin)",
+        "Calligraphie", "Livres d'artiste", "Salon d'éditions", "Colloque universitaire", "Illustration", "Éditions d'artiste", 'théâtre', 'Théâtre/ danse / musique'
+    ],
+
+    "Photographie, cinéma et audiovisuel": [
+        "Audiovisuel", "Documentaire", "Vidéos d'artistes", "Programmations croisées avec le cinéma",
+        "Cinéma", "Festival d'idées", "Expositions et projections photographie", "Programmations croisées avec le cinéma", "Cinéma et audiovisuel", "Projections documentaires", "Arts visuels (arts multimédia)", "Photographie", "Photo", "Photo exposition à ciel ouvert", "Exposition à ciel ouvert",
+        "Photographies", "Street photography", "Vidéo mapping", "Micro édition", "Expositions de photographie", "Photo Montier", "Festival de Street Photography", "Autres (photographie)", 'photographie cinéma rencontres', "Arts visuels ; musiques actuelles ; photographie"
+    ],
+
+    "Art d’idées et sciences": [
+        "Arts et sciences visionnaires", "Vulgarisation scientifique",
+        "Festival d'idées", "Conférence table ronde thème environnement",
+        "Festival artistique et citoyen qui questionne notre rapport à l’autre",
+        "Sciences et arts", "Exploration des sciences dans les arts"
+    ],
+
+    "Autres": [
+        "Spectacle vivant", "Culture juive", "Festival artistique et citoyen",
+        "Autres : Performances", "Etc.", "Autres (artisans d'art)", "Multiples", "Métiers d'art", "Autres (artisans d'art)", "Autre : Métier d'art de la Céramique",
+"Festival des métiers d'art",   "Divers", "Etc.", "Autres (voix d'enfants)", 
+        "À l’accueil", "À l’étranger", "Au bien-vivre ensemble dans la diversité", "Pluridisciplinaire", "Autre : Performances"
+    ]
+}
+
+
+# --- Cinéma, audiovisuel ---
+regroupements_cinema = {
+    "Cinéma généraliste long métrage": [
+        "Films", "Long métrages", "Documentaires", "Documentaire", "Cinéma d'auteur", "Fictions", "Ciné-concert", "Fiction long métrage", "Film documentaire", "Films de fiction longs métrages (plus d'une heure)",
+        "Fiction longs métrages", "Cinéma", "Généraliste", "Films de comédie Longs métrages", "Longs métrages toutes disciplines",
+        "Film grand public (fil conducteur la provence)", "Fiction long métrage / Documentaire", "Téléfilm", "cinema", "Fiction long métrage Court métrage Documentaire",
+        "Audiovisuel-cinéma", "Fiction long-métrage", "Musique", "danse", "théâtre", "cinéma et audiovisuel", "monde entier fictions docu clips reportages animations films", "Arts visuels",
+        "long métrage", "Longs métrages (Toutes disciplines)", "Non-fiction (documentaire autobiographie essai etc)"
+    ],  
+
+    "Cinéma généraliste court métrage": [
+        "Court métrages", " Court métrage", "Courts-métrages", 
+        "Compétition de courts-métrages", "Jeune public court métrage", "Court métrage francais et international", "court metrage long metrage",
+        "Courts et longs métrages de fiction", "court metrage fantastique", "Court-métrage", 
+        "Compétition de courts-métrages", "concours 48h", "Série courte de fiction & documentaire", "Court metrage par collgiens et lycéens", "Films documentaires courts et moyens métrages"
+    ],
+
+    "Audiovisuel et médias": [
+        "Audiovisuel", "Télévision", "Webséries", "Contenus digitaux", "Streaming", "Vidéos du web", "Webseries", "Jeu vidéo", "web films ou productions télé", "Jeux vidéo", "Clip",
+        "Arts numériques", "Vidéo"
+    ],
+
+    "Festivals thématiques": [
+        "Cinéma de genre", "Cinéma d'horreur", "Cinéma fantastique", "Cinéma LGBTQ+",
+        "Cinéma et environnement", "Cinéma et société", "Cinéma et patrimoine", "Drame", "Romance", "Festival consacré au film d'animation", "Fantastique", "SF", "épouvante", "Indépendant", "Documentaire politique", "Séries",
+        "LGBTI (toutes disciplines)", "Films divers avec pour thématique l'homme et l'animal", "Festival du cinéma hédoniste", 
+        "Toutes", "hybrides…", "cinema documentaire indépendant et engagé", "LGBTQIA+", "Film policier", "thème de l’alimentation UN ÉCO-FESTIVAL", "Films Aventure et Voyage"
+    ],
+
+    "Cinématographies du monde": [
+        "Cinéma européen", "Cinéma asiatique", "Cinéma africain",
+        "Cinéma américain", "Cinéma latino-américain", "Cinémas étrangers", "Cinéma britannique", 
+        "Films en lien avec la région Occitanie", "Fiction long métrage / FESTIVAL DES CINEMAS HISPANO AMERICAIN", "cine suisse", 
+        "Audiovisuel-cinéma ; culture asie-pacifique", "Audiovisuel-cinéma ; culture amériques-caraibes ; culture europe", 
+        "Audiovisuel-cinéma ; culture asie-pacifique"
+    ],
+
+    "Rétrospectives et classiques": [
+        "Cinéma classique", "Hommages", "Films restaurés",
+        "Grands réalisateurs", "Cinéma des années 60", "Cinéma muet", "Rétrospective de carrière", 
+        "Autrs : Films classiques",
+        "films de patrimoine", "Compétition internationale de premières œuvres et rétrospectives",  "FILMS ESSAI", "film d'archives", "patrimoine"
+    ],
+
+    "Techniques et métiers": [
+        "Montage", "Réalisation", "Effets spéciaux", "Scénarisation",
+        "Photographie de cinéma", "Métiers du cinéma", "Casting", "Films d'ateliers", "Atelier de scénario", "Film en cours de fabrication", "Photographie documentaire", "Radio et création sonore",
+        "Films d’étudiants", "d’ateliers et premières oeuvres auto-produites"
+    ],
+
+    "Cinéma et musique": [
+        "Musique de film", "Comédies musicales", "Bande originale",
+        "Ciné-opéra", "Ciné-musique", "Cinéma et musique en plein air", 
+        "Ciné concerts", "Court métrage et musique", 
+        "Autres : ciné-concert/ciné-mix/ciné-spectacle/ciné-bal", "Ciné-Concerts", "Audiovisuel-cinéma ; musique expérimentale", "musique et cinema en plein air",
+        "Musiques du monde ; musique traditionnelle", "cine-concert"
+    ],
+
+    "Cinéma expérimental et arts associés": [
+        "Cinéma expérimental", "Vidéos d'artistes", "Art vidéo",
+        "Performances visuelles", "Cinéma immersif", "Installation vidéo", "Film expérimental", "Films d'écoles de cinéma", "Cinéma VR", 
+        "Expérimental", "Expérimental /web/ photo", "Cinéma expérimental et image en mouvement", "arts numériques + VR", "film expérimental - ciné concert -", "Art vidéo et performance",
+        "Film expérimental (court et long métrage)", "film d'artiste.", "cinéma documentaire indépendant et engagé", "Courts et longs métrages expérimentaux", "Séries; Expérimental..."
+    ],  
+        
+    "Jeunes publics": [
+        "Cinéma jeune public", "Films pour enfants", "Films d'animation", "Film d'animation", "Animation",
+        "Ciné-contes", "Jeune public", "Films scolaires et universitaires", "Court metrage par collgiens et lycéens"
+        "Principe d'éducation à l'image: des enfants apprennent à créer des films courts à destination d'autres enfants.", "Enfance et jeunesse", "Jeune public (CM, animation, fiction)", 
+        "Ateliers pour enfants", "VR et jeune public", "Film scolaire et universitaire", "Film d'animatoin", "Principe d'éducation à l'image: des enfants apprennent à créer des films courts à destination d'autres enfants.",
+        "Jeunes publics"
+    ],
+
+    "Événements et projections spéciales": [
+        "cinéma et gastronomie", "Avant-premières", "Rencontres avec les réalisateurs", "Projections en plein air",
+        "Tables rondes", "Ciné-débats", "Projections spéciales", "Fiction long métrage; Court métrage", "Films muets du patrimoine et piano", "Concours Films et Images sous-marines", "avants-premières uniquement","coups de coeur", 
+        "Films libres de critique sociale", "Périples & cie", "cinema et spectacle", "VR", "Premiers films", "concours photo"
+    ]
+}
+
+
+# --- Livre, littérature ---
+regroupements_livre_litterature = {
+    "Romans et Littérature Générale": [
+        "Romans", "Littérature", "Essais", "Biographies", "Autobiographies", 
+        "Poésie", "Recueils", "Nouvelles", "Textes littéraires", "essai", " autobiographie", "Littérature générale", "théâtre", "Fiction (roman, théâtre, etc.)", "Fiction", "Conte",
+        "Non-fiction (documentaire, autobiographie, essai, récit, etc.)", "Généraliste", "Littérature et écriture contemporaine", 
+        "Voyage", "Fictions", "Non fiction", "Tout les genres",
+        "Littérature contemporaine", "Rentrée littéraire littérature générale", "Création littéraire",
+"Littérature blanche", "Fictions (romans, théâtre, etc.)",
+        "Fictions (roman, théâtre, etc.) Non-fiction (documentaire, autobiographie, essai, récit, etc.)",    "Actualité littéraire", "Livre ancien",      "Poésie contemporaine", "Oulipo", "Littérature performative",
+        "Littérature langue française", "Rentrée littéraire littérature generale", "Fiction (romans théâtre etc)", "Fiction (roman, théâtre, etc.) Non-fiction (documentaire, autobiographie, essai, récit, etc.)",
+        "Tous genres littéraires", "Ecritures contemporaines pour le théâtre", "Non-fiction", "Littérature langue étrangère ; Littérature langue française", "Pas de genre définie",
+        "Écritures contemporaines", "new romance", "Autre", "Autres", "autres", "Autre : Poésie contemporaine", "Conte ; non-fiction", "non-fiction", "Montagne aventures"
+
+    ],
+    "Bandes Dessinées et Illustrations": [
+        "Bandes dessinées", "Mangas", "Comics", "Illustrations", "Graphic novels", 
+        "Dessins de presse", "Albums illustrés", "manga", " Bande dessinée", "Bande-dessinée", "Livre d'artistes", "livre d'art", "livres d'artistes",
+        "micro-édition et images imprimées", "animé", "Bande dessiné", "Bande déssinée", "BD et livres jeunesse", "Rencontres du 9e art", "Zébuli salon de illustration et BD jeunesse", "Art lyrique ; bandes dessinées", "Manga et culture asiatique",         "Livre d’artiste et image imprimée",     
+        "Livre d'artiste", "Bande dessinée & arts associés" 
+
+    ],
+    "Jeunesse et Jeune Public": [
+        "Littérature jeunesse", "Contes", "Livres pour enfants", "Histoires pour jeunes", 
+        "Albums jeunesse", "Contes musicaux", "Ciné-contes", "Jeunesse", " jeunesse", "Littérature exclusivement jeunesse", "Jeune public", "Littérature jeunesse en général", "Albums et illustrations jeunesse",
+        "Littérature jeunesse - petite enfance", "Album jeunesse", "Enfance jeunesse",
+        "Petite enfance", "Raconte bébés", "Festival jeune public et famille", "littérature générale et littérature jeunesse", "littérature très petite enfance",
+        "Albums et illustratilns jeunesse", "jeunesse ; environnement"
+
+    ],
+    "Policier et Thriller": [
+        "Littérature policière", "Thrillers", "Romans noirs", "Mystères", "Enquêtes", "Polar", "Policier"
+    ],
+    "Science-Fiction et Fantasy": [
+        "Science-fiction", "Fantasy", "Fantastique", "Sagas", "Univers imaginaires", 
+        "Épopées", "Steampunk", "Imaginaire",     "Science fiction", "SF", "Épouvante"
+    ],
+    "Littératures régionales et du Monde": [
+        "Littérature étrangère", "Littératures européennes", "Littératures asiatiques", 
+        "Littératures africaines", "Littératures américaines", "Traditions orales", "littérature régionale", "Littérature-monde", "Russophonie et francophonie", "Carnet et littérature de voyage", "Histoire - mer - aventures etc", "Récits de voyage",
+        "Animations autour de la langue gallèse"
+
+    ],
+    "Édition et Métiers du Livre": [
+        "Édition", "Auto-édition", "Librairies", "Ateliers d'écriture", 
+        "Typographie", "Illustrations éditoriales", "Métiers du livre", "Livres d'artistes / Petite édition", "Éditions d'art, livres d'artistes"
+
+    ],
+    "Conférences et Rencontres Littéraires": [
+        "Rencontres avec auteurs", "Lectures publiques", "Conférences", "Ateliers littéraires", 
+        "Échanges littéraires", "Tables rondes", "Dédicaces", "Eloquence", "lecture", "Lecture à voix haute", "Traduction littéraire", "littérature de critique sociale",
+        "philosophie", "lecture à voix haute", "salon du livre", "Expositions", "Rencontres", "Salon de rencontre des auteurs de théâtre et cinéma", "Rencontres littéraires",         "Lectures", "Lectures musicales", "Performances",
+        "Le festival propose aussi des lectures", "débats et ateliers", "scène", "ateliers", "Jeux de rôle", "jeux de plateaux", "ateliers", "bibliophilie"
+    ],
+
+    "Histoire et Patrimoine Littéraire": [
+        "Archives", "Histoire du livre", "Manuscrits", "Bibliothèques historiques", 
+        "Littératures classiques", "Récits historiques", "Textes anciens", "Livre ancien", "Histoire", "Histoire et patrimoine", "Histoire et sciences humaines", "historique"
+    ],
+
+    "Pluridisciplinaire : arts et littératures croisés ": [
+        "Pluridisciplinaire", "Livre et arts visuels", "Livres et vin", "Art lyrique ; bandes dessinées ; musique savante ; audiovisuels", "Art",         "Art lyrique ; musique savante", "Musique", "Art lyrique ; musiques actuelles ; théâtre",
+        "Art lyrique ; danse modern jazz ; jazz et musiques improvisées ; musique savante ; théâtre",
+    "Art lyrique ; jazz ; musique savante ; musiques de films", "Livre et vin"
+        "Art lyrique ; jazz ; jazz et musiques improvisées ; musique classique", "Art lyrique ; jazz ; jazz et musiques improvisées ; musique (d'harmonie) ; musique classique ; musique savante ; musiques traditionnelles", "Tous genres littéraires et animations dépendant de la thématique",         "Littérature scientifique", "Sciences humaines", "Sociales", "Lettres", "Sciences fondamentales", "Développement personnel", "Bien-être", "Pas de sous-catégorie", "Toutes thématiques",
+        "Pas de sous catégorie", "Art lyrique ; danse modern' jazz ; jazz et musiques improvisées ; musique savante ; théâtre", "livre audio", "Littératures et Pratiques Culturelles",
+        "Art lyrique (du congo) ; audiovisuel-cinéma (musiques innovatrices) ; danse contemporaine ; musique (musiques innovatrices) ; musique expérimentale ; musiques actuelles (musiques innovatrices) ; pop (hybride alchimérique) ; rock (avant-garde) ; slam / spoken word ; techno (cosmique) ; théâtre",
+        "Livre et vin", "de mettre en avant les liens étroits et riches qu’entretiennent musique et littérature.", "films", "Art lyrique ;", "spectacles", "jeux", "Culture"
+    
+]
+}
+
+
+# --- Musique ---
+regroupements_musique = {
+    "Musique classique et opéra": [
+        "Musique classique", "Opéra", "Musique baroque", "Musique romantique", "Concerts symphoniques", 
+        "Chanson ou variété française", "Musiques classiques et savantes", "Musique savante", 
+        "Art lyrique", "Musiques classiques", "Musiques anciennes", "Musique chorale classique et contemporaine",
+        "Musique sacrée", "Musiques baroques", "Musiques classiques avec voix", "Chant choral", 
+        "Musiques classiques et contemporaines", "Opéras et concerts lyriques", 
+        "Classique revisité", "Art vocal", "Musique ancienne", "classique", "Classique", "Musique ancienne", "Opérettes", "Variétés (folklores du monde)", 
+        "Savantes", "Concerts classique gospel", "Musique sacrée et profane", "Musique savante occidentale", "Gospel/spiritual", "gospel/spiritual ", "Chœurs", "Chœurs d'enfants", "Musique sacrée et chants baroques", 
+       "Gospel", "Art choral", " opéras", "musique classique (folklores du monde) ", " chants gospels", 'Opérette', "Voix lyrique",
+       "11- Musique classique", "lyrique", "Art lyrique ; musique ; musique classique ; musiques actuelles", "Musique baroque ; Musique classique", "Musique classique ; musique savante ; théâtre",
+       "Musique classique, Musique contemporaine, Musiques traditionnelles, Opéra", "11- Musique classique, lyrique, contemporaine, autres", "ensembles classiques / jazz / baroques",
+       "Musique Lyrique", "Musique sacree", "Musiques et chants baroques et/ou sacrés", "Chant - Gospel", "Danse Classique", "Musiques classiques et jazz", "baroque", "Musiques de répertoire et de création", "Harmonies", "gospel et compositeurs contemporains également proposés au public", "Musiques sacrées et profanes", "operette et comédie musicale américaine", "Orgues / Musique classique",
+        "Musique de répertoire", "Musiques lyriques", "Musiques et lyrique", "Musique savante (musique ancienne, classique, contemporaine autour de l'orgue)", "ensemble vocal a cappella international", "Chant lyrique", "Musiques classiques piano", "classiques et romantiques mais on entend aussi des arrangements de classiques du rock", "baroques et contemporaines", "Musiques classiques / Jazz",
+        "musique de traverse"
+
+
+    ],
+
+    "Musiques actuelles et populaires": [
+        "Pop", "Hip-hop", "Rap", "Chanson française", "Musique contemporaine", "Musique expérimentale", 
+        "Musiques actuelles", "slam", "07- Musiques actuelles sans distinction", 
+        "09- Pluridisciplinaire", "01- Chanson", "08- Musiques (sans distinction esthétique)", 
+        "Musiques actuelles sans distinction", "Musique",  "Dub", "Ska", 
+         "Funk", "Variété française", "Chanson", "Musiques contemporaines", "Terme générique : musiques actuelles",
+        "Cultures hip-hop et urbaines", "Musique contemporaine/expérimentale", "Pluridisciplinaire", "Autres Musiques", "Expérimentales", 
+        "Improvisation", "Musiques improvisées", "Chanson et poésie francophones", "Musique contemporaine et création sonore", "Tous genres confondus",
+        "Chansons",  "Chansons festives", "Chanson ou variété française Musiques du monde Pop", "musiques", "Musique pluridisciplinaire", "chant",
+        "Musique actuelle", "Variétés", "Hip hop",  "Musiques diverses", "Musiquse actuelles",  "Musiques diversifiées", "Impro libre", "Musiques (sans distinction esthétique)",
+        "Musique actuelles", "Musiques inclassables", "contemporaine", "contemporaines", "Chanson ou variétés françaises", "hip-hop / rap", "Hip-hop/rap", "autres",
+        "musiques actuelles (festives, rock, reggae... )", "slam / spoken word", "cultures urbaines", "Toutes les formes musicales", "Autre", "musiques d'aujourd'hui (musique contemporaine)",
+        "répertoires diversifiés - blues - chanson - world - .....", "Musiques actuelles - jazz", "Les Agités du Mélange ont pour essence de mélanger les genre justement", "mélange de plusieurs genres", "Pluridisciplinaire culture", "Eclectique", "Musiques actuelles (blues, rock alternatif & indépendant)", "Musiques actuelles d'influence traditionnelle", "chansons", "Musique pluridisciplinaire"
+
+
+        
+    ],    
+
+    "Musiques du monde": [
+        "Musique africaine", "Musique asiatique", "Musique latine", "Musique celtique",
+        "Musique méditerranéenne", "Musique des Caraïbes", "Musiques traditionnelles", 
+        "Musiques du monde", "Variétés internationales", "04- Musiques traditionnelles et du monde", 
+        "Musiques des Balkans", "Musiques tziganes", "Flamenco", "Chants basques", 
+        "Musiques traditionnelles et du monde", "Musiques slaves", "Musiques méditerranéennes", "Musique du monde", "Culture hispanique et latino-américaine", "Musique world music", 
+        "Chant traditionnel", "Musiques du Monde et Trad", "Thème culture hispanique", 
+        "Musique du mondes", "Musiques du monde (berbère)", "Jazz (folklores du monde)", 
+        "Soul/funk (folklores du monde)", "Musiques traditionnelles (folklores du monde)", "Musique traditionnelle régionale",
+        "Thème culture hispanique", 
+        "Musiques afro-caribéennes", "Musiques créoles", "Musique tzigane", "Chants traditionnels d'Afrique", "Variété internationale", " musique (folklores du monde) ",
+        "traditions catalanes", "culture Amériques-Caraïbes", "Gypsy", "Musiques du monde ; musiques traditionnelles", "chansons hispaniques et catalanes",
+        "Concert autour du Tango Argentin", "du monde", "Tango", "Autour de la culture créole", "Afrobeat", "musique brésilienne", "flamenco (musique)", "gypsie", "musiques traditionnelles afrique sub-sahariennes", "musiques traditionnelles amérique latine", "swing funk afro caribeene", "musiques traditionnelles d'irlande", "jazz et de musiques du monde", "du spectacle et du patrimoine Tsigane", "musique brésilienne", "Musique cubaine", "Musiques traditionnelles de corse", "musiques traditionnelles amérique latine", "musiques traditionnelles europe centrale et est", "musiques traditionnelles du kurdistan", "musique du monde et jazz",
+        "Percussions du monde", "bals latinos", "zumba", "Culture trans-territoriale", "Musique du minde", "du jazz ou de compositeurs cubains et latino-américains.", "Musique Afro américaine", "afro"
+
+
+    ],
+
+    "Jazz, blues, RnB": [
+        "Jazz", "Blues", "Swing", "Bossa nova", "RnB", "R'n'B", "03- Jazz", 
+        "Jazz manouche", "Latin jazz", "Jazz et musiques improvisées", "Blues et musiques improvisées", "Reggae", "Reggae / Dub / Ska / Soul / Funk / World",
+        "Rockabilly - Country - R'n'R - Rhythm & Blues",  "Reggae", "Jazz Blues", "Jazz et classique", "Jazz et musiques du monde",
+        "Musique Jazz", "Musique afro jazz", "Reggae / Dub / Ska / Soul / Funk  / World", "Reggae / Dub", "Jazz caribéen", "Jazz et vin",
+        "Chanson française jazz", "Jazz / musiques improvisées", 
+        "Jazz européen et américain", "Musiques afrobeat et jazz", "soul", "03- Jazz, blues et musiques improvisées", "Jazz, blues", "chanson francaise jazz", "jazz et contemporain",
+        "soul/funk", "jazz chanson musique du monde danse", "concert jazz", "Musiques classiques et jazz", "Musiques actuelles - jazz", "jazz et de musiques du monde", "Musiques Cajun - Zydeco - Swamp Pop", "swing/middle jazz", "musique du monde et jazz",
+        "rock Jazz", "du jazz ou de compositeurs cubains et latino-américains.", "Musiques classiques / Jazz", "ragga"
+
+
+
+    ],
+
+
+    "Musique rock et métal": [
+        "Rock", "Indie", "Hard rock", "Métal", "Rock progressif", "Garage Rock", "Punk", "Rock pop Electro", "Rock progressif", "Rockabilly", 
+         "Electro / rock", "Punk-rock", "Rock festif", "Heavy Metal", 
+        "Jazz-rock", "Metal (néo classique)", "Rock pop électro", "Metal",   "Punk rock",  "Post-rock", "Math-rock", "Punk rock", "Hardcore punk",
+        "rock et rock progressif", " rock (folklores du monde) ", "Punk...", "Rock Country", "Hardcore", "rock pop", "rock celtique", "Folk-rock",
+        "Musiques indépendantes (pop - rock - punk - garage - électro)", "hardcore", "pop/rock en orchestre symphonique", "rock Jazz'", "Fusion", "musique (fusion)"
+
+
+    ],
+
+    "Musique instrumentale": [
+        "Guitare acoustique", "Piano", "Musique de chambre", "Orchestrations", 
+        "Orgue", "Trompette et orgue", "Concerts avec piano ou claviers", "Concours de piano", "Guitare", "Ensembles de tambours", "Fifres et tambours", "Fifres et percussions", 
+        "Batterie-Fanfare", "Fanfare", "Cuivres et percussions", "Orchestres d'harmonie", "Musique acousmatique / electroacoustique / concrète", "Improvisés",
+         "Violon", "Orgue", "Les cuivres sous toutes leurs formes : harmonies", "FANFARES de divers styles", "fanfares", "tout type musical mais uniquement en composition",
+         "tous concerts avec piano ou claviers", "cuivres", "Brass band", "Cuivres", "Mlusique d'orgue","Percussions du monde", "Musiques classiques piano", "Musiques acoustiques", "percussions", "accordéon"
+
+
+
+    ],
+
+
+    "Musique et festivals thématiques": [
+        "Ciné-concerts", "Festivals de musique", "Concerts en plein air", 
+        "Comédies musicales", "Performances musicales", "Musique et littérature", 
+        "Théâtre musical", "Comédie musicale", "Concerts autour du Tango Argentin", "Spectacle vivant", "Danse", "Arts de la rue", "Musique et sport outdoor",
+        "Moto concert rock parties de poker", 
+        "Bons fromages et bonne musique (rock)", "Une soirée", "Humour", "Et 1 journée dédiée aux Arts de la Rue", 
+        "Théâtre", "Performance", "Exposition", "Art", "Fête de la ville", "Feria", "Fête votive", "Fête de la pomme",  
+        "Spectacles multiculturels culture africaine", "Musique indépendante", "Théâtre baroque", 
+        "Musique/Spectacle vivant/Littérature/Arts visuels", "Musiques actuelles/stand up", "Musique indépendante", "Alternative", "Improvisation théâtrale", "Arts visuels",
+        "Humour et musique", "Musique Cinéma", "Festival International de Piano", "Spectacles multiculturels culture africaine",
+        "motos", "poker", "fetes nocturnes", "Littérature", "performance - installation", "14- Autres disciplines culturelles (arts plastiques, cinéma, photographie, livre...)",
+        "13- Autres spectacles (théâtre, arts de la rue et du cirque...)", "05- Humour", "10- Comédie musicale",
+        "15- Fête de la ville", "1 altitude 1 ambiance musicale (soit 3 ambiances différentes)", "musique de rue", "théâtre d'humour/café-théâtre", "lecture publique (théâtre)", "danse et chants", "parité homme-femme",
+        "experimentales", "Musique de création", "degustation de vin et jazz", "Autres spectacles (théâtre, arts de la rue et du cirque...)", "expérimentale", "cirque", "arts de rue", "bals", "Spectacle danse", "concours de guitare theme l'espagne", "Musiques de films", "musiques de création / musiques expérimentales (déjà, votre enquête fait l'impasse sur un secteur/une filière...)", "théatre et musique", "Musiques improvisées et expérimentales", "cinéma", "Festival pluridisciplinaire : arts visuels", "pour la cause aninal humour et musique",
+        "Musiques vivantes", "ciné-concert", "spectacle déambulatoire", "théâtre de rue", "danses", "repas gascons", "concerts gratuits", "ateliers de création", "jeux", "animation musicales",
+        "chants", "expositions", "stages de danses .", "THEATRE MUSICAL", "Danse et musique", "féministe et citoyen", "Carnaval", "chorégraphies et contes", "soirée danse", "voix", "impros"
+
+
+    ],
+
+    "Musiques électroniques": [
+        "Techno", "House", "Ambient", "EDM", "Minimal", "Trance", "Musiques amplifiées ou électroniques", 
+        "Musiques électroniques", "Musique électronique", "02- Musiques amplifiées ou électroniques", 
+        "Electroacoustique", "Musiques électroniques et hip-hop", "Electro", "Pop électro", "Sound System Dub", "Musique contemporaine/électroniques/indépendantes",
+        "Musique électroacoustique", "Dub...", "Musiques expérimentales",
+        "Electroniques", "Musiques électroniques ; numérique", "Musiques actuelles ; musiques électroniques", "musique contemporaine/électoniques/indépendantes", "Trip Hop", "trip hop", "Musiques actuelles et électroniques", "natural trance"
+
+    ],
+
+    "Musique pour jeunes publics": [
+        "Chansons pour enfants", "Concerts pédagogiques", "Spectacles musicaux pour jeunes publics", 
+        "Musique pour jeunes publics", "Jeune public", "Rock pour enfants", "Jeune Public musiques actuelles", "musiques et spectacles à destination du jeune public",
+        "spectacle pour enfants", "marionnettes"
+
+
+    ],
+
+    "Musiques folk et patrimoniales": [
+        "Musique médiévale", "Musique de la Renaissance", "Musique traditionnelle régionale", 
+        "Folk", "Musique acoustique", "Chants traditionnels", "Ballades", 
+        "Musiques anciennes", "Musique traditionnelle", "Musiques traditionnelles et du monde", "Bluegrass", "Old-Time", "Cajun", "Musiques traditionnelles fusion", 
+        "Musique celtique et d'Occitanie", "Traditions", "Gospel et Polyphonies", "Musique anciennes", "Musiques sacrées", "Musiques sacrees", "LE SÉNÉGAL SA MUSIQUE",
+        "SES DANSES", "SA CULTURE", "Musique Country", "Chanson (folk)", "Country", "Country music", "musiques traditionelles",  "Oldtime", "pagan folk", "Folk-rock", "Musiques traditionnelles de France",
+        "musique improvisée / folklore imaginaire", "Danses traditionnelles", "Culture trans-territoriale", "fête traditionnelle de gascogne - bal - musique et danse"
+
+
+    ]
+}
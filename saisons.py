@@ -0,0 +1,112 @@
+"""
+Test de compatibilité entre les dates d'un utilisateur et la période des festivals.
+
+Les trois périodes de "Période principale de déroulement du festival" sont
+converties une fois en intervalles de jours de l'année, puis en masques de bits
+(un bit par jour d'une année bissextile, comme l'année 2024 du notebook). Les dates
+de l'utilisateur sont converties une seule fois en un masque du même type ; les
+saisons compatibles sont celles dont le masque a un bit commun avec lui, et le
+filtre sur toute la base se réduit à une lecture dans une table, indexée par la
+colonne "Code période" du snapshot.
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+COLONNE_PERIODE = "Période principale de déroulement du festival"
+
+# Correspondance entre les saisons et les plages de dates (mois et jours uniquement)
+SAISONS = {
+    "Avant-saison (1er janvier - 20 juin)": ("01-01", "06-20"),
+    "Saison (21 juin - 5 septembre)": ("06-21", "09-05"),
+    "Après-saison (6 septembre - 31 décembre)": ("09-06", "12-31"),
+}
+
+# Année de référence bissextile : le 29 février a sa place
+ANNEE_REFERENCE = 2024
+NB_JOURS = 366
+
+
+def jour_annee(mois, jour):
+    """
+    Numéro du jour (0 à 365) du jour/mois donné dans l'année de référence.
+    """
+    return date(ANNEE_REFERENCE, mois, jour).timetuple().tm_yday - 1
+
+
+def en_date(valeur):
+    """
+    Convertit une date de user_data ("AAAA-MM-JJ", date ou Timestamp) en datetime.date.
+    """
+    if isinstance(valeur, str):
+        try:
+            return date.fromisoformat(valeur)
+        except ValueError:
+            pass
+    return pd.Timestamp(valeur).date()
+
+
+def masque_jours(debut, fin):
+    """
+    Masque des jours debut à fin inclus (numéros de jour de l'année).
+
+    Si fin précède debut, l'intervalle passe par le nouvel an (ex. 15 décembre - 10 janvier).
+    """
+    if debut <= fin:
+        return ((1 << (fin - debut + 1)) - 1) << debut
+    return masque_jours(debut, NB_JOURS - 1) | masque_jours(0, fin)
+
+
+# Intervalles de jours et masques des saisons, dans l'ordre de SAISONS
+INTERVALLES_SAISONS = [
+    tuple(jour_annee(*map(int, mois_jour.split("-"))) for mois_jour in bornes) for bornes in SAISONS.values()
+]
+MASQUES_SAISONS = [masque_jours(debut, fin) for debut, fin in INTERVALLES_SAISONS]
+
+
+def masque_dates_utilisateur(dates):
+    """
+    Masque des jours couverts par les dates [début, fin] de l'utilisateur, en ignorant l'année.
+    """
+    debut, fin = en_date(dates[0]), en_date(dates[1])
+    if (fin - debut).days >= 365:
+        return masque_jours(0, NB_JOURS - 1)  # Au moins une année entière
+    return masque_jours(jour_annee(debut.month, debut.day), jour_annee(fin.month, fin.day))
+
+
+def saisons_compatibles(dates):
+    """
+    Table booléenne des saisons (dans l'ordre de SAISONS) qui ont au moins un jour
+    en commun avec les dates de l'utilisateur.
+
+    Une case de plus en fin de table, toujours False, pour le code -1 (période inconnue).
+    """
+    masque = masque_dates_utilisateur(dates)
+    return np.array([(masque & masque_saison) != 0 for masque_saison in MASQUES_SAISONS] + [False])
+
+
+def codes_periodes(valeurs):
+    """
+    Convertit les valeurs de "Période principale de déroulement du festival" en codes
+    int8 (position dans SAISONS, -1 si la période n'en fait pas partie).
+    """
+    codes = pd.Categorical(valeurs, categories=list(SAISONS)).codes
+    return codes.astype(np.int8)
+
+
+def ajouter_code_periode(df):
+    """
+    Ajoute à df la colonne int8 "Code période".
+    """
+    df = df.copy()
+    df["Code période"] = codes_periodes(df[COLONNE_PERIODE])
+    return df
+
+
+def filtre_saisons(codes, dates):
+    """
+    Renvoie le masque booléen des festivals dont la période est compatible avec les dates.
+    """
+    return saisons_compatibles(dates)[np.asarray(codes)]
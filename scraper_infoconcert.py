@@ -0,0 +1,351 @@
+"""
+Scraping du classement des festivals les plus consultés sur infoconcert.com et
+des pages de chaque festival (colonne "Lien").
+
+Le notebook scrapping_50_festivals_plus_consultes.ipynb ne lisait qu'une page du
+classement. Ici :
+- les pages suivantes du classement sont suivies (liens rel="next" ou de pagination) ;
+- les pages des festivals sont téléchargées en parallèle (CONCURRENCE requêtes
+  simultanées au plus, REQUETES_PAR_SECONDE au plus, via client_http.py qui réessaie
+  aussi les erreurs 429/5xx) ;
+- chaque page est enregistrée dès son arrivée dans une base SQLite de reprise
+  (cache_festivals/scraping_infoconcert.sqlite) : une exécution interrompue reprend
+  là où elle s'était arrêtée, sans retélécharger les pages déjà lues. Les pages en
+  erreur (réseau, 5xx) sont retentées à l'exécution suivante.
+
+L'adresse du site peut être remplacée par la variable d'environnement
+INFOCONCERT_URL (ou l'option --url), par exemple pour tester hors ligne sur des
+pages enregistrées servies localement :
+    python -m http.server 8000 --directory pages_enregistrees
+    python scraper_infoconcert.py --url http://localhost:8000 --requetes-par-seconde 50
+
+Utilisation :
+    python scraper_infoconcert.py [--sortie festivals_infoconcert.csv] [--concurrence 2]
+        [--requetes-par-seconde 1] [--max-requetes N] [--recommencer]
+ou
+    from scraper_infoconcert import scraper, festivals
+    rapport = scraper()
+    df = festivals()
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from urllib.parse import urldefrag, urljoin
+
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+
+import client_http
+
+INFOCONCERT_URL = os.environ.get("INFOCONCERT_URL", "https://www.infoconcert.com").rstrip("/")
+CHEMIN_CLASSEMENT = "/festival/les-plus-consultes.html"
+
+FICHIER_REPRISE = Path(__file__).resolve().parent / "cache_festivals" / "scraping_infoconcert.sqlite"
+
+# Budget de politesse par défaut (les limites de client_http.py pour infoconcert.com)
+CONCURRENCE = 2
+REQUETES_PAR_SECONDE = 1
+
+# Types de pages et états enregistrés dans la base de reprise
+CLASSEMENT = "classement"
+FESTIVAL = "festival"
+OK = "ok"
+ABSENTE = "absente"  # 404, 410... : pas retentée
+ERREUR = "erreur"    # réseau, 5xx : retentée à l'exécution suivante
+
+
+# ---------------------------------------------------------------------------
+# Analyse des pages
+# ---------------------------------------------------------------------------
+
+def texte(balise):
+    """
+    Texte d'une balise sans les espaces autour, ou None si elle est absente.
+    """
+    return balise.get_text().strip() if balise else None
+
+
+def nettoyer_lieu(lieu):
+    """
+    Lieu sans la mention entre parenthèses de la ligne suivante.
+    """
+    if lieu is None:
+        return None
+    return re.sub(r"\n\(.*?\)", "", lieu).strip()
+
+
+def analyser_classement(html, url):
+    """
+    Festivals d'une page du classement et liens vers les autres pages du classement.
+
+    Renvoie (liste de {"Classement", "Nom", "Lieu", "Lien"}, liste d'URL).
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    festivals, vus = [], set()
+    for ligne in soup.find_all("div", class_="row"):
+        classement = texte(ligne.find("span", class_="top-position-number"))
+        nom_bloc = ligne.find("div", class_="top-line-name")
+        lien = nom_bloc.find("a") if nom_bloc else None
+        nom = texte(lien)
+        if not (classement and nom) or (classement, nom) in vus:
+            continue
+        vus.add((classement, nom))
+        festivals.append({
+            "Classement": classement,
+            "Nom": nom,
+            "Lieu": nettoyer_lieu(texte(ligne.find("div", class_="top-coming-concerts"))),
+            "Lien": urljoin(url, lien["href"]) if lien.get("href") else None,
+        })
+
+    pages = []
+    for balise in soup.select('a[rel~="next"], link[rel~="next"], .pagination a[href]'):
+        if balise.get("href"):
+            page = urldefrag(urljoin(url, balise["href"]))[0]
+            if page != url and page not in pages:
+                pages.append(page)
+    return festivals, pages
+
+
+def evenements_json_ld(soup):
+    """
+    Objets schema.org de type *Event des balises <script type="application/ld+json">.
+    """
+    evenements = []
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            donnees = json.loads(script.string or "")
+        except json.JSONDecodeError:
+            continue
+        a_voir = donnees if isinstance(donnees, list) else [donnees]
+        while a_voir:
+            objet = a_voir.pop()
+            if isinstance(objet, dict):
+                if str(objet.get("@type", "")).endswith("Event"):
+                    evenements.append(objet)
+                a_voir.extend(objet.get("@graph", []))
+            elif isinstance(objet, list):
+                a_voir.extend(objet)
+    return evenements
+
+
+def analyser_festival(html, url):
+    """
+    Dates et lieu d'un festival depuis sa page : données schema.org (JSON-LD) des
+    concerts si la page en a, sinon les balises <time datetime>.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    evenements = evenements_json_ld(soup)
+    if evenements:
+        dates = sorted(str(e["startDate"])[:10] for e in evenements if e.get("startDate"))
+        fins = sorted(str(e.get("endDate") or e["startDate"])[:10] for e in evenements if e.get("startDate"))
+        lieu = evenements[0].get("location") or {}
+        lieu = lieu[0] if isinstance(lieu, list) and lieu else lieu
+        adresse = lieu.get("address") if isinstance(lieu, dict) else None
+        salle = lieu.get("name") if isinstance(lieu, dict) else None
+        ville = adresse.get("addressLocality") if isinstance(adresse, dict) else None
+    else:
+        dates = fins = sorted(t["datetime"][:10] for t in soup.find_all("time", datetime=True))
+        salle = ville = None
+    return {
+        "Lien": url,
+        "Titre page": texte(soup.find("h1")),
+        "Date début": dates[0] if dates else None,
+        "Date fin": fins[-1] if fins else None,
+        "Nombre de dates": len(dates),
+        "Salle": salle,
+        "Ville": ville,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Base de reprise
+# ---------------------------------------------------------------------------
+
+class Reprise:
+    """
+    Pages déjà traitées (URL, type, état, données extraites), enregistrées une par une
+    dans une base SQLite.
+    """
+
+    def __init__(self, chemin=FICHIER_REPRISE):
+        Path(chemin).parent.mkdir(parents=True, exist_ok=True)
+        self.connexion = sqlite3.connect(str(chemin))
+        self.connexion.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, type TEXT, etat TEXT, statut INTEGER, donnees TEXT, date REAL)"
+        )
+        self.connexion.commit()
+
+    def fermer(self):
+        self.connexion.close()
+
+    def vider(self):
+        with self.connexion:
+            self.connexion.execute("DELETE FROM pages")
+
+    def enregistrer(self, url, type_page, etat, statut, donnees):
+        with self.connexion:
+            self.connexion.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (url, type_page, etat, statut, json.dumps(donnees, ensure_ascii=False), time.time()),
+            )
+
+    def terminees(self):
+        """
+        URL des pages qu'il n'est plus utile de télécharger (lues ou absentes).
+        """
+        return {url for url, in self.connexion.execute("SELECT url FROM pages WHERE etat != ?", (ERREUR,))}
+
+    def donnees(self, type_page):
+        """
+        Données extraites des pages lues d'un type, dans l'ordre d'enregistrement.
+        """
+        lignes = self.connexion.execute(
+            "SELECT url, donnees FROM pages WHERE type = ? AND etat = ? ORDER BY date", (type_page, OK)
+        )
+        return [(url, json.loads(donnees)) for url, donnees in lignes]
+
+
+# ---------------------------------------------------------------------------
+# Téléchargement
+# ---------------------------------------------------------------------------
+
+def traiter(url, type_page):
+    """
+    Télécharge et analyse une page (dans un thread du pool).
+
+    Renvoie (état, statut HTTP, données extraites).
+    """
+    try:
+        reponse = client_http.get(url)
+    except requests.RequestException as erreur:
+        return ERREUR, None, {"erreur": str(erreur)}
+    if reponse.status_code >= 500 or reponse.status_code == 429:
+        return ERREUR, reponse.status_code, {}
+    if reponse.status_code >= 400:
+        return ABSENTE, reponse.status_code, {}
+    if type_page == CLASSEMENT:
+        festivals, pages = analyser_classement(reponse.text, url)
+        return OK, reponse.status_code, {"festivals": festivals, "pages": pages}
+    return OK, reponse.status_code, analyser_festival(reponse.text, url)
+
+
+def suites(type_page, donnees, suivre_liens=True):
+    """
+    Pages à télécharger découvertes sur une page du classement.
+    """
+    if type_page != CLASSEMENT:
+        return []
+    nouvelles = [(page, CLASSEMENT) for page in donnees["pages"]]
+    if suivre_liens:
+        nouvelles += [(festival["Lien"], FESTIVAL) for festival in donnees["festivals"] if festival["Lien"]]
+    return nouvelles
+
+
+def scraper(url_depart=None, fichier_reprise=FICHIER_REPRISE, concurrence=CONCURRENCE,
+            requetes_par_seconde=REQUETES_PAR_SECONDE, max_requetes=None, suivre_liens=True, recommencer=False):
+    """
+    Télécharge le classement à partir de url_depart (toutes ses pages) et, si
+    suivre_liens, la page de chaque festival, en reprenant l'exécution précédente.
+
+    concurrence et requetes_par_seconde bornent les requêtes vers le site ;
+    max_requetes borne le nombre de pages téléchargées par cette exécution.
+    Renvoie un rapport (pages téléchargées, déjà faites, en erreur, durée).
+    """
+    url_depart = url_depart or INFOCONCERT_URL + CHEMIN_CLASSEMENT
+    client_http.definir_limites(client_http.hote(url_depart), concurrence, requetes_par_seconde)
+    reprise = Reprise(fichier_reprise)
+    if recommencer:
+        reprise.vider()
+    terminees = reprise.terminees()
+
+    # Reconstituer la liste des pages à voir depuis les pages du classement déjà lues
+    a_voir, vues = deque([(url_depart, CLASSEMENT)]), {url_depart}
+    for _, donnees in reprise.donnees(CLASSEMENT):
+        for url, type_page in suites(CLASSEMENT, donnees, suivre_liens):
+            if url not in vues:
+                vues.add(url)
+                a_voir.append((url, type_page))
+
+    rapport = {"telechargees": 0, "deja_faites": 0, "absentes": 0, "erreurs": 0, "festivals": 0}
+    debut = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrence) as pool:
+        en_cours = {}
+        while a_voir or en_cours:
+            # Garder le pool occupé, dans la limite du budget de requêtes
+            while a_voir and len(en_cours) < 2 * concurrence:
+                url, type_page = a_voir.popleft()
+                if url in terminees:
+                    rapport["deja_faites"] += 1
+                    continue
+                if max_requetes is not None and rapport["telechargees"] + len(en_cours) >= max_requetes:
+                    a_voir.clear()
+                    break
+                en_cours[pool.submit(traiter, url, type_page)] = (url, type_page)
+            if not en_cours:
+                break
+
+            finies, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+            for future in finies:
+                url, type_page = en_cours.pop(future)
+                etat, statut, donnees = future.result()
+                reprise.enregistrer(url, type_page, etat, statut, donnees)
+                rapport["telechargees"] += 1
+                rapport["absentes"] += etat == ABSENTE
+                rapport["erreurs"] += etat == ERREUR
+                if etat != OK:
+                    continue
+                rapport["festivals"] += type_page == FESTIVAL
+                for suite, type_suite in suites(type_page, donnees, suivre_liens):
+                    if suite not in vues:
+                        vues.add(suite)
+                        a_voir.append((suite, type_suite))
+    reprise.fermer()
+    rapport["duree_s"] = round(time.perf_counter() - debut, 2)
+    return rapport
+
+
+def festivals(fichier_reprise=FICHIER_REPRISE):
+    """
+    DataFrame des festivals du classement (colonnes du notebook : Classement, Nom,
+    Lieu, Lien), complété des informations de leur page quand elle a été lue.
+    """
+    reprise = Reprise(fichier_reprise)
+    classement = [festival for _, donnees in reprise.donnees(CLASSEMENT) for festival in donnees["festivals"]]
+    details = [donnees for _, donnees in reprise.donnees(FESTIVAL)]
+    reprise.fermer()
+
+    df = pd.DataFrame(classement, columns=["Classement", "Nom", "Lieu", "Lien"]).drop_duplicates()
+    if details:
+        df = df.merge(pd.DataFrame(details), on="Lien", how="left")
+    df["Classement"] = pd.to_numeric(df["Classement"], errors="coerce")
+    return df.sort_values("Classement", kind="stable").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraping du classement des festivals d'infoconcert.com.")
+    parser.add_argument("--url", default=INFOCONCERT_URL, help="Adresse du site (serveur local pour les tests)")
+    parser.add_argument("--sortie", default="festivals_infoconcert.csv", help="Fichier CSV des festivals")
+    parser.add_argument("--reprise", default=str(FICHIER_REPRISE), help="Base SQLite de reprise")
+    parser.add_argument("--concurrence", type=int, default=CONCURRENCE, help="Requêtes simultanées au plus")
+    parser.add_argument("--requetes-par-seconde", type=float, default=REQUETES_PAR_SECONDE,
+                        help="Requêtes par seconde au plus")
+    parser.add_argument("--max-requetes", type=int, default=None, help="Nombre de pages à télécharger au plus")
+    parser.add_argument("--sans-details", action="store_true", help="Ne pas télécharger les pages des festivals")
+    parser.add_argument("--recommencer", action="store_true", help="Ignorer la base de reprise")
+    args = parser.parse_args()
+
+    rapport = scraper(args.url.rstrip("/") + CHEMIN_CLASSEMENT, args.reprise, args.concurrence,
+                      args.requetes_par_seconde, args.max_requetes, not args.sans_details, args.recommencer)
+    resultat = festivals(args.reprise)
+    resultat.to_csv(args.sortie, index=False, encoding="utf-8")
+    print(rapport)
+    print(f"{len(resultat)} festivals écrits dans {args.sortie}")
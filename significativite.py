@@ -0,0 +1,283 @@
+"""
+Test de permutation (Monte-Carlo) de la concentration de festivals autour des gros
+festivals, pour Stats_impact_gros_fest.ipynb.
+
+Le notebook compare des moyennes brutes (nombre de petits festivals de chaque
+saison autour des gros festivals de chaque saison) à des totaux nationaux, sans
+savoir si les écarts dépassent ce que donnerait le hasard. Ici, l'hypothèse nulle
+est « les gros festivals sont placés comme des festivals quelconques de même saison
+et de même région » : chaque tirage remplace chaque gros festival par un festival
+de la base tiré dans sa strate (saison, région), sans remise dans une même strate,
+et recalcule les statistiques.
+
+Les comptes de voisins de tous les festivals candidats sont calculés une seule fois,
+par lots de festivals proches (un bloc de la grille de l'index spatial des festivals,
+qui ne fournit que les festivals des cellules voisines), répartis entre plusieurs
+processus (parallele.py). Un tirage ne fait plus ensuite qu'une lecture dans ce
+tableau et une moyenne : des dizaines de milliers de tirages prennent quelques
+secondes.
+
+Pour chaque couple (saison des gros festivals, saison des voisins) et chaque rayon,
+le résultat donne la statistique observée avec son intervalle de confiance
+(bootstrap sur les gros festivals), la moyenne et l'intervalle de fluctuation des
+tirages, et la p-valeur bilatérale.
+
+Utilisation :
+    from significativite import tester_concentration
+    resultats = tester_concentration(gros_festivals, df, rayons=[50, 100])
+
+où gros_festivals a les colonnes Latitude, Longitude, "Période principale de
+déroulement du festival", "Région principale de déroulement" et "Nom du festival".
+"""
+
+import numpy as np
+import pandas as pd
+
+from geodistance import TAILLE_LOT_POINTS, compter_paires, haversine_km, paires_dans_rayon
+from impact import TOUTES, positions_exclues, statistiques_anneaux
+from index_spatial import IndexSpatial
+from parallele import TableauxPartages, decouper, executer, nb_processus_par_defaut, tableaux_partages
+from saisons import COLONNE_PERIODE, SAISONS, codes_periodes
+
+REGION = "Région principale de déroulement"
+NOM = "Nom du festival"
+
+NB_TIRAGES = 10000
+NIVEAU_CONFIANCE = 0.95
+
+# Côté (degrés) des blocs de festivals candidats traités ensemble
+PAS_BLOC_DEGRES = 1.0
+
+# Nombre de morceaux de candidats par processus en mode parallèle
+MORCEAUX_PAR_PROCESSUS = 4
+
+# Nombre maximal de cases des tableaux aléatoires d'un paquet de tirages
+TAILLE_PAQUET = 1 << 22
+
+# Index spatial du processus de calcul, reconstruit une fois depuis la mémoire partagée
+_INDEX = {}
+
+
+# --- Comptes de voisins des candidats ---
+
+def ordre_blocs(lat, lon, pas_degres=PAS_BLOC_DEGRES):
+    """
+    Ordre des points qui range ensemble ceux d'un même bloc de pas_degres de côté,
+    et numéro de bloc de chaque point dans cet ordre.
+    """
+    blocs = np.floor(np.asarray(lat) / pas_degres) * 1000 + np.floor(np.asarray(lon) / pas_degres)
+    ordre = np.argsort(blocs, kind="stable")
+    return ordre, blocs[ordre]
+
+
+def comptes_candidats(tableaux, index, positions, rayons, taille_lot=TAILLE_LOT_POINTS):
+    """
+    Comptes cumulés par période (codes de "Code période", la dernière case pour la
+    période inconnue) et par rayon des voisins des festivals positions, chacun sans
+    se compter lui-même.
+
+    positions est trié par bloc (ordre_blocs()) : les distances d'un lot de
+    candidats ne sont calculées que pour les festivals des cellules de l'index
+    qui recouvrent le lot. Renvoie un tableau int64 (len(positions), nb périodes, len(rayons)).
+    """
+    lat, lon, codes = tableaux["lat"], tableaux["lon"], tableaux["codes"]
+    nb_codes = len(SAISONS) + 1
+    comptes = np.zeros((len(positions), nb_codes, len(rayons)), dtype=np.int64)
+    _, blocs = ordre_blocs(lat[positions], lon[positions])
+    debuts = np.flatnonzero(np.r_[True, blocs[1:] != blocs[:-1]])
+    for debut_bloc, fin_bloc in zip(debuts, np.r_[debuts[1:], len(positions)]):
+        for debut in range(debut_bloc, fin_bloc, taille_lot):
+            fin = min(debut + taille_lot, fin_bloc)
+            lot = positions[debut:fin]
+            centre = lat[lot].mean(), lon[lot].mean()
+            etendue = haversine_km(centre[0], centre[1], lat[lot], lon[lot]).max()
+            voisins = index.candidats(centre[0], centre[1], etendue + rayons[-1])
+            lignes, colonnes, distances = paires_dans_rayon(np.c_[lat[lot], lon[lot]], lat[voisins], lon[voisins],
+                                                            rayons[-1], taille_lot=taille_lot, seuils=rayons)
+            voisins = voisins[colonnes]
+            garder = voisins != lot[lignes]
+            codes_voisins = np.where(codes[voisins] >= 0, codes[voisins], len(SAISONS))
+            comptes[debut:fin] = compter_paires(lignes[garder], codes_voisins[garder], distances[garder],
+                                                len(lot), nb_codes, rayons)
+    return comptes
+
+
+def _comptes_morceau(tache):
+    """
+    Tâche d'un processus de calcul : comptes d'une tranche de candidats.
+    """
+    positions, rayons = tache
+    tableaux = tableaux_partages()
+    if "index" not in _INDEX:
+        _INDEX["index"] = IndexSpatial.depuis_tableaux({nom[len("index_"):]: tableau for nom, tableau in tableaux.items()
+                                                        if nom.startswith("index_")})
+    return comptes_candidats(tableaux, _INDEX["index"], positions, rayons)
+
+
+def calculer_comptes_candidats(festivals, positions, rayons, index=None, nb_processus=1):
+    """
+    Comptes de voisins (cf. comptes_candidats()) des festivals positions, avec
+    l'index spatial donné, qui doit indexer exactement festivals (ValueError sinon) ;
+    par défaut, il est construit sur festivals.
+
+    Avec nb_processus > 1, les candidats sont répartis entre plusieurs processus
+    qui partagent les coordonnées et l'index (cf. parallele.py). Renvoie les
+    comptes dans l'ordre de positions.
+    """
+    tableaux = {
+        "lat": festivals["Latitude"].to_numpy(dtype=np.float64),
+        "lon": festivals["Longitude"].to_numpy(dtype=np.float64),
+        "codes": codes_periodes(festivals[COLONNE_PERIODE]),
+    }
+    if index is None:
+        index = IndexSpatial(tableaux["lat"], tableaux["lon"])
+    elif not (np.array_equal(index.lat, tableaux["lat"], equal_nan=True)
+              and np.array_equal(index.lon, tableaux["lon"], equal_nan=True)):
+        # Un index d'une autre table renverrait des positions qui n'y correspondent pas
+        raise ValueError("L'index spatial n'indexe pas les festivals donnés (index=None pour le construire).")
+    positions = np.asarray(positions, dtype=np.int64)
+    ordre, _ = ordre_blocs(tableaux["lat"][positions], tableaux["lon"][positions])
+    triees = positions[ordre]
+
+    if nb_processus <= 1:
+        comptes = comptes_candidats(tableaux, index, triees, rayons)
+    else:
+        morceaux = decouper(np.ones(len(triees)), nb_processus * MORCEAUX_PAR_PROCESSUS)
+        taches = [(triees[debut:fin], rayons) for debut, fin in morceaux]
+        tableaux.update({f"index_{nom}": tableau for nom, tableau in index.tableaux().items()})
+        with TableauxPartages(tableaux) as partages:
+            comptes = np.concatenate(list(executer(_comptes_morceau, taches, partages, nb_processus)))
+
+    resultat = np.empty_like(comptes)
+    resultat[ordre] = comptes
+    return resultat
+
+
+# --- Tirages ---
+
+def tirer_sans_remise(generateur, taille_strate, k, nb_tirages):
+    """
+    nb_tirages tirages de k éléments distincts parmi taille_strate (ou avec remise
+    si la strate est plus petite que k). Renvoie un tableau (nb_tirages, k).
+    """
+    if k == 1 or taille_strate < k:
+        return generateur.integers(taille_strate, size=(nb_tirages, k))
+    paquet = max(TAILLE_PAQUET // taille_strate, 1)
+    return np.concatenate([
+        np.argpartition(generateur.random((min(paquet, nb_tirages - debut), taille_strate)), k - 1, axis=1)[:, :k]
+        for debut in range(0, nb_tirages, paquet)
+    ])
+
+
+def strates(ancres, festivals, candidats):
+    """
+    Pour chaque gros festival, les positions des candidats de même saison et de même
+    région (de même saison seulement si la région n'en a aucun).
+
+    Renvoie {(saison, région): (numéros des gros festivals, positions des candidats)}.
+    """
+    periodes = festivals[COLONNE_PERIODE].to_numpy(dtype=object)[candidats]
+    regions = festivals[REGION].to_numpy(dtype=object)[candidats]
+    groupes = {}
+    for numero, (periode, region) in enumerate(zip(ancres[COLONNE_PERIODE], ancres[REGION])):
+        if periode not in SAISONS:
+            continue
+        pool = candidats[(periodes == periode) & (regions == region)]
+        if len(pool) == 0:
+            region, pool = None, candidats[periodes == periode]
+        groupes.setdefault((periode, region), ([], pool))[0].append(numero)
+    return {cle: (np.array(numeros), pool) for cle, (numeros, pool) in groupes.items()}
+
+
+def tirages(groupes, nb_ancres, nb_tirages, generateur):
+    """
+    Positions tirées (nb_tirages, nb_ancres) : chaque gros festival est remplacé par
+    un candidat de sa strate (-1 pour ceux sans strate).
+    """
+    positions = np.full((nb_tirages, nb_ancres), -1, dtype=np.int64)
+    for numeros, pool in groupes.values():
+        positions[:, numeros] = pool[tirer_sans_remise(generateur, len(pool), len(numeros), nb_tirages)]
+    return positions
+
+
+# --- Test ---
+
+def avec_toutes(comptes):
+    """
+    Ajoute en tête de l'axe des périodes la somme de toutes les périodes (dont la
+    période inconnue, dernière case, retirée ensuite).
+    """
+    return np.concatenate([comptes.sum(axis=-2, keepdims=True), comptes[..., :len(SAISONS), :]], axis=-2)
+
+
+def tester_concentration(ancres, festivals, rayons=(50,), nb_tirages=NB_TIRAGES, niveau=NIVEAU_CONFIANCE,
+                         graine=0, index=None, nb_processus=None):
+    """
+    Test de permutation du nombre moyen de voisins (par saison des voisins) des gros
+    festivals de chaque saison, dans chaque anneau de rayons (disque pour le premier).
+
+    ancres : DataFrame des gros festivals (cf. docstring du module) ; festivals :
+    DataFrame de charger_festivals(), éventuellement filtré, que index doit indexer
+    exactement (par défaut, l'index est construit sur festivals). Les gros festivals
+    eux-mêmes (même nom) ne sont ni comptés ni tirés.
+
+    Renvoie un DataFrame d'une ligne par (Période ancres, Période voisins, Rayon (km))
+    avec les colonnes Gros festivals, Observé, IC bas, IC haut, Attendu,
+    Fluctuation basse, Fluctuation haute et p-valeur.
+    """
+    generateur = np.random.default_rng(graine)
+    nb_processus = nb_processus or nb_processus_par_defaut()
+    rayons = np.unique(np.asarray(rayons, dtype=np.float64))
+    points = ancres[["Latitude", "Longitude"]].to_numpy(dtype=np.float64)
+    periodes_ancres = ancres[COLONNE_PERIODE].to_numpy(dtype=object)
+    nb_ancres = len(ancres)
+
+    # Statistique observée : nombre de voisins dans chaque anneau, par période des voisins
+    exclure = positions_exclues(ancres[NOM], festivals[NOM])
+    stats = statistiques_anneaux(points, festivals, rayons, exclure=exclure)
+    stats = stats[stats["Discipline"] == TOUTES]
+    observes = stats["Nombre anneau"].to_numpy().reshape(nb_ancres, len(SAISONS) + 1, len(rayons))
+
+    # Candidats : festivals situés, de saison connue, hors gros festivals
+    lat = festivals["Latitude"].to_numpy(dtype=np.float64)
+    lon = festivals["Longitude"].to_numpy(dtype=np.float64)
+    valides = ~(np.isnan(lat) | np.isnan(lon)) & (codes_periodes(festivals[COLONNE_PERIODE]) >= 0)
+    valides[[position for exclues in exclure for position in exclues]] = False
+    groupes = strates(ancres, festivals, np.flatnonzero(valides))
+    candidats = np.unique(np.concatenate([pool for _, pool in groupes.values()] or [np.zeros(0, dtype=np.int64)]))
+    comptes = avec_toutes(calculer_comptes_candidats(festivals, candidats, rayons, index, nb_processus))
+    anneaux = np.diff(comptes, axis=2, prepend=0)
+    # Numéro de ligne dans comptes de chaque position de la base
+    lignes = np.full(len(festivals), -1, dtype=np.int64)
+    lignes[candidats] = np.arange(len(candidats))
+    tires = tirages(groupes, nb_ancres, nb_tirages, generateur)
+
+    alpha = (1 - niveau) / 2
+    resultats = []
+    for saison in SAISONS:
+        numeros = np.flatnonzero(periodes_ancres == saison)
+        if len(numeros) == 0:
+            continue
+        # (tirages, périodes des voisins, rayons) et (périodes des voisins, rayons)
+        nuls = anneaux[lignes[tires[:, numeros]]].mean(axis=1)
+        observe = observes[numeros].mean(axis=0)
+        bootstrap = observes[numeros][generateur.integers(len(numeros), size=(nb_tirages, len(numeros)))].mean(axis=1)
+        attendu = nuls.mean(axis=0)
+        extremes = np.abs(nuls - attendu) >= np.abs(observe - attendu) - 1e-12
+        p_valeurs = (1 + extremes.sum(axis=0)) / (1 + nb_tirages)
+        for numero_periode, periode in enumerate([TOUTES, *SAISONS]):
+            for numero_rayon, rayon in enumerate(rayons):
+                resultats.append({
+                    "Période ancres": saison,
+                    "Période voisins": periode,
+                    "Rayon (km)": rayon,
+                    "Gros festivals": len(numeros),
+                    "Observé": observe[numero_periode, numero_rayon],
+                    "IC bas": np.quantile(bootstrap[:, numero_periode, numero_rayon], alpha),
+                    "IC haut": np.quantile(bootstrap[:, numero_periode, numero_rayon], 1 - alpha),
+                    "Attendu": attendu[numero_periode, numero_rayon],
+                    "Fluctuation basse": np.quantile(nuls[:, numero_periode, numero_rayon], alpha),
+                    "Fluctuation haute": np.quantile(nuls[:, numero_periode, numero_rayon], 1 - alpha),
+                    "p-valeur": p_valeurs[numero_periode, numero_rayon],
+                })
+    return pd.DataFrame(resultats)
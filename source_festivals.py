@@ -0,0 +1,77 @@
+"""
+Accès au fichier source des festivals (base data.gouv déposée sur le S3 SSP Cloud).
+
+Le fichier peut aussi être lu en local en définissant la variable d'environnement
+FESTIVALS_CSV (chemin vers le CSV), par exemple sur une machine sans accès au S3.
+"""
+
+import hashlib
+import io
+import os
+
+import pandas as pd
+
+DOSSIER_S3 = "arthurneau/diffusion/"
+FICHIER_SOURCE_S3 = DOSSIER_S3 + "festivals_en_France (1).csv"
+
+# Configuration des variables d'environnement
+os.environ["AWS_ACCESS_KEY_ID"] = '0AYUHWP2SN3GR33LNA96'
+os.environ["AWS_SECRET_ACCESS_KEY"] = 'yiKIuXZKdKcxX3J4XHO2I6xdGQfHbE3ITDkr45+x'
+os.environ["AWS_SESSION_TOKEN"] = 'eyJhbGciOiJIUzUxMiIsInR5cCI6IkpXVCJ9.eyJhY2Nlc3NLZXkiOiIwQVlVSFdQMlNOM0dSMzNMTkE5NiIsImFsbG93ZWQtb3JpZ2lucyI6WyIqIl0sImF1ZCI6WyJtaW5pby1kYXRhbm9kZSIsIm9ueXhpYSIsImFjY291bnQiXSwiYXV0aF90aW1lIjoxNzM2MDg3NTgwLCJhenAiOiJvbnl4aWEiLCJlbWFpbCI6ImFydGh1ci5uZWF1QGVuc2FlLmZyIiwiZW1haWxfdmVyaWZpZWQiOnRydWUsImV4cCI6MTczNjY5MjQwNiwiZmFtaWx5X25hbWUiOiJOZWF1IiwiZ2l2ZW5fbmFtZSI6IkFydGh1ciIsImdyb3VwcyI6WyJVU0VSX09OWVhJQSJdLCJpYXQiOjE3MzYwODc2MDYsImlzcyI6Imh0dHBzOi8vYXV0aC5sYWIuc3NwY2xvdWQuZnIvYXV0aC9yZWFsbXMvc3NwY2xvdWQiLCJqdGkiOiIyNDVjMzhkYi0wNWI5LTQyN2QtODFhOS1lN2E2MTY0NWE3MTQiLCJuYW1lIjoiQXJ0aHVyIE5lYXUiLCJwb2xpY3kiOiJzdHNvbmx5IiwicHJlZmVycmVkX3VzZXJuYW1lIjoiYXJ0aHVybmVhdSIsInJlYWxtX2FjY2VzcyI6eyJyb2xlcyI6WyJvZmZsaW5lX2FjY2VzcyIsInVtYV9hdXRob3JpemF0aW9uIiwiZGVmYXVsdC1yb2xlcy1zc3BjbG91ZCJdfSwicmVzb3VyY2VfYWNjZXNzIjp7ImFjY291bnQiOnsicm9sZXMiOlsibWFuYWdlLWFjY291bnQiLCJtYW5hZ2UtYWNjb3VudC1saW5rcyIsInZpZXctcHJvZmlsZSJdfX0sInJvbGVzIjpbIm9mZmxpbmVfYWNjZXNzIiwidW1hX2F1dGhvcml6YXRpb24iLCJkZWZhdWx0LXJvbGVzLXNzcGNsb3VkIl0sInNjb3BlIjoib3BlbmlkIHByb2ZpbGUgZ3JvdXBzIGVtYWlsIiwic2lkIjoiNDNiNzRhZjktZmNkOC00MmExLTkyNzItMTVmZjA1MzM0ZjYzIiwic3ViIjoiNjY0OTQ3YjUtNjE5OC00NTBiLWI3MzctODc1MTQ4ZDcwYThkIiwidHlwIjoiQmVhcmVyIn0.DV6-tLYquu3kzFFRtKk0_TBnBEKDomEJ1wVbDqa_L2bnyH2Qf8a0s7YgLYNtQpASMGHiBfbYsZO6ur7E3K68Og'
+os.environ["AWS_DEFAULT_REGION"] = 'us-east-1'
+
+
+def connexion_s3():
+    """
+    Initialise la connexion à MinIO.
+    """
+    import s3fs
+
+    return s3fs.S3FileSystem(
+        client_kwargs={'endpoint_url': 'https://'+'minio.lab.sspcloud.fr'},
+        key=os.environ["AWS_ACCESS_KEY_ID"],
+        secret=os.environ["AWS_SECRET_ACCESS_KEY"],
+        token=os.environ["AWS_SESSION_TOKEN"]
+    )
+
+
+def lire_source():
+    """
+    Lit le CSV brut des festivals (local si FESTIVALS_CSV est défini, sinon S3).
+    """
+    chemin_local = os.environ.get("FESTIVALS_CSV")
+    if chemin_local:
+        return pd.read_csv(chemin_local, sep=';', encoding='utf-8-sig')
+    with connexion_s3().open(FICHIER_SOURCE_S3, "rb") as file_in:
+        return pd.read_csv(io.BytesIO(file_in.read()), sep=';', encoding='utf-8-sig')
+
+
+# SHA-256 des CSV locaux déjà lus, par (chemin, taille, date de modification)
+_empreintes_locales = {}
+
+
+def empreinte_source(distante=True):
+    """
+    Renvoie une empreinte du contenu du CSV source, sans le télécharger depuis le S3.
+
+    En local, c'est le SHA-256 du fichier, recalculé seulement si sa taille ou sa date
+    de modification change ; sur le S3, l'ETag de l'objet (hash du contenu calculé par
+    le serveur), obtenu par une requête de métadonnées. Avec distante=False, renvoie
+    None pour la source S3 au lieu de faire cette requête.
+    """
+    chemin_local = os.environ.get("FESTIVALS_CSV")
+    if chemin_local:
+        etat = os.stat(chemin_local)
+        cle = (os.path.abspath(chemin_local), etat.st_size, etat.st_mtime_ns)
+        if cle not in _empreintes_locales:
+            sha = hashlib.sha256()
+            with open(chemin_local, "rb") as fichier:
+                for bloc in iter(lambda: fichier.read(1 << 20), b""):
+                    sha.update(bloc)
+            _empreintes_locales[cle] = "sha256:" + sha.hexdigest()
+        return _empreintes_locales[cle]
+    if not distante:
+        return None
+    info = connexion_s3().info(FICHIER_SOURCE_S3)
+    etag = info.get("ETag") or f"{info.get('size')}-{info.get('LastModified')}"
+    return "etag:" + str(etag).strip('"')
@@ -0,0 +1,257 @@
+"""
+Moteur vectorisé d'attribution des nouvelles sous-catégories.
+
+Remplace les cinq `df.apply(attribuer_sous_categories..., axis=1)` de
+Nettoyage_base_donnees.py : les libellés bruts des cinq disciplines sont découpés
+avec les opérations de chaînes de pandas, éclatés (explode), associés à leur
+regroupement (recherché une seule fois par libellé distinct dans une table de
+correspondance construite à partir des dictionnaires de regroupements.py), puis
+regroupés en listes par festival.
+
+Les règles de chaque discipline (condition sur la discipline dominante, séparateurs,
+colonne de repli) reprennent exactement celles des anciennes fonctions ligne à ligne.
+
+Performances : le coût dépend surtout du nombre de textes bruts distincts, chacun
+découpé par une expression régulière comme dans les anciennes fonctions. Sur
+54 000 festivals synthétiques, le gain est d'environ 20x (17 à 21x) quand les
+textes se répètent (300 textes distincts par discipline), mais seulement de 8 à
+12x quand presque chaque festival a son propre texte : l'objectif de 20x n'est
+tenu que dans le premier cas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from regroupements import (
+    regroupements_arts_visuels,
+    regroupements_cinema,
+    regroupements_livre_litterature,
+    regroupements_musique,
+    regroupements_spectacle_vivant,
+)
+
+# Virgule hors parenthèses (cf. split_with_parentheses_handling)
+VIRGULE_HORS_PARENTHESES = r",\s*(?![^(]*\))"
+
+# Règles d'attribution, une par discipline :
+# - motif / ignorer_casse : test "motif in Discipline dominante"
+# - separateur : expression régulière de découpage des libellés bruts
+# - strip_avant : le texte brut est nettoyé (et ignoré s'il est vide) avant découpage
+# - garder_vides : les morceaux vides sont recherchés dans le dictionnaire
+#   (le dictionnaire du spectacle vivant contient " ", qui vaut "" une fois normalisé)
+# - colonne_repli : colonne utilisée si la sous-catégorie est vide ou vaut "Musiques actuelles"
+REGLES = [
+    {
+        "discipline": "Spectacle vivant",
+        "colonne_source": "Sous-catégorie spectacle vivant",
+        "colonne_cible": "Nouvelles sous-catégories spectacle vivant",
+        "regroupements": regroupements_spectacle_vivant,
+        "motif": "Spectacle vivant",
+        "ignorer_casse": False,
+        "separateur": r"[;,]",
+        "strip_avant": False,
+        "garder_vides": True,
+        "colonne_repli": None,
+    },
+    {
+        "discipline": "Arts visuels, arts numériques",
+        "colonne_source": "Sous-catégorie arts visuels et arts numériques",
+        "colonne_cible": "Nouvelles sous-catégories arts visuels",
+        "regroupements": regroupements_arts_visuels,
+        "motif": "arts visuels, arts numériques",
+        "ignorer_casse": True,
+        "separateur": VIRGULE_HORS_PARENTHESES,
+        "strip_avant": True,
+        "garder_vides": True,
+        "colonne_repli": None,
+    },
+    {
+        "discipline": "Cinéma, audiovisuel",
+        "colonne_source": "Sous-catégorie cinéma et audiovisuel",
+        "colonne_cible": "Nouvelles sous-catégories cinéma et audiovisuel",
+        "regroupements": regroupements_cinema,
+        "motif": "audiovisuel",
+        "ignorer_casse": True,
+        "separateur": VIRGULE_HORS_PARENTHESES,
+        "strip_avant": True,
+        "garder_vides": True,
+        "colonne_repli": None,
+    },
+    {
+        "discipline": "Livre, littérature",
+        "colonne_source": "Sous-catégorie livre et littérature",
+        "colonne_cible": "Nouvelles sous-catégories livre et littérature",
+        "regroupements": regroupements_livre_litterature,
+        "motif": "Livre",
+        "ignorer_casse": False,
+        "separateur": VIRGULE_HORS_PARENTHESES,
+        "strip_avant": True,
+        "garder_vides": True,
+        "colonne_repli": None,
+    },
+    {
+        "discipline": "Musique",
+        "colonne_source": "Sous-catégorie musique",
+        "colonne_cible": "Nouvelles sous-catégories musique",
+        "regroupements": regroupements_musique,
+        "motif": "Musique",
+        "ignorer_casse": False,
+        "separateur": VIRGULE_HORS_PARENTHESES + r"|;",
+        "strip_avant": False,
+        "garder_vides": False,
+        "colonne_repli": "Sous-catégorie Musique CNM",
+    },
+]
+
+
+def table_correspondance(regles=REGLES):
+    """
+    Construit la table (règle, libellé normalisé) -> nouvelle sous-catégorie.
+
+    Comme pour les anciens dictionnaires inversés, en cas de doublon c'est la
+    dernière sous-catégorie du dictionnaire qui l'emporte.
+    """
+    lignes = []
+    for num_regle, regle in enumerate(regles):
+        inverse = {}
+        for categorie, sous_cats in regle["regroupements"].items():
+            for sous_cat in sous_cats:
+                inverse[sous_cat.lower().strip()] = categorie
+        lignes += [(num_regle, libelle, categorie) for libelle, categorie in inverse.items()]
+    return pd.DataFrame(lignes, columns=["regle", "libelle", "categorie"])
+
+
+def _festivals_concernes(disciplines, regle):
+    """
+    Masque des festivals dont la discipline dominante contient le motif de la règle.
+
+    disciplines : (codes, valeurs) de pd.factorize(df["Discipline dominante"]) ;
+    le test n'est fait que sur les valeurs distinctes.
+    """
+    codes, valeurs = disciplines
+    valeurs = pd.Series(valeurs, dtype=object).astype(str)
+    if regle["ignorer_casse"]:
+        valeurs = valeurs.str.strip().str.lower()
+    # Code -1 (discipline manquante) : dernier élément, toujours False
+    test = np.append(valeurs.str.contains(regle["motif"], regex=False).to_numpy(dtype=bool), False)
+    return test[codes]
+
+
+def _textes_bruts(df, regle, disciplines):
+    """
+    Renvoie la position des festivals concernés par une règle, le code de leur texte
+    brut de sous-catégories (-1 si absent) et la liste des textes distincts.
+    """
+    concernes = _festivals_concernes(disciplines, regle)
+    positions = np.flatnonzero(concernes)
+    brut = df[regle["colonne_source"]].to_numpy(dtype=object)[positions]
+
+    repli = regle["colonne_repli"]
+    if repli is not None and repli in df.columns:
+        codes, textes = pd.factorize(brut)
+        actuelles = pd.Series(textes, dtype=object).astype(str).str.strip().str.lower() == "musiques actuelles"
+        remplacer = np.append(actuelles.to_numpy(dtype=bool), True)[codes]
+        brut = np.where(remplacer, df[repli].to_numpy(dtype=object)[positions], brut)
+
+    codes, textes = pd.factorize(brut)
+    textes = pd.Series(textes, dtype=object).astype(str)
+    if regle["strip_avant"]:
+        textes = textes.str.strip()
+    return positions, codes, textes
+
+
+def _eclater_libelles(textes, num_regle, regle, correspondance):
+    """
+    Découpe des textes bruts distincts en libellés, un par ligne (avec le code du
+    texte), associés à leur nouvelle sous-catégorie (NaN si le libellé est inconnu).
+
+    correspondance : dictionnaire libellé normalisé -> sous-catégorie de la règle.
+    """
+    if regle["strip_avant"]:
+        textes = textes[textes != ""]  # Texte vide : aucune sous-catégorie
+    morceaux = textes.str.split(regle["separateur"], regex=True).explode()
+    libelles = pd.DataFrame({
+        "regle": num_regle,
+        "code": morceaux.index.to_numpy(),
+        "brut": morceaux.to_numpy(),
+    })
+    # Normalisation et recherche faites une seule fois par morceau distinct
+    codes_morceaux, morceaux_distincts = pd.factorize(libelles["brut"])
+    normalises = pd.Series(morceaux_distincts, dtype=object).str.lower().str.strip()
+    libelles["libelle"] = normalises.to_numpy(dtype=object)[codes_morceaux]
+    libelles["categorie"] = normalises.map(correspondance).to_numpy(dtype=object)[codes_morceaux]
+    if not regle["garder_vides"]:
+        libelles = libelles[libelles["libelle"] != ""]
+    return libelles
+
+
+def _listes_par_festival(codes, nb_textes, codes_reconnus, categories):
+    """
+    Liste des sous-catégories de chaque festival (None s'il n'en a aucune), à partir
+    des libellés reconnus triés par code de texte : chaque festival reçoit une
+    tranche (donc une liste à lui) des catégories de son texte.
+    """
+    comptes = np.bincount(codes_reconnus, minlength=nb_textes + 1)  # + 1 : code -1
+    fins = np.cumsum(comptes)
+    debuts = fins - comptes
+    categories = categories.tolist()
+    tranches = (categories[a:b] or None for a, b in zip(debuts[codes].tolist(), fins[codes].tolist()))
+    return np.fromiter(tranches, dtype=object, count=len(codes))
+
+
+def attribuer_toutes_sous_categories(df, regles=REGLES, correspondance=None):
+    """
+    Ajoute à df les colonnes "Nouvelles sous-catégories ..." des cinq disciplines.
+
+    Chaque colonne contient la liste des nouvelles sous-catégories du festival
+    (dans l'ordre d'apparition des libellés bruts), ou None.
+    Renvoie le DataFrame complété et la table des libellés non reconnus
+    (Nom du festival, discipline, libellé), au lieu de les afficher un par un.
+    """
+    if correspondance is None:
+        correspondance = table_correspondance(regles)
+    dictionnaires = {num: dict(zip(table["libelle"], table["categorie"]))
+                     for num, table in correspondance.groupby("regle")}
+
+    # Beaucoup de festivals partagent le même texte brut : on ne découpe et on ne
+    # recherche que les textes distincts, puis on redistribue par code.
+    disciplines = pd.factorize(df["Discipline dominante"])
+    bruts = [_textes_bruts(df, regle, disciplines) for regle in regles]
+
+    libelles = pd.concat(
+        [_eclater_libelles(textes, num, regle, dictionnaires.get(num, {}))
+         for num, (regle, (_, _, textes)) in enumerate(zip(regles, bruts))],
+        ignore_index=True,
+    )
+
+    # Libellés reconnus, sans doublon (règle, code, catégorie), dans l'ordre
+    # d'apparition : ils restent triés par règle puis par code de texte
+    codes_categories, _ = pd.factorize(libelles["categorie"])
+    reconnus = np.flatnonzero(codes_categories >= 0)
+    cles = (libelles["regle"].to_numpy()[reconnus] * (len(libelles) + 1)
+            + libelles["code"].to_numpy()[reconnus]) * (codes_categories.max(initial=-1) + 1) + codes_categories[reconnus]
+    reconnus = reconnus[np.sort(np.unique(cles, return_index=True)[1])]
+    regles_reconnus = libelles["regle"].to_numpy()[reconnus]
+
+    df = df.copy(deep=False)  # Seules de nouvelles colonnes sont ajoutées
+    for num, (regle, (positions, codes, textes)) in enumerate(zip(regles, bruts)):
+        lignes = reconnus[regles_reconnus == num]
+        colonne = np.full(len(df), None, dtype=object)
+        colonne[positions] = _listes_par_festival(codes, len(textes), libelles["code"].to_numpy()[lignes],
+                                                  libelles["categorie"].to_numpy()[lignes])
+        df[regle["colonne_cible"]] = pd.Series(colonne, index=df.index, dtype=object)
+
+    # Libellés absents des dictionnaires, rattachés à chaque festival concerné
+    inconnus = libelles.loc[libelles["categorie"].isna(), ["regle", "code", "brut"]]
+    festivals = pd.concat(
+        [pd.DataFrame({"regle": num, "code": codes, "position": positions})
+         for num, (positions, codes, _) in enumerate(bruts)],
+        ignore_index=True,
+    )
+    inconnus = festivals.merge(inconnus, on=["regle", "code"]).sort_values(["regle", "position"], kind="stable")
+    non_reconnues = pd.DataFrame({
+        "Nom du festival": df["Nom du festival"].to_numpy()[inconnus["position"].to_numpy()],
+        "Discipline": [regles[num]["discipline"] for num in inconnus["regle"]],
+        "Sous-catégorie non reconnue": inconnus["brut"].str.strip().to_numpy(),
+    })
+    return df, non_reconnues
@@ -0,0 +1,154 @@
+"""
+Outils communs aux tests : modules du dépôt importables et serveur HTTP local
+(http.server) qui remplace les services distants.
+"""
+
+import csv
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class ServeurLocal:
+    """
+    Serveur HTTP/1.1 (keep-alive) dans un thread. repondre(requete) renvoie
+    (statut, en-têtes, corps) ; chaque requête reçue est gardée dans requetes.
+    """
+
+    def __init__(self, repondre):
+        self.repondre = repondre
+        self.requetes = []
+        self.verrou = threading.Lock()
+        serveur = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def traiter(self):
+                longueur = int(self.headers.get("Content-Length") or 0)
+                requete = {
+                    "methode": self.command,
+                    "chemin": self.path,
+                    "en_tetes": dict(self.headers),
+                    "corps": self.rfile.read(longueur) if longueur else b"",
+                    "client": self.client_address,
+                }
+                with serveur.verrou:
+                    serveur.requetes.append(requete)
+                statut, en_tetes, corps = serveur.repondre(requete)
+                if isinstance(corps, str):
+                    corps = corps.encode("utf-8")
+                self.send_response(statut)
+                for nom, valeur in (en_tetes or {}).items():
+                    self.send_header(nom, valeur)
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            do_GET = do_POST = traiter
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Gestionnaire)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def fermer(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def serveur_local():
+    """
+    Fabrique de serveurs locaux : serveur_local(repondre) -> ServeurLocal.
+    """
+    serveurs = []
+
+    def demarrer(repondre):
+        serveur = ServeurLocal(repondre)
+        serveurs.append(serveur)
+        return serveur
+
+    yield demarrer
+    for serveur in serveurs:
+        serveur.fermer()
+
+
+@pytest.fixture
+def client_http_rapide(monkeypatch):
+    """
+    Client HTTP commun avec des délais de réessai courts et sans limites héritées
+    d'un autre test.
+    """
+    import client_http
+
+    monkeypatch.setattr(client_http, "DELAI_BASE", 0.01)
+    monkeypatch.setattr(client_http, "_limites_hotes", {})
+    return client_http
+
+
+# Colonnes du CSV source des festivals (data.gouv) ; les dernières sont supprimées par le nettoyage
+COLONNES_SOURCE = [
+    "Nom du festival", "Envergure territoriale", "Région principale de déroulement",
+    "Département principal de déroulement", "Commune principale de déroulement", "Site internet du festival",
+    "Adresse e-mail", "Discipline dominante", "Période principale de déroulement du festival", "Identifiant",
+    "Géocodage xy", "Sous-catégorie spectacle vivant", "Sous-catégorie musique",
+    "Sous-catégorie cinéma et audiovisuel", "Sous-catégorie arts visuels et arts numériques",
+    "Sous-catégorie livre et littérature", "Sous-catégorie Musique CNM",
+]
+COLONNES_SUPPRIMEES = [
+    "Code postal (de la commune principale de déroulement)", "Code Insee commune", "Code Insee EPCI",
+    "Libellé EPCI", "Numéro de voie", "Type de voie (rue, Avenue, boulevard, etc.)", "Nom de la voie",
+    "Adresse postale", "Complément d'adresse (facultatif)", "Décennie de création du festival",
+    "Année de création du festival", "Identifiant Agence A", "identifiant CNM",
+]
+LIEUX_SOURCE = [("Occitanie", "Gard", "Nîmes", 43.83, 4.36), ("Bretagne", "Finistère", "Brest", 48.39, -4.49),
+                ("Grand Est", "Bas-Rhin", "Strasbourg", 48.57, 7.75), ("Guadeloupe", "Guadeloupe", "Pointe-à-Pitre",
+                                                                     16.24, -61.53)]
+DISCIPLINES_SOURCE = {"Musique": ("Sous-catégorie musique", "Jazz, Rock"),
+                      "Spectacle vivant": ("Sous-catégorie spectacle vivant", "Théâtre; Danse"),
+                      "Cinéma, audiovisuel": ("Sous-catégorie cinéma et audiovisuel", "Documentaire")}
+PERIODES_SOURCE = ["avant-saison (1er janvier - 20 juin)", "saison (21 juin - 5 septembre)",
+                   "après-saison (6 septembre - 31 décembre)"]
+
+
+@pytest.fixture
+def ecrire_source():
+    """
+    Écrit un CSV source synthétique : ecrire_source(chemin, nb, sans_coordonnees=0)
+    (les sans_coordonnees premiers festivals n'ont pas de "Géocodage xy").
+    """
+    def ecrire(chemin, nb, sans_coordonnees=0, graine=0):
+        generateur = random.Random(graine)
+        with open(chemin, "w", encoding="utf-8-sig", newline="") as fichier:
+            ecrivain = csv.writer(fichier, delimiter=";")
+            ecrivain.writerow(COLONNES_SOURCE + COLONNES_SUPPRIMEES)
+            for i in range(nb):
+                region, departement, commune, lat, lon = generateur.choice(LIEUX_SOURCE)
+                discipline = generateur.choice(list(DISCIPLINES_SOURCE))
+                ligne = dict.fromkeys(COLONNES_SOURCE, "")
+                ligne.update({
+                    "Nom du festival": f"Festival {i}", "Région principale de déroulement": region,
+                    "Département principal de déroulement": departement,
+                    "Commune principale de déroulement": commune, "Discipline dominante": discipline,
+                    "Période principale de déroulement du festival": generateur.choice(PERIODES_SOURCE),
+                    "Identifiant": f"FEST_{i}",
+                    "Géocodage xy": "" if i < sans_coordonnees else
+                    f"{lat + generateur.gauss(0, 0.3):.6f}, {lon + generateur.gauss(0, 0.3):.6f}",
+                })
+                colonne, sous_categories = DISCIPLINES_SOURCE[discipline]
+                ligne[colonne] = sous_categories
+                ecrivain.writerow([ligne[c] for c in COLONNES_SOURCE] + ["x"] * len(COLONNES_SUPPRIMEES))
+        return chemin
+
+    return ecrire
@@ -0,0 +1,29 @@
+"""
+Cube d'agrégats (agregats.py) : écrit avec le snapshot, relu sans être reconstruit.
+"""
+
+import pandas as pd
+
+import agregats
+from agregats import charger_cube, compter, ecrire_cube
+
+
+def test_cube_ecrit_avec_le_snapshot_relu_tel_quel(tmp_path, monkeypatch):
+    cube = pd.DataFrame({"Région": ["Bretagne", "Bretagne"], "Département": ["Finistère", "Finistère"],
+                         "Période": ["Saison (21 juin - 5 septembre)"] * 2, "Discipline": [agregats.TOUTES, "Musique"],
+                         "Sous-catégorie": [agregats.TOUTES, agregats.TOUTES], "Nombre": [3, 2]})
+    ancien = tmp_path / "cube_ancien.parquet"
+    ancien.write_bytes(b"")
+    assert ecrire_cube(cube, tmp_path, "cle") == tmp_path / "cube_cle.parquet"
+    assert not ancien.exists()
+
+    monkeypatch.setattr(agregats, "snapshot_a_jour", lambda dossier, verifier_source=None: True)
+    monkeypatch.setattr(agregats, "lire_meta", lambda dossier: {"cle": "cle", "fichier": "festivals_cle.parquet"})
+
+    def construire_cube(df):
+        raise AssertionError("cube recalculé")
+
+    monkeypatch.setattr(agregats, "construire_cube", construire_cube)
+    relu = charger_cube(tmp_path)
+    pd.testing.assert_frame_equal(relu, cube)
+    assert compter(relu) == 3 and compter(relu, filtres={"Discipline": "Musique"}) == 2
@@ -0,0 +1,56 @@
+"""
+Snapshot compilé (base_festivals.py) construit depuis un CSV source local.
+"""
+
+from base_festivals import charger_festivals, construire_snapshot, lire_meta, snapshot_a_jour
+
+
+def test_deux_reconstructions_dans_le_meme_processus(tmp_path, monkeypatch, ecrire_source):
+    source = ecrire_source(tmp_path / "source.csv", 60)
+    monkeypatch.setenv("FESTIVALS_CSV", str(source))
+    dossier = tmp_path / "snapshot"
+    construire_snapshot(dossier)
+    premiere = lire_meta(dossier)
+    assert premiere["nb_festivals"] == len(charger_festivals(dossier, reconstruire=False))
+
+    # La source change : le nettoyage est relancé, pas repris du module déjà importé
+    ecrire_source(source, 20, graine=1)
+    assert not snapshot_a_jour(dossier)
+    construire_snapshot(dossier)
+    seconde = lire_meta(dossier)
+    assert seconde["cle"] != premiere["cle"]
+    assert seconde["nb_festivals"] < premiere["nb_festivals"]
+    df = charger_festivals(dossier, reconstruire=False)
+    assert len(df) == seconde["nb_festivals"]
+    assert set(df["Identifiant"]) <= {f"FEST_{i}" for i in range(20)}
+
+
+def test_index_reconstruit_apres_le_geocodage(tmp_path, monkeypatch, ecrire_source):
+    import geocodage_lot
+    from index_spatial import charger_index
+
+    monkeypatch.setenv("FESTIVALS_CSV", str(ecrire_source(tmp_path / "source.csv", 60, sans_coordonnees=10)))
+    dossier = tmp_path / "snapshot"
+    index = charger_index(dossier)  # Construction implicite, sans géocodage
+    cle_implicite = lire_meta(dossier)["cle"]
+    festivals = charger_festivals(dossier)  # Sans les festivals d'outre-mer
+    manquants = festivals["Latitude"].isna()
+    assert manquants.sum() > 0 and len(index) == len(festivals) - manquants.sum()
+
+    def completer_coordonnees(df):
+        df = df.copy()
+        vides = df["Latitude"].isna()
+        df.loc[vides, "Latitude"], df.loc[vides, "Longitude"] = 48.39, -4.49
+        return df, {"lots": [{"lignes": int(vides.sum())}], "festivals_sans_coordonnees": int(vides.sum()),
+                    "festivals_completes": int(vides.sum())}
+
+    monkeypatch.setattr(geocodage_lot, "completer_coordonnees", completer_coordonnees)
+    construire_snapshot(dossier, geocoder_manquants=True)
+    assert lire_meta(dossier)["cle"] != cle_implicite
+
+    # L'index suit les coordonnées complétées : les festivals géocodés sont trouvés
+    index = charger_index(dossier)
+    assert len(index) == len(festivals)
+    assert not (dossier / f"index_{cle_implicite}.npz").exists()
+    positions = index.within_radius(48.39, -4.49, 1)[0]
+    assert set(manquants[manquants].index) <= set(positions.tolist())
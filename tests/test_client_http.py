@@ -0,0 +1,124 @@
+"""
+Client HTTP commun (client_http.py) contre un serveur local : keep-alive, réessais
+sur 503 avec Retry-After, limites par hôte et variante asynchrone.
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+
+import pytest
+
+
+@pytest.fixture
+def compteur_simultanees():
+    """
+    Réponse lente qui mesure le nombre maximal de requêtes traitées en même temps.
+    """
+    etat = {"en_cours": 0, "max": 0}
+    verrou = threading.Lock()
+
+    def repondre(requete):
+        with verrou:
+            etat["en_cours"] += 1
+            etat["max"] = max(etat["max"], etat["en_cours"])
+        time.sleep(0.05)
+        with verrou:
+            etat["en_cours"] -= 1
+        if requete["chemin"] == "/absente":
+            return 404, {}, "introuvable"
+        return 200, {}, requete["chemin"]
+
+    repondre.etat = etat
+    return repondre
+
+
+def test_connexion_reutilisee(serveur_local, client_http_rapide):
+    serveur = serveur_local(lambda requete: (200, {}, "ok"))
+    for _ in range(5):
+        assert client_http_rapide.get(serveur.url + "/page").text == "ok"
+    # Une seule connexion TCP (même port client) pour les cinq requêtes
+    assert len({requete["client"] for requete in serveur.requetes}) == 1
+
+
+def test_503_reessayee_apres_retry_after(serveur_local, client_http_rapide):
+    reponses = iter([(503, {"Retry-After": "0.3"}, "occupé"), (503, {"Retry-After": "0"}, "occupé"),
+                     (200, {}, "ok")])
+    serveur = serveur_local(lambda requete: next(reponses))
+    debut = time.perf_counter()
+    reponse = client_http_rapide.get(serveur.url + "/page")
+    assert reponse.status_code == 200 and reponse.text == "ok"
+    assert len(serveur.requetes) == 3
+    assert time.perf_counter() - debut >= 0.3
+
+    metriques = client_http_rapide.metriques()[client_http_rapide.hote(serveur.url)]
+    assert metriques["reessais"] >= 2
+
+
+def test_derniere_reponse_renvoyee_apres_tous_les_essais(serveur_local, client_http_rapide):
+    serveur = serveur_local(lambda requete: (503, {}, "occupé"))
+    reponse = client_http_rapide.get(serveur.url + "/page", nb_essais=3)
+    assert reponse.status_code == 503
+    assert len(serveur.requetes) == 3
+
+
+def test_404_non_reessayee(serveur_local, client_http_rapide):
+    serveur = serveur_local(lambda requete: (404, {}, "introuvable"))
+    assert client_http_rapide.get(serveur.url + "/page").status_code == 404
+    assert len(serveur.requetes) == 1
+
+
+def test_retry_after_en_date_http(client_http_rapide):
+    class Reponse:
+        headers = {"Retry-After": formatdate(time.time() + 2, usegmt=True)}
+
+    assert 0 < client_http_rapide.delai_avant_essai(0, Reponse()) <= 2
+
+
+def test_limite_hote_concurrence_et_debit(serveur_local, client_http_rapide, compteur_simultanees):
+    serveur = serveur_local(compteur_simultanees)
+    client_http_rapide.definir_limites(client_http_rapide.hote(serveur.url), concurrence=2, requetes_par_seconde=20)
+
+    debut = time.perf_counter()
+    fils = [threading.Thread(target=client_http_rapide.get, args=(f"{serveur.url}/{i}",)) for i in range(8)]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    assert len(serveur.requetes) == 8
+    assert compteur_simultanees.etat["max"] == 2
+    assert time.perf_counter() - debut >= 7 / 20  # au plus 20 requêtes par seconde
+
+
+def test_limite_hote_espacement():
+    import client_http
+
+    limite = client_http.LimiteHote(concurrence=1, requetes_par_seconde=10)
+    debut = time.monotonic()
+    for _ in range(4):
+        limite.attendre_tour()
+    assert time.monotonic() - debut >= 0.3
+
+
+def test_get_tous_asynchrone(serveur_local, client_http_rapide, compteur_simultanees, monkeypatch):
+    pytest.importorskip("httpx")
+    serveur = serveur_local(compteur_simultanees)
+    monkeypatch.setitem(client_http_rapide.LIMITES_HOTES, client_http_rapide.hote(serveur.url),
+                        {"concurrence": 2, "requetes_par_seconde": 20})
+    urls = [f"{serveur.url}/{i}" for i in range(6)] + [f"{serveur.url}/absente", "http://127.0.0.1:9/ferme"]
+
+    async def tout_telecharger():
+        async with client_http_rapide.ClientAsync(nb_essais=2) as client:
+            return await client.get_tous(urls)
+
+    debut = time.perf_counter()
+    reponses = asyncio.run(tout_telecharger())
+    duree = time.perf_counter() - debut
+
+    # Réponses dans l'ordre des URL, erreur réseau renvoyée comme exception
+    assert [reponse.text for reponse in reponses[:6]] == [f"/{i}" for i in range(6)]
+    assert reponses[6].status_code == 404
+    assert isinstance(reponses[7], Exception)
+    assert compteur_simultanees.etat["max"] == 2
+    assert duree >= 6 / 20
@@ -0,0 +1,61 @@
+"""
+Répertoire des communes (communes.py) : noms trouvés dans un lieu plus long et
+repli sur le géocodeur réseau.
+"""
+
+import pytest
+
+import communes
+from communes import RepertoireCommunes, geocoder_lieux
+
+
+@pytest.fixture
+def repertoire():
+    lieux = [("Nîmes", "Gard", 43.84, 4.36), ("Saint-Étienne", "Loire", 45.43, 4.39),
+             ("Mer", "Loir-et-Cher", 47.70, 1.51), ("Port", "Ain", 46.17, 5.56)]
+    return RepertoireCommunes(*zip(*lieux))
+
+
+def test_nom_complet(repertoire):
+    assert repertoire.localiser("NIMES") == (43.84, 4.36)
+    assert repertoire.localiser("St Etienne") == (45.43, 4.39)
+    assert repertoire.localiser("Mer") == (47.70, 1.51)
+
+
+def test_nom_de_plusieurs_mots_dans_un_lieu(repertoire):
+    assert repertoire.localiser("Parc de Saint-Étienne") == (45.43, 4.39)
+
+
+def test_nom_d_un_mot_confirme_par_le_departement(repertoire):
+    # Sans département, « Mer » ou « Port » dans un nom de salle ne désignent pas la commune
+    assert repertoire.localiser("Salle de la Mer") is None
+    assert repertoire.localiser("Capitainerie du Port") is None
+    assert repertoire.localiser("Arènes de Nîmes") is None
+
+    assert repertoire.localiser("Salle de la Mer", "Loir-et-Cher") == (47.70, 1.51)
+    assert repertoire.localiser("Capitainerie du Port", "Var") is None
+    assert repertoire.localiser("Arènes de Nîmes", "Gard") == (43.84, 4.36)
+    assert repertoire.localiser("Nîmes (Gard)") == (43.84, 4.36)
+
+
+def test_repli_reseau_pour_les_lieux_non_confirmes(repertoire):
+    demandes = []
+
+    def repli(lieu):
+        demandes.append(lieu)
+        return (43.30, 5.37)
+
+    resultats = geocoder_lieux(["Salle de la Mer", "Nîmes", "Salle de la Mer"], repertoire=repertoire, repli=repli)
+    assert demandes == ["Salle de la Mer"]
+    assert resultats["Source"].tolist() == ["réseau", "répertoire", "réseau"]
+
+
+def test_repertoire_vide_utilise_tel_quel(monkeypatch):
+    def charger_repertoire():
+        raise AssertionError("snapshot chargé")
+
+    monkeypatch.setattr(communes, "charger_repertoire", charger_repertoire)
+    vide = RepertoireCommunes([], [], [], [])
+    assert len(vide) == 0
+    resultats = geocoder_lieux(["Brest"], repertoire=vide, repli=None)
+    assert resultats["Latitude"].isna().all() and resultats["Source"].isna().all()
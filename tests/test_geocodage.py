@@ -0,0 +1,114 @@
+"""
+Cache du géocodage (geocodage.py) : durée de vie, éviction LRU et persistance SQLite.
+"""
+
+import pytest
+
+import geocodage
+from geocodage import ABSENT, CacheGeocodage, geocoder
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    """
+    Remplace time.time() de geocodage.py par une horloge avancée à la main.
+    """
+    class Horloge:
+        maintenant = 1_000_000.0
+
+        def time(self):
+            return self.maintenant
+
+    horloge = Horloge()
+    monkeypatch.setattr(geocodage.time, "time", horloge.time)
+    return horloge
+
+
+def test_expiration(tmp_path, horloge):
+    cache = CacheGeocodage(tmp_path / "cache.sqlite")
+    cache.ecrire("brest", {"coordonnees": [48.4, -4.5]}, ttl=60)
+    horloge.maintenant += 59
+    assert cache.lire("brest") == {"coordonnees": [48.4, -4.5]}
+
+    horloge.maintenant += 2
+    assert cache.lire("brest") is ABSENT
+    assert cache.statistiques()["expirations"] == 1
+
+    # Expirée aussi sur disque : un nouveau cache sur le même fichier ne la relit pas
+    assert CacheGeocodage(tmp_path / "cache.sqlite").lire("brest") is ABSENT
+
+
+def test_eviction_lru_memoire():
+    cache = CacheGeocodage(chemin=None, taille_memoire=2)
+    cache.ecrire("a", 1, ttl=60)
+    cache.ecrire("b", 2, ttl=60)
+    assert cache.lire("a") == 1  # "a" devient la plus récemment utilisée
+    cache.ecrire("c", 3, ttl=60)
+    assert cache.lire("b") is ABSENT
+    assert cache.lire("a") == 1 and cache.lire("c") == 3
+    assert cache.statistiques()["evictions"] == 1
+
+
+def test_eviction_lru_disque(tmp_path, horloge):
+    cache = CacheGeocodage(tmp_path / "cache.sqlite", taille_memoire=1, taille_disque=20)
+    assert cache.intervalle_eviction == 2
+    for i in range(10):
+        cache.ecrire(f"ancienne {i}", i, ttl=3600)
+        horloge.maintenant += 1
+    horloge.maintenant += 1
+    assert cache.lire("ancienne 0") == 0  # relue : devient récente
+    for i in range(12):
+        horloge.maintenant += 1
+        cache.ecrire(f"nouvelle {i}", i, ttl=3600)
+
+    # 22 entrées > 20 : retour à 18, en supprimant les moins récemment utilisées
+    stats = cache.statistiques()
+    assert stats["taille_disque"] == 18 and stats["evictions"] >= 4
+    relu = CacheGeocodage(tmp_path / "cache.sqlite")
+    assert relu.lire("ancienne 0") == 0
+    assert relu.lire("ancienne 1") is ABSENT
+    assert relu.lire("nouvelle 11") == 11
+
+
+def test_eviction_pas_a_chaque_ecriture(tmp_path, monkeypatch):
+    cache = CacheGeocodage(tmp_path / "cache.sqlite", taille_disque=100_000)
+    appels = []
+    monkeypatch.setattr(cache, "_evincer_disque", lambda: appels.append(1))
+    for i in range(2500):
+        cache.ecrire(f"cle {i}", i, ttl=60)
+    assert len(appels) == 2500 // geocodage.ECRITURES_ENTRE_EVICTIONS
+
+
+def test_persistance_sqlite(tmp_path):
+    cache = CacheGeocodage(tmp_path / "cache.sqlite")
+    cache.ecrire("nîmes", {"coordonnees": [43.8, 4.4], "libelle": "Nîmes"}, ttl=3600)
+    cache.connexion.close()
+
+    relu = CacheGeocodage(tmp_path / "cache.sqlite")
+    assert relu.lire("nîmes") == {"coordonnees": [43.8, 4.4], "libelle": "Nîmes"}
+    assert relu.statistiques()["hits_disque"] == 1
+    assert relu.lire("nîmes") is not ABSENT
+    assert relu.statistiques()["hits_memoire"] == 1
+
+
+def test_geocoder_met_en_cache_les_reponses_pas_les_erreurs(tmp_path):
+    import requests
+
+    cache = CacheGeocodage(tmp_path / "cache.sqlite")
+    appels = []
+
+    def service(requete):
+        appels.append(requete)
+        if "panne" in requete.lower():
+            raise requests.ConnectionError("hors ligne")
+        if "nulle part" in requete.lower():
+            return None, None
+        return (48.86, 2.35), "Paris"
+
+    assert geocoder("Paris", cache=cache, service=service) == ((48.86, 2.35), "Paris")
+    assert geocoder("  PARIS ", cache=cache, service=service) == ((48.86, 2.35), "Paris")
+    assert geocoder("Nulle part", cache=cache, service=service) == (None, None)
+    assert geocoder("nulle  part", cache=cache, service=service) == (None, None)
+    assert geocoder("panne", cache=cache, service=service) == (None, None)
+    assert geocoder("panne", cache=cache, service=service) == (None, None)
+    assert appels == ["Paris", "Nulle part", "panne", "panne"]
@@ -0,0 +1,138 @@
+"""
+Géocodage par lots (geocodage_lot.py) contre un /search/csv/ local.
+"""
+
+import email.parser
+import email.policy
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import geocodage
+import geocodage_lot
+from geocodage import CacheGeocodage
+
+# Communes connues du faux service : requête -> (lat, lon)
+COMMUNES = {
+    "Brest Finistère": (48.39, -4.49),
+    "Quimper Finistère": (47.99, -4.10),
+    "Nîmes Gard": (43.84, 4.36),
+    "Arles Bouches-du-Rhône": (43.68, 4.63),
+    "Albi Tarn": (43.93, 2.15),
+}
+
+
+def lire_formulaire(requete):
+    """
+    Champs d'un corps multipart/form-data : {nom: texte}.
+    """
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        b"Content-Type: " + requete["en_tetes"]["Content-Type"].encode() + b"\r\n\r\n" + requete["corps"]
+    )
+    return {partie.get_param("name", header="content-disposition"): partie.get_payload(decode=True).decode("utf-8")
+            for partie in message.iter_parts()}
+
+
+def repondre_csv(requete):
+    """
+    Faux /search/csv/ : les communes de COMMUNES, une rue pour "Rue ...", une erreur
+    500 pour tout lot contenant "Panne".
+    """
+    formulaire = lire_formulaire(requete)
+    lot = pd.read_csv(io.StringIO(formulaire["data"]))
+    if lot["q"].str.contains("Panne").any():
+        return 500, {}, "erreur interne"
+    lignes = []
+    for q in lot["q"]:
+        if q in COMMUNES:
+            lignes.append({"latitude": COMMUNES[q][0], "longitude": COMMUNES[q][1], "result_label": q.split()[0],
+                           "result_score": 0.9, "result_type": "municipality"})
+        elif q.startswith("Rue"):
+            lignes.append({"latitude": 45.0, "longitude": 5.0, "result_label": q,
+                           "result_score": 0.95, "result_type": "street"})
+        else:
+            lignes.append({"latitude": None, "longitude": None, "result_label": None,
+                           "result_score": None, "result_type": None})
+    resultats = pd.concat([lot, pd.DataFrame(lignes)], axis=1)
+    return 200, {"Content-Type": "text/csv"}, resultats.to_csv(index=False)
+
+
+@pytest.fixture
+def api(serveur_local, client_http_rapide, monkeypatch):
+    serveur = serveur_local(repondre_csv)
+    monkeypatch.setattr(geocodage, "API_ADRESSE_URL", serveur.url)
+    return serveur
+
+
+def festivals(lieux):
+    """
+    Base de test : un festival par (commune, département) de lieux, sans coordonnées,
+    plus un festival déjà géocodé.
+    """
+    df = pd.DataFrame({
+        "Identifiant": [f"FEST_{i}" for i in range(len(lieux))],
+        "Commune principale de déroulement": [commune for commune, _ in lieux],
+        "Département principal de déroulement": [departement for _, departement in lieux],
+        "Géocodage xy": None,
+    })
+    deja = pd.DataFrame({"Identifiant": ["FEST_OK"], "Commune principale de déroulement": ["Lyon"],
+                         "Département principal de déroulement": ["Rhône"], "Géocodage xy": ["45.76, 4.83"]})
+    return pd.concat([df, deja], ignore_index=True)
+
+
+def test_lots_fusion_par_identifiant_et_cache(api, tmp_path):
+    cache = CacheGeocodage(tmp_path / "cache.sqlite")
+    lieux = [requete.split(" ", 1) for requete in COMMUNES] + [("Brest", "Finistère"), ("Inconnue", "Nulle part")]
+    df, rapport = geocodage_lot.completer_coordonnees(festivals(lieux), taille_lot=2, cache=cache)
+
+    # 6 requêtes distinctes (Brest deux fois), par lots de 2, toutes filtrées sur les communes
+    lots = [pd.read_csv(io.StringIO(lire_formulaire(r)["data"])) for r in api.requetes]
+    assert [len(lot) for lot in lots] == [2, 2, 2]
+    assert sorted(q for lot in lots for q in lot["q"]) == sorted([*COMMUNES, "Inconnue Nulle part"])
+    assert all(lire_formulaire(r)["type"] == "type" for r in api.requetes)
+    assert all((lot["type"] == "municipality").all() for lot in lots)
+    assert [lot["lignes"] for lot in rapport["lots"]] == [2, 2, 2]
+    assert sum(lot["trouvees"] for lot in rapport["lots"]) == 5
+
+    # Coordonnées rattachées par Identifiant, festival déjà géocodé inchangé
+    par_id = df.set_index("Identifiant")
+    for identifiant, (commune, departement) in zip(df["Identifiant"], lieux):
+        attendu = COMMUNES.get(f"{commune} {departement}", (np.nan, np.nan))
+        np.testing.assert_allclose(par_id.loc[identifiant, ["Latitude", "Longitude"]].astype(float), attendu)
+    assert par_id.loc["FEST_OK", "Géocodage xy"] == "45.76, 4.83"
+    assert par_id.loc["FEST_0", "Géocodage xy"] == "48.39, -4.49"
+    assert rapport["festivals_sans_coordonnees"] == 7
+    assert rapport["festivals_completes"] == 6
+
+    # Deuxième passage : tout vient du cache (y compris la commune introuvable)
+    nb_envois = len(api.requetes)
+    df2, rapport2 = geocodage_lot.completer_coordonnees(festivals(lieux), taille_lot=2, cache=cache)
+    assert len(api.requetes) == nb_envois
+    assert rapport2["en_cache"] == 6 and rapport2["lots"] == []
+    pd.testing.assert_frame_equal(df2, df)
+
+
+def test_lot_en_erreur_signale_et_non_mis_en_cache(api, tmp_path):
+    cache = CacheGeocodage(tmp_path / "cache.sqlite")
+    lieux = [("Brest", "Finistère"), ("Quimper", "Finistère"), ("Panne", "Serveur"), ("Albi", "Tarn")]
+    df, rapport = geocodage_lot.completer_coordonnees(festivals(lieux), taille_lot=2, cache=cache)
+
+    assert "erreur" not in rapport["lots"][0] and rapport["lots"][0]["trouvees"] == 2
+    assert rapport["lots"][1]["lignes"] == 2 and "erreur" in rapport["lots"][1]
+    assert df.set_index("Identifiant").loc[["FEST_2", "FEST_3"], "Latitude"].isna().all()
+    assert rapport["festivals_completes"] == 2
+
+    # Le lot en erreur est renvoyé au passage suivant, pas le lot réussi
+    nb_envois = len(api.requetes)
+    _, rapport2 = geocodage_lot.completer_coordonnees(festivals(lieux), taille_lot=2, cache=cache)
+    renvoyes = [pd.read_csv(io.StringIO(lire_formulaire(r)["data"]))["q"].tolist() for r in api.requetes[nb_envois:]]
+    assert {q for lot in renvoyes for q in lot} == {"Panne Serveur", "Albi Tarn"}
+    assert rapport2["en_cache"] == 2
+
+
+def test_resultat_autre_qu_une_commune_ignore(api):
+    reponses = geocodage_lot.envoyer_lot(["Rue de la Paix Paris", "Nîmes Gard"])
+    assert reponses[0]["coordonnees"] is None
+    assert reponses[1]["coordonnees"] == [43.84, 4.36]
@@ -0,0 +1,100 @@
+"""
+Comptes de festivals autour des points (impact.statistiques_anneaux), comparés à
+un comptage direct sur les distances géodésiques.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from geodistance import distance_ellipsoide_km
+from impact import DISCIPLINES, PERIODES, TOUTES, statistiques_anneaux
+from masques import BITS_DISCIPLINES
+from saisons import SAISONS
+
+
+@pytest.fixture
+def festivals():
+    generateur = np.random.default_rng(0)
+    nb = 400
+    bits = np.array(list(BITS_DISCIPLINES.values()), dtype=np.uint64)
+    # Une ou deux disciplines par festival, parfois aucune
+    masques = bits[generateur.integers(0, len(bits), nb)] | bits[generateur.integers(0, len(bits), nb)]
+    masques[generateur.random(nb) < 0.1] = 0
+    festivals = pd.DataFrame({
+        "Latitude": generateur.uniform(44, 46, nb),
+        "Longitude": generateur.uniform(2, 5, nb),
+        "Code période": generateur.integers(-1, len(SAISONS), nb),  # -1 : période inconnue
+        "Masque disciplines": masques,
+    })
+    festivals.loc[:9, "Latitude"] = np.nan
+    return festivals
+
+
+def comptage_direct(points, festivals, rayons, exclure=None):
+    """
+    Nombre de festivals à au plus chaque rayon, par (ancre, période, discipline, rayon).
+    """
+    lignes = []
+    for ancre, (lat, lon) in enumerate(points):
+        distances = distance_ellipsoide_km(lat, lon, festivals["Latitude"], festivals["Longitude"])
+        garder = np.ones(len(festivals), dtype=bool)
+        if exclure is not None:
+            garder[list(exclure[ancre])] = False
+        for code_periode, periode in enumerate(PERIODES, -1):
+            if periode == TOUTES:
+                dans_periode = garder
+            else:
+                dans_periode = garder & (festivals["Code période"].to_numpy() == code_periode)
+            for discipline in DISCIPLINES:
+                if discipline == TOUTES:
+                    selection = dans_periode
+                else:
+                    bit = np.uint64(BITS_DISCIPLINES[discipline])
+                    selection = dans_periode & ((festivals["Masque disciplines"].to_numpy() & bit) != 0)
+                for rayon in rayons:
+                    lignes.append((ancre, periode, discipline, rayon, int((selection & (distances <= rayon)).sum())))
+    return pd.DataFrame(lignes, columns=["Ancre", "Période", "Discipline", "Rayon (km)", "Nombre"])
+
+
+def verifier(points, festivals, rayons, exclure=None):
+    resultats = statistiques_anneaux(points, festivals, rayons, exclure=exclure, taille_lot=2)
+    attendus = comptage_direct(points, festivals, rayons, exclure)
+    assert len(resultats) == len(attendus)
+    assert resultats["Période"].astype(str).tolist() == attendus["Période"].tolist()
+    assert resultats["Discipline"].astype(str).tolist() == attendus["Discipline"].tolist()
+    assert resultats["Rayon (km)"].tolist() == attendus["Rayon (km)"].tolist()
+    assert resultats["Nombre"].tolist() == attendus["Nombre"].tolist()
+    anneaux = attendus.groupby(["Ancre", "Période", "Discipline"], sort=False)["Nombre"].diff()
+    assert resultats["Nombre anneau"].tolist() == anneaux.fillna(attendus["Nombre"]).astype(int).tolist()
+    return resultats
+
+
+def test_comptes_identiques_au_comptage_direct(festivals):
+    points = np.array([[45.0, 3.5], [44.5, 2.5], [45.8, 4.6]])
+    resultats = verifier(points, festivals, [10, 25, 60])
+    # Le comptage ne doit pas être trivial
+    assert (resultats["Nombre anneau"] > 0).sum() > len(resultats) // 4
+
+
+def test_festival_exactement_au_rayon_compte(festivals):
+    point = np.array([[45.0, 3.5]])
+    # Rayons égaux aux distances géodésiques de deux festivals : le premier à la
+    # frontière entre les deux anneaux, le second au bord du disque
+    distances = distance_ellipsoide_km(45.0, 3.5, festivals["Latitude"], festivals["Longitude"])
+    interieur, exterieur = np.sort(distances[distances > 15])[[0, 30]]
+    resultats = verifier(point, festivals, [interieur, exterieur])
+    toutes = resultats[(resultats["Période"] == TOUTES) & (resultats["Discipline"] == TOUTES)]
+    assert toutes["Nombre"].tolist() == [int((distances <= interieur).sum()), int((distances <= exterieur).sum())]
+    assert toutes["Nombre anneau"].iloc[1] == 30
+
+
+def test_exclusions_et_coordonnees_absentes(festivals):
+    points = np.array([[45.0, 3.5], [44.5, 2.5]])
+    # Festivals sans coordonnées (0 à 9) et festivals proches à exclure
+    exclure = [[0, 1, 50, 51, 52], [3, 200]]
+    verifier(points, festivals, [30, 80], exclure=exclure)
+
+    # Un point sans coordonnées ne compte rien
+    resultats = statistiques_anneaux(np.array([[np.nan, np.nan]]), festivals, [30, 80])
+    assert (resultats["Nombre"] == 0).all()
@@ -0,0 +1,117 @@
+"""
+Recommandation par lots (recommandation_lot.py) : validation de k et résultats
+identiques à MoteurRecommandation.recommend() profil par profil, en série comme
+en parallèle.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from masques import BITS_GENRES, DISCIPLINES
+from recommandation import MoteurRecommandation
+from recommandation_lot import recommander_lot, top_k_tuile
+from saisons import SAISONS
+
+# Quelques genres (type du questionnaire, clé des genres, discipline, genre)
+GENRES = [(type_festival, cle_genres, discipline, genre)
+          for type_festival, discipline, _, cle_genres, dictionnaire in DISCIPLINES[:3]
+          for genre in list(dictionnaire)[:2]]
+DATES = [["2025-01-01", "2025-06-20"], ["2025-07-01", "2025-07-14"], ["2025-06-01", "2025-12-31"]]
+
+
+@pytest.fixture
+def moteur():
+    generateur = np.random.default_rng(0)
+    nb = 400
+    masques = np.zeros(nb, dtype=np.uint64)
+    for genre in range(len(GENRES)):
+        masques[generateur.random(nb) < 0.4] |= BITS_GENRES[GENRES[genre][2:]]
+    lat = generateur.uniform(43, 49, nb)
+    lat[:20] = np.nan
+    # Festivals en double (même endroit) : départagés par position
+    lat[20:30], lon = 46.0, generateur.uniform(-1, 6, nb)
+    lon[20:30] = 2.0
+    codes = generateur.integers(-1, len(SAISONS), nb).astype(np.int8)
+    masques[20:30] |= BITS_GENRES[GENRES[0][2:]]
+    codes[20:30] = 0
+    df = pd.DataFrame({
+        "Identifiant": [f"FEST_{i}" for i in range(nb)],
+        "Latitude": lat, "Longitude": lon, "Masque genres": masques, "Code période": codes,
+    })
+    return MoteurRecommandation(df=df)
+
+
+@pytest.fixture
+def profils():
+    generateur = np.random.default_rng(1)
+    profils = []
+    for _ in range(150):
+        choisis = [GENRES[i] for i in generateur.choice(len(GENRES), 2, replace=False)]
+        profil = {"coordinates": [float(generateur.uniform(43, 49)), float(generateur.uniform(-1, 6))],
+                  "distance_max": float(generateur.choice([50, 150, 400])),
+                  "dates": DATES[generateur.integers(len(DATES))],
+                  "types": sorted({type_festival for type_festival, _, _, _ in choisis})}
+        for _, cle_genres, _, genre in choisis:
+            profil.setdefault(cle_genres, []).append(genre)
+        profils.append(profil)
+    profils.append({"coordinates": [46.0, 2.0], "distance_max": 10.0, "dates": DATES[0],
+                    "types": [GENRES[0][0]], GENRES[0][1]: [GENRES[0][3]]})
+    profils.append({"coordinates": None, "dates": DATES[0]})
+    return profils
+
+
+@pytest.mark.parametrize("nb_processus", [1, 2])
+def test_identique_a_recommend(moteur, profils, nb_processus):
+    # Petites tuiles : plusieurs tuiles par groupe
+    resultats = list(recommander_lot(profils, moteur, k=4, taille_tuile=2000, nb_processus=nb_processus))
+    assert sorted(num for num, _, _ in resultats) == list(range(len(profils)))
+    for num, positions, distances in resultats:
+        if profils[num].get("coordinates") is None:
+            assert len(positions) == 0
+            continue
+        attendu = moteur.recommend(profils[num], k=4)
+        np.testing.assert_array_equal(moteur.df.index[positions], attendu.index)
+        np.testing.assert_allclose(distances, attendu["Distance"])
+
+
+def test_parallele_dans_l_ordre_de_la_serie(moteur, profils):
+    serie = list(recommander_lot(profils, moteur, k=3))
+    parallele = list(recommander_lot(profils, moteur, k=3, nb_processus=2))
+    assert [num for num, _, _ in serie] == [num for num, _, _ in parallele]
+    for (_, positions, distances), (_, positions_p, distances_p) in zip(serie, parallele):
+        np.testing.assert_array_equal(positions, positions_p)
+        np.testing.assert_array_equal(distances, distances_p)
+
+
+def test_top_k_tuile():
+    inf = np.inf
+    distances = np.array([[5.0, 1.0, inf, 1.0, 3.0],
+                          [inf, inf, inf, inf, inf],
+                          [2.0, inf, 4.0, inf, inf]])
+    positions = np.array([10, 11, 12, 13, 14])
+    top, top_distances = top_k_tuile(distances, positions, 3)
+    np.testing.assert_array_equal(top, [[11, 13, 14], [-1, -1, -1], [10, 12, -1]])
+    np.testing.assert_array_equal(top_distances, [[1.0, 1.0, 3.0], [inf, inf, inf], [2.0, 4.0, inf]])
+
+    # Moins de colonnes que k : cases vides en fin de ligne
+    top, _ = top_k_tuile(distances[:, :2], positions[:2], 3)
+    np.testing.assert_array_equal(top, [[11, 10, -1], [-1, -1, -1], [10, -1, -1]])
+
+
+@pytest.mark.parametrize("k", [0, -1])
+def test_k_invalide_refuse_des_l_appel(k):
+    with pytest.raises(ValueError, match="k doit valoir au moins 1"):
+        recommander_lot([{"coordinates": [48.4, -4.5], "dates": ["2025-07-01", "2025-07-10"]}], None, k=k)
+
+
+def test_k_invalide_refuse_en_ligne_de_commande(tmp_path):
+    script = Path(__file__).resolve().parent.parent / "recommandation_lot.py"
+    sortie = subprocess.run([sys.executable, str(script), "profils.jsonl", str(tmp_path / "resultats.jsonl"),
+                             "--k", "0"], capture_output=True, text=True)
+    assert sortie.returncode == 2 and "--k doit valoir au moins 1" in sortie.stderr
+    assert not (tmp_path / "resultats.jsonl").exists()
@@ -0,0 +1,141 @@
+"""
+Scraping d'infoconcert (scraper_infoconcert.py) sur des pages enregistrées, servies
+par un serveur HTTP local.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+import scraper_infoconcert
+from scraper_infoconcert import CHEMIN_CLASSEMENT, festivals, scraper
+
+# Durée de chaque réponse (s), pour que les requêtes se chevauchent
+LATENCE = 0.05
+
+
+def ligne_classement(position, nom, lien):
+    return (f'<div class="row"><span class="top-position-number">{position}</span>'
+            f'<div class="top-line-name"><a href="{lien}">{nom}</a></div>'
+            f'<div class="top-coming-concerts">Ville {position}\n(Salle)</div></div>')
+
+
+def page_festival(nom, debut, fin):
+    evenement = {"@type": "MusicEvent", "name": nom, "startDate": debut, "endDate": fin,
+                 "location": {"name": "Salle", "address": {"addressLocality": "Ville"}}}
+    return f'<h1>{nom}</h1><script type="application/ld+json">{json.dumps(evenement)}</script>'
+
+
+@pytest.fixture
+def pages_enregistrees(tmp_path):
+    """
+    Classement sur deux pages (5 festivals) et pages des festivals, écrits sur disque.
+    Le festival 4 n'a pas de page (404).
+    """
+    dossier = tmp_path / "pages"
+    (dossier / "festival").mkdir(parents=True)
+    (dossier / "fiche").mkdir()
+    (dossier / CHEMIN_CLASSEMENT.lstrip("/")).write_text(
+        "".join(ligne_classement(i, f"Festival {i}", f"/fiche/f{i}.html") for i in (1, 2, 3))
+        + '<a rel="next" href="/festival/les-plus-consultes-2.html">Suivante</a>', encoding="utf-8")
+    (dossier / "festival" / "les-plus-consultes-2.html").write_text(
+        "".join(ligne_classement(i, f"Festival {i}", f"/fiche/f{i}.html") for i in (4, 5)), encoding="utf-8")
+    for i in (1, 2, 3, 5):
+        (dossier / "fiche" / f"f{i}.html").write_text(
+            page_festival(f"Festival {i}", f"2025-07-0{i}", f"2025-07-1{i}"), encoding="utf-8")
+    return dossier
+
+
+@pytest.fixture
+def site(serveur_local, client_http_rapide, pages_enregistrees):
+    """
+    Serveur des pages enregistrées. site.erreurs_503[chemin] : nombre de réponses 503
+    à renvoyer avant la page. site.simultanees_max : requêtes traitées en même temps.
+    """
+    etat = {"en_cours": 0, "max": 0}
+    verrou = threading.Lock()
+    erreurs_503 = Counter()
+
+    def repondre(requete):
+        chemin = requete["chemin"]
+        with verrou:
+            etat["en_cours"] += 1
+            etat["max"] = max(etat["max"], etat["en_cours"])
+        try:
+            time.sleep(LATENCE)
+            with verrou:
+                if erreurs_503[chemin] > 0:
+                    erreurs_503[chemin] -= 1
+                    return 503, {"Retry-After": "0"}, "indisponible"
+            fichier = pages_enregistrees / chemin.lstrip("/")
+            if not fichier.is_file():
+                return 404, {}, "introuvable"
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, fichier.read_bytes()
+        finally:
+            with verrou:
+                etat["en_cours"] -= 1
+
+    serveur = serveur_local(repondre)
+    serveur.erreurs_503 = erreurs_503
+    serveur.etat = etat
+    return serveur
+
+
+def chemins(serveur, depuis=0):
+    return Counter(requete["chemin"] for requete in serveur.requetes[depuis:])
+
+
+def lancer(site, tmp_path, **options):
+    options.setdefault("requetes_par_seconde", 200)
+    return scraper(site.url + CHEMIN_CLASSEMENT, tmp_path / "reprise.sqlite", **options)
+
+
+def test_reprise_apres_max_requetes(site, tmp_path):
+    rapport = lancer(site, tmp_path, max_requetes=3)
+    assert rapport["telechargees"] == 3
+    premieres = chemins(site)
+    assert sum(premieres.values()) == 3
+
+    # La reprise ne retélécharge aucune page déjà lue et termine le parcours
+    nb = len(site.requetes)
+    rapport = lancer(site, tmp_path)
+    suivantes = chemins(site, nb)
+    assert not set(premieres) & set(suivantes)
+    assert rapport["deja_faites"] >= 1
+    assert sum(premieres.values()) + sum(suivantes.values()) == 7  # 2 pages de classement + 5 fiches
+
+    df = festivals(tmp_path / "reprise.sqlite")
+    assert df["Nom"].tolist() == [f"Festival {i}" for i in range(1, 6)]
+    assert df.loc[df["Nom"] == "Festival 2", "Date début"].item() == "2025-07-02"
+    assert df.loc[df["Nom"] == "Festival 4", "Titre page"].isna().item()
+
+
+def test_concurrence_bornee(site, tmp_path):
+    # Jamais plus de concurrence requêtes simultanées (et le pool les utilise toutes)
+    for concurrence in (2, 1):
+        site.etat["max"] = 0
+        lancer(site, tmp_path, concurrence=concurrence, recommencer=True)
+        assert site.etat["max"] == concurrence
+
+
+def test_404_definitive_et_503_reessayee(site, tmp_path):
+    site.erreurs_503["/fiche/f2.html"] = 1     # réessayée dans la même exécution par client_http
+    site.erreurs_503["/fiche/f3.html"] = 100   # toujours en erreur : retentée à l'exécution suivante
+    rapport = lancer(site, tmp_path)
+
+    vus = chemins(site)
+    assert vus["/fiche/f2.html"] == 2
+    assert vus["/fiche/f3.html"] == scraper_infoconcert.client_http.NB_ESSAIS
+    assert vus["/fiche/f4.html"] == 1
+    assert rapport["absentes"] == 1 and rapport["erreurs"] == 1
+    assert rapport["festivals"] == 3
+
+    # Exécution suivante : seule la page en erreur est redemandée, pas la 404
+    site.erreurs_503.clear()
+    nb = len(site.requetes)
+    rapport = lancer(site, tmp_path)
+    assert chemins(site, nb) == Counter({"/fiche/f3.html": 1})
+    assert rapport["festivals"] == 1 and rapport["erreurs"] == 0
@@ -0,0 +1,148 @@
+"""
+Test de permutation (significativite.py) : index spatial accordé à la table des
+festivals, tirages stratifiés, calcul parallèle et puissance du test.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from impact import TOUTES
+from index_spatial import IndexSpatial
+from masques import BITS_DISCIPLINES
+from saisons import COLONNE_PERIODE, SAISONS
+import significativite
+from significativite import REGION, calculer_comptes_candidats, strates, tirages
+
+
+@pytest.fixture
+def festivals():
+    generateur = np.random.default_rng(0)
+    nb = 300
+    return pd.DataFrame({
+        "Latitude": generateur.uniform(43, 49, nb),
+        "Longitude": generateur.uniform(-1, 6, nb),
+        COLONNE_PERIODE: generateur.choice(list(SAISONS), nb),
+    })
+
+
+def test_index_construit_sur_les_festivals_filtres(festivals):
+    filtres = festivals[festivals["Longitude"] > 2].reset_index(drop=True)
+    positions = np.arange(len(filtres))
+    comptes = calculer_comptes_candidats(filtres, positions, np.array([50.0, 100.0]))
+    index = IndexSpatial(filtres["Latitude"], filtres["Longitude"])
+    np.testing.assert_array_equal(
+        comptes, calculer_comptes_candidats(filtres, positions, np.array([50.0, 100.0]), index=index))
+    assert comptes.shape[0] == len(filtres)
+
+
+def test_index_d_une_autre_table_refuse(festivals):
+    index_complet = IndexSpatial(festivals["Latitude"], festivals["Longitude"])
+    filtres = festivals[festivals["Longitude"] > 2].reset_index(drop=True)
+    with pytest.raises(ValueError, match="index"):
+        calculer_comptes_candidats(filtres, [0, 1], np.array([50.0]), index=index_complet)
+
+    # Même longueur, autres festivals : refusé aussi
+    melanges = festivals.sample(frac=1, random_state=1).reset_index(drop=True)
+    with pytest.raises(ValueError, match="index"):
+        calculer_comptes_candidats(melanges, [0, 1], np.array([50.0]), index=index_complet)
+
+
+# --- Test de permutation ---
+
+SAISON_ETE, SAISON_HIVER = list(SAISONS)[1], list(SAISONS)[0]
+
+
+def base_uniforme(generateur, nb=1500):
+    """
+    Festivals répartis uniformément, deux régions (ouest / est) et deux saisons.
+    """
+    lon = generateur.uniform(-1, 7, nb)
+    return pd.DataFrame({
+        "Nom du festival": [f"Festival {i}" for i in range(nb)],
+        "Latitude": generateur.uniform(43, 49, nb),
+        "Longitude": lon,
+        COLONNE_PERIODE: generateur.choice([SAISON_ETE, SAISON_HIVER], nb),
+        REGION: np.where(lon < 3, "Ouest", "Est"),
+        "Masque disciplines": np.full(nb, BITS_DISCIPLINES["Musique"]),
+    })
+
+
+def ajouter_ancres(festivals, points, periodes, regions):
+    """
+    Gros festivals (ancres) aux points donnés, ajoutés aussi à la base (ils en font partie).
+    """
+    ancres = pd.DataFrame({
+        "Nom du festival": [f"Gros festival {i}" for i in range(len(points))],
+        "Latitude": [lat for lat, _ in points], "Longitude": [lon for _, lon in points],
+        COLONNE_PERIODE: periodes, REGION: regions,
+        "Masque disciplines": np.full(len(points), BITS_DISCIPLINES["Musique"]),
+    })
+    return ancres, pd.concat([festivals, ancres], ignore_index=True)
+
+
+def p_valeur(resultats, periode_ancres, rayon=50.0):
+    ligne = resultats[(resultats["Période ancres"] == periode_ancres) & (resultats["Période voisins"] == TOUTES)
+                      & (resultats["Rayon (km)"] == rayon)]
+    return ligne["p-valeur"].item()
+
+
+def test_tirages_dans_la_strate():
+    generateur = np.random.default_rng(0)
+    festivals = base_uniforme(generateur)
+    # Une ancre d'une région sans festival de sa saison : strate de la saison seulement
+    festivals = festivals[~((festivals[REGION] == "Est") & (festivals[COLONNE_PERIODE] == SAISON_HIVER))]
+    festivals = festivals.reset_index(drop=True)
+    ancres = pd.DataFrame({COLONNE_PERIODE: [SAISON_ETE, SAISON_ETE, SAISON_HIVER, SAISON_ETE, SAISON_HIVER],
+                           REGION: ["Ouest", "Ouest", "Ouest", "Est", "Est"]})
+    candidats = np.arange(len(festivals))
+    groupes = strates(ancres, festivals, candidats)
+    assert set(groupes) == {(SAISON_ETE, "Ouest"), (SAISON_HIVER, "Ouest"), (SAISON_ETE, "Est"), (SAISON_HIVER, None)}
+
+    tires = tirages(groupes, len(ancres), 500, generateur)
+    periodes = festivals[COLONNE_PERIODE].to_numpy()[tires]
+    regions = festivals[REGION].to_numpy()[tires]
+    assert (periodes == ancres[COLONNE_PERIODE].to_numpy()).all()
+    assert (regions[:, :4] == ancres[REGION].to_numpy()[:4]).all()
+    assert (regions[:, 4] == "Ouest").all()  # Seuls festivals d'hiver restants
+    # Sans remise dans une même strate
+    assert (tires[:, 0] != tires[:, 1]).all()
+
+
+def test_resultats_identiques_en_parallele():
+    generateur = np.random.default_rng(1)
+    festivals = base_uniforme(generateur)
+    ancres, festivals = ajouter_ancres(festivals, [(44.0, 0.0), (47.5, 5.0), (45.5, 2.0), (48.0, 1.0)],
+                                       [SAISON_ETE, SAISON_ETE, SAISON_HIVER, SAISON_HIVER],
+                                       ["Ouest", "Est", "Ouest", "Ouest"])
+    options = {"rayons": [25, 50], "nb_tirages": 300, "graine": 3}
+    serie = significativite.tester_concentration(ancres, festivals, nb_processus=1, **options)
+    parallele = significativite.tester_concentration(ancres, festivals, nb_processus=2, **options)
+    pd.testing.assert_frame_equal(serie, parallele)
+    assert len(serie) == 2 * (len(SAISONS) + 1) * 2
+
+
+def test_concentration_detectee_seulement_si_elle_existe():
+    generateur = np.random.default_rng(2)
+    centres = [(43.8, 0.0), (44.5, 1.5), (46.0, 0.5), (47.0, 2.0), (48.5, 1.0), (45.0, 2.5)]
+    nb_ancres = len(centres)
+    regions = ["Ouest"] * nb_ancres
+
+    # Amas de petits festivals plantés autour de chaque gros festival
+    uniforme = base_uniforme(generateur)
+    amas = base_uniforme(generateur, nb=40 * nb_ancres)
+    amas["Latitude"] = np.repeat([lat for lat, _ in centres], 40) + generateur.normal(0, 0.1, len(amas))
+    amas["Longitude"] = np.repeat([lon for _, lon in centres], 40) + generateur.normal(0, 0.1, len(amas))
+    amas[REGION] = "Ouest"
+    amas["Nom du festival"] = [f"Amas {i}" for i in range(len(amas))]
+    ancres, festivals = ajouter_ancres(pd.concat([uniforme, amas], ignore_index=True), centres,
+                                       [SAISON_ETE] * nb_ancres, regions)
+    resultats = significativite.tester_concentration(ancres, festivals, rayons=[50], nb_tirages=999, nb_processus=1)
+    assert p_valeur(resultats, SAISON_ETE) < 0.01
+    ligne = resultats[(resultats["Période voisins"] == TOUTES)].iloc[0]
+    assert ligne["Observé"] > ligne["Fluctuation haute"]
+
+    # Mêmes gros festivals sans amas : rien d'anormal
+    ancres, festivals = ajouter_ancres(uniforme, centres, [SAISON_ETE] * nb_ancres, regions)
+    resultats = significativite.tester_concentration(ancres, festivals, rayons=[50], nb_tirages=999, nb_processus=1)
+    assert p_valeur(resultats, SAISON_ETE) > 0.1
@@ -0,0 +1,50 @@
+"""
+Empreinte de la source (source_festivals.py) et vérification du snapshot
+(base_festivals.snapshot_a_jour) : aucun accès au S3 sauf demande explicite.
+"""
+
+import os
+
+import pytest
+
+import base_festivals
+import source_festivals
+from source_festivals import empreinte_source
+
+
+def test_empreinte_locale_recalculee_seulement_si_le_fichier_change(tmp_path, monkeypatch):
+    csv = tmp_path / "source.csv"
+    csv.write_text("Nom;Commune\nJazz;Brest\n", encoding="utf-8")
+    monkeypatch.setenv("FESTIVALS_CSV", str(csv))
+    monkeypatch.setattr(source_festivals, "_empreintes_locales", {})
+
+    lectures = []
+    ouvrir = open
+    monkeypatch.setattr("builtins.open", lambda *args, **kwargs: lectures.append(args[0]) or ouvrir(*args, **kwargs))
+    premiere = empreinte_source()
+    assert empreinte_source() == premiere
+    assert lectures == [str(csv)]
+
+    csv.write_text("Nom;Commune\nRock;Albi\n", encoding="utf-8")
+    os.utime(csv, ns=(0, os.stat(csv).st_mtime_ns + 1))
+    assert empreinte_source() != premiere
+    assert len(lectures) == 2
+
+
+def test_s3_interroge_seulement_sur_demande(monkeypatch):
+    monkeypatch.delenv("FESTIVALS_CSV", raising=False)
+    monkeypatch.setattr(base_festivals, "lire_meta", lambda dossier: {
+        "version_format": base_festivals.VERSION_FORMAT, "fichier": "snapshot.parquet",
+        "empreinte_regroupements": base_festivals.empreinte_regroupements(), "empreinte_source": "etag:ancien",
+    })
+    monkeypatch.setattr(base_festivals.Path, "exists", lambda chemin: True)
+
+    def connexion_s3():
+        raise AssertionError("accès au S3")
+
+    monkeypatch.setattr(source_festivals, "connexion_s3", connexion_s3)
+    assert empreinte_source(distante=False) is None
+    assert base_festivals.snapshot_a_jour()
+    assert base_festivals.snapshot_a_jour(verifier_source=False)
+    with pytest.raises(AssertionError, match="S3"):
+        base_festivals.snapshot_a_jour(verifier_source=True)